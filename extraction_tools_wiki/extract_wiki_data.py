@@ -27,15 +27,42 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import os
 import sys
 import json
-import datetime
-import itertools
+from typing import Container
+from typing import Dict
+from typing import List
 
+import requests
+
+from extraction_tools_wiki.extraction_checkpoint import ExtractionCheckpoint
 from extraction_tools_wiki.wiki_page_titles import WikiPageTitles
 from extraction_tools_wiki.wiki_page_text import WikiPageText
+from extraction_tools_wiki.wiki_fetcher import WikiTextFetcher
+from extraction_tools_wiki.wiki_session import WikiSession
+from extraction_tools_wiki.wiki_text_store import open_wiki_text
 
 
 OSRS_WIKI_API_URL = "https://oldschool.runescape.wiki/api.php"
 
+
+def pages_to_extract(page_titles: Dict[str, str], extracted_pages: Container[str],
+                     extracted_revisions: Dict[str, str]) -> List[str]:
+    """Determine the pages to extract: new pages, and pages revised since the wiki text was extracted.
+
+    :param page_titles: A dictionary of page titles to the last revision timestamp.
+    :param extracted_pages: The page titles with extracted wiki text.
+    :param extracted_revisions: A dictionary of page titles to the revision timestamp of the extracted wiki text.
+    :return: The page titles to extract.
+    """
+    extract_page_titles = list()
+    for page_title, page_revision_date in page_titles.items():
+        # Check if page title is already present in JSON output file, also check revision date
+        if page_title in extracted_pages and extracted_revisions.get(page_title) == page_revision_date:
+            # If the extracted wiki text is the latest revision, skip
+            continue
+        extract_page_titles.append(page_title)
+    return extract_page_titles
+
+
 if __name__ == "__main__":
     import argparse
     ap = argparse.ArgumentParser()
@@ -44,6 +71,25 @@ if __name__ == "__main__":
                     nargs="+",
                     help="<Required> List of OSRS Wiki categories to extract",
                     required=True)
+    ap.add_argument("-w",
+                    "--workers",
+                    type=int,
+                    default=4,
+                    help="The maximum number of wiki text requests in progress at once")
+    ap.add_argument("-r",
+                    "--rate",
+                    type=float,
+                    default=4.0,
+                    help="The maximum number of requests per second, shared by every worker")
+    ap.add_argument("--cache-dir",
+                    default="wiki_http_cache",
+                    help="The directory to save API responses in, so unchanged responses are not downloaded again")
+    ap.add_argument("--no-cache",
+                    action="store_true",
+                    help="Do not save or revalidate API responses")
+    ap.add_argument("--resume",
+                    action="store_true",
+                    help="Resume an interrupted run from the checkpoint file")
     args = vars(ap.parse_args())
 
     # List of categories to process from the OSRS Wiki
@@ -54,9 +100,15 @@ if __name__ == "__main__":
     # Specify the name for the page titles output JSON file
     titles_file_path = f"extract_page_titles_{primary_category}.json"
 
-    # Specify the name for the wiki text output JSON file
+    # Specify the name for the wiki text output JSON file, exported from the wiki text store when extraction ends
     text_file_path = f"extract_page_text_{primary_category}.json"
 
+    # Specify the name for the revision timestamp of the extracted wiki text of each page
+    revisions_file_path = f"extract_page_revisions_{primary_category}.json"
+
+    # Specify the name for the checkpoint file, saved while the run is in progress and removed when it completes
+    checkpoint_file_path = f"extract_checkpoint_{primary_category}.json"
+
     # STAGE ZERO: SET SCRIPT CONFIGURATION
 
     # Specify the custom user agent for all requests
@@ -66,9 +118,22 @@ if __name__ == "__main__":
     # Boolean to trigger load page titles from file, or run fresh page title extraction
     load_files = False
 
-    # Set the revision date, extract wiki pages only after this date
-    last_extraction_date = datetime.datetime.strptime("2019-02-10T00:00:00Z",
-                                                      '%Y-%m-%dT%H:%M:%SZ')
+    # Create the HTTP session shared by every request, with a pooled connection for every worker
+    wiki_session = WikiSession(user_agent,
+                               user_email,
+                               args["rate"],
+                               args["workers"],
+                               cache_dir=None if args["no_cache"] else args["cache_dir"])
+
+    # Save the progress of the run, so an interrupted run can be resumed
+    checkpoint = ExtractionCheckpoint(checkpoint_file_path, target_categories)
+    if args["resume"]:
+        if checkpoint.load():
+            revision_timestamps = sum(1 for revision_date in checkpoint.page_titles.values() if revision_date)
+            print(f">>> Resuming from checkpoint: {len(checkpoint.page_titles)} page titles, "
+                  f"{revision_timestamps} revision timestamps, {len(checkpoint.revisions)} pages")
+        else:
+            print(">>> No checkpoint found for the categories, starting a new run...")
 
     # STAGE ONE: EXTRACT PAGE TITLES
 
@@ -77,7 +142,9 @@ if __name__ == "__main__":
     wiki_page_titles = WikiPageTitles(OSRS_WIKI_API_URL,
                                       target_categories,
                                       user_agent,
-                                      user_email)
+                                      user_email,
+                                      wiki_session,
+                                      checkpoint)
 
     # Load previously extracted page titles from JSON, or extract from OSRS Wiki API
     if load_files:
@@ -85,17 +152,15 @@ if __name__ == "__main__":
         if not loaded_page_titles:
             sys.exit(">>> ERROR: Specified page titles to load, but not file found. Exiting.")
     else:
-        # Extract page titles using supplied categories
-        wiki_page_titles.extract_page_titles()
-        # Extract page revision date
-        # Loop 50 page titles at a time, the max number for a revisions request using page titles
-        for page_title_list in itertools.zip_longest(*[iter(wiki_page_titles.page_titles)] * 50):
-            # Remove None entries from the list of page titles
-            page_title_list = filter(None, page_title_list)
-            # Join the page titles list using the pipe (|) separator
-            page_titles_string = "|".join(page_title_list)
-            # Extract the page revision date
-            wiki_page_titles.extract_last_revision_timestamp(page_titles_string)
+        try:
+            # Extract page titles using supplied categories, skipping categories completed by a resumed run
+            # Categories are extracted concurrently, and the page revision date is extracted for every
+            # 50 new page titles (the max number for a revisions request) while categories are extracted
+            wiki_page_titles.extract_page_titles_and_revision_timestamps(args["workers"])
+        except requests.exceptions.RequestException as e:
+            raise SystemExit(">>> ERROR: Get request error. Exiting.") from e
+        finally:
+            checkpoint.save()
         # Save all page titles and
         wiki_page_titles.export_page_titles_in_json(titles_file_path)
 
@@ -105,35 +170,59 @@ if __name__ == "__main__":
 
     # STAGE TWO: EXTRACT WIKI USING PAGE TITLES
 
-    # Open page title JSON file, to check if page needs to have wiki text extracted
-    json_data = dict()
-    if os.path.isfile(text_file_path):
-        with open(text_file_path, mode='r') as existing_out_file:
-            json_data = json.load(existing_out_file)
-
-    page_titles_count = 1
-    print(">>> Starting wiki text extraction for extracted page titles...")
-    for page_title, page_revision_date in wiki_page_titles.page_titles.items():
-        print(f"  > Progress: {page_titles_count:4d} of {page_titles_total:4d} - Processing: {page_title}")
-
-        # Convert revision date to datetime object
-        last_revision_date = datetime.datetime.strptime(wiki_page_titles[page_title],
-                                                        '%Y-%m-%dT%H:%M:%SZ')
-
-        # Check if page title is already present in JSON output file, also check revision date
-        if page_title in json_data and last_revision_date < last_extraction_date:
-            # If the last revision was before last extract, skip
-            page_titles_count += 1
-            continue
-
-        # Create object to extract page wiki text
-        wiki_page_text = WikiPageText(OSRS_WIKI_API_URL,
-                                      page_title,
-                                      user_agent,
-                                      user_email)
-
-        # If the page title has not been extracted, extract wiki text and save to JSON file
-        wiki_page_text.extract_page_wiki_text()
-        wiki_page_text.export_wiki_text_to_json(text_file_path)
-
-        page_titles_count += 1
+    # Open the wiki text store, to check if page needs to have wiki text extracted
+    # The store is converted from the wiki text JSON file, if the JSON file is newer, or started if neither exist
+    wiki_text_store = open_wiki_text(f"extract_page_text_{primary_category}", missing_ok=True)
+
+    # Open the revision timestamp of the wiki text extracted for each page
+    extracted_revisions = dict()
+    if os.path.isfile(revisions_file_path):
+        with open(revisions_file_path) as revisions_file:
+            extracted_revisions = json.load(revisions_file)
+    # Add the pages extracted by a resumed run, the checkpoint saves the revisions as pages are extracted
+    extracted_revisions.update(checkpoint.revisions)
+    checkpoint.revisions = extracted_revisions
+
+    # Determine the pages to extract: new pages, and pages revised since the wiki text was extracted
+    extract_page_titles = pages_to_extract(wiki_page_titles.page_titles, wiki_text_store, extracted_revisions)
+
+    print(f">>> Starting wiki text extraction for {len(extract_page_titles)} of {page_titles_total} page titles...")
+    # Pages are requested concurrently, 50 pages per request, and appended to the store as each request completes
+    wiki_text_fetcher = WikiTextFetcher(OSRS_WIKI_API_URL,
+                                        user_agent,
+                                        user_email,
+                                        args["workers"],
+                                        args["rate"],
+                                        session=wiki_session)
+    try:
+        extracted_pages = wiki_text_fetcher.fetch_revisions(extract_page_titles)
+        for page_titles_count, (page_title, wiki_text, revision_date) in enumerate(extracted_pages, start=1):
+            print(f"  > Progress: {page_titles_count:4d} of {len(extract_page_titles):4d} - Processing: {page_title}")
+            if wiki_text is None:
+                # A missing page, keep any wiki text extracted before and extract the page again next run
+                print(f"  > No wiki text for: {page_title}")
+                continue
+            wiki_page_text = WikiPageText(OSRS_WIKI_API_URL,
+                                          page_title,
+                                          user_agent,
+                                          user_email,
+                                          wiki_text)
+            wiki_page_text.export_wiki_text_to_store(wiki_text_store)
+            extracted_revisions[page_title] = revision_date
+            checkpoint.save_later()
+    except requests.exceptions.RequestException as e:
+        raise SystemExit(">>> ERROR: Get request error. Exiting.") from e
+    finally:
+        wiki_text_fetcher.close()
+        wiki_session.close()
+        # Remove replaced pages from the store, and export the JSON file used by the items builder
+        wiki_text_store.compact()
+        wiki_text_store.export_json(text_file_path)
+        wiki_text_store.close()
+        # Save the revisions of the pages extracted so far, even if the extraction failed
+        with open(revisions_file_path, mode='w') as revisions_file:
+            revisions_file.write(json.dumps(extracted_revisions, indent=4))
+        checkpoint.save()
+
+    # The run is complete, the next run starts from the beginning
+    checkpoint.remove()
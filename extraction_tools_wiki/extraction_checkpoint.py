@@ -0,0 +1,123 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+A checkpoint of the progress of a wiki extraction run, so an interrupted run
+can be resumed. The checkpoint records the category `continue` token of every
+category, the page titles extracted so far with their revision timestamp and
+category, and the revision of every page with extracted wiki text.
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Dict
+from typing import List
+
+
+class ExtractionCheckpoint:
+    """This class saves and loads the progress of a wiki extraction run.
+
+    The checkpoint is saved at most once every `save_interval` seconds while the run
+    is in progress (see `save_later`), and should be saved when the run stops. The
+    file is replaced in a single step, so an interrupted save leaves the previous
+    checkpoint in place.
+
+    :param checkpoint_path: The checkpoint JSON file name.
+    :param target_categories: The OSRS Wiki categories extracted by the run.
+    :param save_interval: The minimum time between saves by `save_later`, in seconds.
+    """
+    def __init__(self, checkpoint_path: str, target_categories: List[str], save_interval: float = 5.0):
+        self.checkpoint_path = checkpoint_path
+        self.target_categories = list(target_categories)
+        self.save_interval = save_interval
+        # Category names to the `continue` token of the next request, None when the category is complete
+        self.categories: Dict[str, Dict] = dict()
+        # Page titles extracted so far, to the last revision timestamp (None until extracted)
+        self.page_titles: Dict[str, str] = dict()
+        # Category names to the page titles extracted from the category, in the order of the category
+        self.category_titles: Dict[str, List[str]] = dict()
+        # Page titles to the revision timestamp of the extracted wiki text
+        self.revisions: Dict[str, str] = dict()
+        self.last_save = time.monotonic()
+        self.lock = threading.Lock()
+
+    def load(self) -> bool:
+        """Load the checkpoint of an earlier run.
+
+        :return: A boolean to indicate if a checkpoint for the same categories was loaded.
+        """
+        if not os.path.isfile(self.checkpoint_path):
+            return False
+        with open(self.checkpoint_path) as checkpoint_file:
+            checkpoint_data = json.load(checkpoint_file)
+        if checkpoint_data["target_categories"] != self.target_categories:
+            return False
+        self.categories = checkpoint_data["categories"]
+        self.page_titles = checkpoint_data["page_titles"]
+        self.category_titles = checkpoint_data["category_titles"]
+        self.revisions = checkpoint_data["revisions"]
+        return True
+
+    def save(self):
+        """Save the checkpoint."""
+        with self.lock:
+            # Copy the dictionaries, as page titles and categories can be updated by other threads while saving
+            checkpoint_data = {
+                "target_categories": self.target_categories,
+                "categories": dict(self.categories),
+                "page_titles": dict(self.page_titles),
+                "category_titles": {category: list(page_titles) for category, page_titles in dict(self.category_titles).items()},
+                "revisions": dict(self.revisions)
+            }
+            temp_checkpoint_path = self.checkpoint_path + ".tmp"
+            with open(temp_checkpoint_path, mode="w") as checkpoint_file:
+                json.dump(checkpoint_data, checkpoint_file)
+            os.replace(temp_checkpoint_path, self.checkpoint_path)
+            self.last_save = time.monotonic()
+
+    def save_later(self):
+        """Save the checkpoint, if it has not been saved in the last `save_interval` seconds."""
+        if time.monotonic() - self.last_save >= self.save_interval:
+            self.save()
+
+    def remove(self):
+        """Remove the checkpoint file, when the run is complete."""
+        if os.path.isfile(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def category_continue(self, category: str) -> Dict:
+        """Return the `continue` token to resume a category from.
+
+        :param category: The OSRS Wiki category.
+        :return: The `continue` token, an empty dictionary if the category has not been started,
+                 or None if the category is complete.
+        """
+        return self.categories.get(category, dict())
+
+    def update_category(self, category: str, last_continue: Dict):
+        """Record the progress of a category, after the page titles of a request have been added.
+
+        :param category: The OSRS Wiki category.
+        :param last_continue: The `continue` token of the next request, or None if the category is complete.
+        """
+        self.categories[category] = last_continue
+        self.save_later()
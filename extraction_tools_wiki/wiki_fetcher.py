@@ -0,0 +1,133 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Concurrent extraction of OSRS Wiki page wiki text. The latest revision of up
+to 50 pages is requested at a time, by a pool of threads sharing a single
+keep-alive HTTP session (see wiki_session), and every request waits for a
+token bucket rate limiter, so the total request rate stays within the limit
+no matter how many threads are used. Failed requests are retried with
+jittered exponential backoff.
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from typing import Dict
+from typing import Generator
+from typing import Callable
+from typing import Iterable
+from typing import List
+from typing import Tuple
+
+from extraction_tools_wiki.wiki_page_text import wiki_revisions_request
+from extraction_tools_wiki.wiki_page_text import pages_from_revisions_response
+from extraction_tools_wiki.wiki_session import WikiSession
+
+# The maximum number of page titles in a revisions request with content
+REVISIONS_BATCH_SIZE = 50
+
+
+class WikiTextFetcher:
+    """This class extracts the wiki text of many OSRS Wiki pages concurrently.
+
+    :param base_url: The OSRS Wiki URL used for API queries.
+    :param user_agent: A custom user-agent name to be used for the API request.
+    :param user_email: A custom user-agent email to be used for the API request.
+    :param workers: The maximum number of requests in progress at once.
+    :param requests_per_second: The maximum request rate, shared by every worker.
+    :param retries: The number of times a failed request is retried.
+    :param backoff: The wait before the first retry, in seconds.
+    :param session: The OSRS Wiki session, shared with other extraction classes. If not provided,
+                    a session is created using the request rate and retry parameters.
+    """
+    def __init__(self, base_url: str, user_agent: str, user_email: str, workers: int = 4,
+                 requests_per_second: float = 4.0, retries: int = 3, backoff: float = 1.0,
+                 session: WikiSession = None):
+        self.base_url = base_url
+        self.workers = workers
+        # A session that is provided is shared, and closed by the caller
+        self.close_session = session is None
+        if session is None:
+            session = WikiSession(user_agent, user_email, requests_per_second, workers, retries, backoff)
+        self.wiki_session = session
+
+    def fetch_batch(self, page_titles: List[str]) -> Dict[str, Tuple[str, str]]:
+        """Extract the latest revision (wiki text and timestamp) of up to 50 pages.
+
+        If the wiki text of every page does not fit in a single response, the API returns
+        a `continue` section, and the pages without wiki text are in the next response.
+        Requests are continued until the API has returned every page.
+
+        :param page_titles: The OSRS Wiki page titles.
+        :return: A dictionary of page titles to a (wiki text, revision timestamp) tuple.
+        """
+        request = wiki_revisions_request(page_titles)
+        pages = dict()
+        while True:
+            # Wiki text is only extracted again when a page changes, so it is not saved in the HTTP cache
+            page_data = self.wiki_session.get_json(self.base_url, request, use_cache=False)
+            for page_title, page in pages_from_revisions_response(page_titles, page_data).items():
+                # A page without wiki text in this response can be in a continued response
+                if page[0] is not None or page_title not in pages:
+                    pages[page_title] = page
+            if "continue" not in page_data:
+                return pages
+            request = dict(wiki_revisions_request(page_titles), **page_data["continue"])
+
+    def fetch_revisions(self, page_titles: List[str],
+                        batch_size: int = REVISIONS_BATCH_SIZE) -> Generator[Tuple[str, str, str], None, None]:
+        """Extract the latest revision of every page, in batches of page titles, using a pool of threads.
+
+        Batches are returned as soon as they are extracted, which is not always the order
+        of the page titles. If a batch fails after every retry, the exception is raised.
+
+        :param page_titles: The OSRS Wiki page titles.
+        :param batch_size: The number of page titles in each request.
+        :return: A (page title, wiki text, revision timestamp) tuple for every page, a batch at a time.
+        """
+        batches = [tuple(page_titles[i:i + batch_size]) for i in range(0, len(page_titles), batch_size)]
+        for _, pages in self.run_concurrently(self.fetch_batch, batches):
+            for page_title, (wiki_text, revision_timestamp) in pages.items():
+                yield page_title, wiki_text, revision_timestamp
+
+    def run_concurrently(self, function: Callable, items: Iterable) -> Generator[tuple, None, None]:
+        """Call a function for every item, using a pool of threads.
+
+        Results are returned as soon as they complete, which is not always the order of the
+        items. If a call raises an exception, the exception is raised and the calls not yet
+        started are cancelled.
+
+        :param function: The function to call with each item.
+        :param items: The function arguments.
+        :return: An (item, result) tuple for every item.
+        """
+        with ThreadPoolExecutor(self.workers) as executor:
+            futures = {executor.submit(function, item): item for item in items}
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def close(self):
+        """Close the HTTP session, if it is not shared."""
+        if self.close_session:
+            self.wiki_session.close()
@@ -22,11 +22,87 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import os
 import json
 import logging
+from typing import Dict
+from typing import List
+from typing import Tuple
 import requests
 
+from extraction_tools_wiki.wiki_session import WikiSession
+from extraction_tools_wiki.wiki_text_store import WikiTextStore
+
 LOG = logging.getLogger(__name__)
 
 
+def wiki_text_request(page_title: str) -> Dict:
+    """Construct the OSRS Wiki API request for the wiki text of a page.
+
+    :param page_title: The OSRS Wiki page title.
+    :return: The API request parameters.
+    """
+    return {
+        "action": "parse",
+        "prop": "wikitext",
+        "format": "json",
+        "page": page_title
+    }
+
+
+def wiki_text_from_response(page_data: Dict) -> str:
+    """Extract the wiki text from an OSRS Wiki API parse response.
+
+    :param page_data: The JSON response.
+    :return: The wiki text, or None if the response has no wiki text (for example, a missing page).
+    """
+    try:
+        # Try to extract the wiki text from the HTTP response
+        return page_data["parse"]["wikitext"]["*"]
+    except KeyError:
+        # Set to None if wiki text extraction failed
+        return None
+
+
+def wiki_revisions_request(page_titles: List[str]) -> Dict:
+    """Construct the OSRS Wiki API request for the latest revision (wiki text and timestamp) of many pages.
+
+    :param page_titles: The OSRS Wiki page titles, up to 50 (the maximum for a revisions request with content).
+    :return: The API request parameters.
+    """
+    return {
+        "action": "query",
+        "prop": "revisions",
+        "rvprop": "content|timestamp",
+        "rvslots": "main",
+        "titles": "|".join(page_titles),
+        "format": "json",
+        "formatversion": "2"
+    }
+
+
+def pages_from_revisions_response(page_titles: List[str], page_data: Dict) -> Dict[str, Tuple[str, str]]:
+    """Extract the wiki text and revision timestamp of every page from an OSRS Wiki API revisions response.
+
+    :param page_titles: The requested page titles.
+    :param page_data: The JSON response, using `formatversion=2`.
+    :return: A dictionary of the requested page titles to a (wiki text, revision timestamp) tuple. Both
+             are None for a page with no wiki text (for example, a missing page).
+    """
+    query = page_data.get("query", dict())
+    # The API returns normalized page titles, map them back to the requested titles
+    requested_titles = {title: title for title in page_titles}
+    for normalized in query.get("normalized", list()):
+        requested_titles[normalized["to"]] = normalized["from"]
+
+    pages = {page_title: (None, None) for page_title in page_titles}
+    for page in query.get("pages", list()):
+        page_title = requested_titles.get(page["title"], page["title"])
+        revisions = page.get("revisions")
+        if not revisions:
+            continue
+        wiki_text = revisions[0].get("slots", dict()).get("main", dict()).get("content")
+        pages[page_title] = (wiki_text, revisions[0]["timestamp"])
+    return pages
+
+
 class WikiPageText:
     """This class handles extraction of wiki text using an OSRS Wiki API query.
 
@@ -34,15 +110,20 @@ class WikiPageText:
     :param page_title: OSRS Wiki page titles used for API query.
     :param user_agent: A custom user-agent name to be used for the API request.
     :param user_email: A custom user-agent email to be used for the API request.
+    :param wiki_text: The wiki text of the page, if it has already been extracted.
+    :param session: The OSRS Wiki session, shared with other extraction classes. If not provided,
+                    a session is created when the wiki text is extracted.
     """
-    def __init__(self, base_url: str, page_title: str, user_agent: str, user_email: str):
+    def __init__(self, base_url: str, page_title: str, user_agent: str, user_email: str, wiki_text: str = None,
+                 session: WikiSession = None):
         self.base_url = base_url
         self.page_title = page_title
         self.custom_agent = {
             'User-Agent': user_agent,
             'From': user_email
         }
-        self.wiki_text = None
+        self.wiki_text = wiki_text
+        self.session = session
 
     def extract_page_wiki_text(self):
         """Extract wiki text from OSRS Wiki for a provided page name.
@@ -51,29 +132,17 @@ class WikiPageText:
         API and extract the wiki text for a specific page. The page to query is
         determined by the page title.
         """
-        request = {
-            "action": "parse",
-            "prop": "wikitext",
-            "format": "json",
-            "page": self.page_title
-        }
+        request = wiki_text_request(self.page_title)
+        if self.session is None:
+            self.session = WikiSession(self.custom_agent["User-Agent"], self.custom_agent["From"])
 
         # Perform HTTP GET request
         try:
-            page_data = requests.get(self.base_url,
-                                     headers=self.custom_agent,
-                                     params=request).json()
+            page_data = self.session.get_json(self.base_url, request)
         except requests.exceptions.RequestException as e:
             raise SystemExit(">>> ERROR: Get request error. Exiting.") from e
 
-        try:
-            # Try to extract the wiki text from the HTTP response
-            wiki_text = page_data["parse"]["wikitext"]["*"]
-        except KeyError:
-            # Set to None if wiki text extraction failed
-            wiki_text = None
-
-        self.wiki_text = wiki_text
+        self.wiki_text = wiki_text_from_response(page_data)
 
     def export_wiki_text_to_json(self, out_file_name: str):
         """Export all extracted wiki text to a JSON file.
@@ -98,3 +167,13 @@ class WikiPageText:
             feeds[self.page_title] = str(self.wiki_text)
             with open(out_file_name, mode='w') as out_file:
                 out_file.write(json.dumps(feeds, indent=4))
+
+    def export_wiki_text_to_store(self, store: WikiTextStore):
+        """Export the extracted wiki text to a wiki text store.
+
+        Unlike `export_wiki_text_to_json`, the existing wiki text is not read and
+        written again, the page is appended to the store.
+
+        :param store: The wiki text store to save wiki text to.
+        """
+        store.add(self.page_title, str(self.wiki_text))
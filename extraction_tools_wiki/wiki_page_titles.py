@@ -21,11 +21,20 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
 import json
+import queue
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
 from typing import Dict
 from typing import Generator
+from typing import List
+from typing import Tuple
 import requests
 
+from extraction_tools_wiki.extraction_checkpoint import ExtractionCheckpoint
+from extraction_tools_wiki.wiki_session import WikiSession
+
 LOG = logging.getLogger(__name__)
 
 
@@ -36,15 +45,30 @@ class WikiPageTitles:
     :param categories: A list of OSRS Wiki categories.
     :param user_agent: A custom user-agent name to be used for the API request.
     :param user_email: A custom user-agent email to be used for the API request.
+    :param session: The OSRS Wiki session, shared with other extraction classes. If not provided,
+                    a session is created for this object.
+    :param checkpoint: The checkpoint of the extraction run, if the progress should be saved. Page
+                       titles and category progress are resumed from the checkpoint.
     """
-    def __init__(self, base_url: str, categories: list, user_agent: str, user_email: str):
+    def __init__(self, base_url: str, categories: list, user_agent: str, user_email: str,
+                 session: WikiSession = None, checkpoint: ExtractionCheckpoint = None):
         self.base_url = base_url
         self.categories = categories
         self.custom_agent = {
             'User-Agent': user_agent,
             'From': user_email
         }
+        self.session = session or WikiSession(user_agent, user_email)
+        self.checkpoint = checkpoint
+        # Page titles are added by the thread of each category, and checked for duplicates holding the lock
+        self.lock = threading.Lock()
         self.page_titles: Dict[str, str] = dict()
+        # Category names to the page titles extracted from the category, in the order of the category
+        self.category_titles: Dict[str, List[str]] = dict()
+        if checkpoint is not None:
+            # The checkpoint saves the page titles as they are extracted
+            self.page_titles = checkpoint.page_titles
+            self.category_titles = checkpoint.category_titles
 
     def __iter__(self) -> Generator[str, None, None]:
         """Iterate (loop) over the extracted or loaded OSRS Wiki page titles.
@@ -86,18 +110,111 @@ class WikiPageTitles:
             self.page_titles = json.load(input_json_file)
             return True
 
-    def extract_page_titles(self):
+    def extract_page_titles(self, workers: int = 1):
         """Query a list of categories in the OSRS Wiki and return a list of page titles.
 
         This function is used to loop the list of categories that you want to extract
         from the OSRS Wiki using the MediaWiki API. You can all it using one category,
         for example: `Items`. Or you can use a list of category strings, for example:
-        `Items, Pets, Furniture`.
+        `Items, Pets, Furniture`. Categories are extracted concurrently if more than one
+        worker is used. The page titles are then ordered by category, in the order of the
+        categories and then the order of each category, so the order is the same for any
+        number of workers (see `order_page_titles`).
+
+        :param workers: The maximum number of categories extracted at once.
+        """
+        with ThreadPoolExecutor(workers) as executor:
+            futures = [executor.submit(self.extract_page_titles_from_category, category)
+                       for category in self.categories]
+            try:
+                for future in futures:
+                    future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+        self.order_page_titles()
+
+    def extract_page_titles_and_revision_timestamps(self, workers: int = 4, batch_size: int = 50):
+        """Query a list of categories in the OSRS Wiki, and the last revision timestamp of every page title.
+
+        Categories are extracted concurrently, and a revisions request is made as soon as
+        `batch_size` new page titles have been extracted, so page titles and revision
+        timestamps are extracted at the same time. Every request waits for the rate
+        limiter of the session. If a checkpoint is used, page titles without a revision
+        timestamp are requested again.
+
+        :param workers: The maximum number of requests in progress at once.
+        :param batch_size: The number of page titles in each revisions request.
+        """
+        # Page titles without a revision timestamp, including page titles extracted by a resumed run
+        pending_titles = [page_title for page_title, revision_date in self.page_titles.items() if revision_date is None]
+        new_titles = queue.Queue()
+        with ThreadPoolExecutor(workers) as executor:
+            category_futures = list()
+            for category in self.categories:
+                category_future = executor.submit(self.extract_page_titles_from_category, category, new_titles.put)
+                # Signal the end of the category, even if the category failed
+                category_future.add_done_callback(lambda future: new_titles.put(None))
+                category_futures.append(category_future)
+
+            revision_futures = list()
+            try:
+                completed_categories = 0
+                while completed_categories < len(category_futures) or pending_titles:
+                    if completed_categories < len(category_futures):
+                        page_title = new_titles.get()
+                        if page_title is None:
+                            completed_categories += 1
+                        else:
+                            pending_titles.append(page_title)
+                    # Dispatch full batches, and the last partial batch when every category is complete
+                    while len(pending_titles) >= batch_size or \
+                            (pending_titles and completed_categories == len(category_futures)):
+                        revision_futures.append(executor.submit(self.extract_revision_batch, pending_titles[:batch_size]))
+                        pending_titles = pending_titles[batch_size:]
+                for future in category_futures + revision_futures:
+                    future.result()
+            finally:
+                for future in category_futures + revision_futures:
+                    future.cancel()
+
+        self.order_page_titles()
+        if self.checkpoint is not None:
+            self.checkpoint.save_later()
+
+    def order_page_titles(self):
+        """Order the page titles by category, in the order of the categories, then the order of each category.
+
+        Categories extracted concurrently add page titles in the order requests complete, so
+        the page titles are ordered again, and the exported page titles do not change order
+        between runs. Page titles not in a category (for example, a normalized page title
+        added by a revisions request) are kept after the other page titles.
+        """
+        with self.lock:
+            ordered_titles = dict()
+            for category in self.categories:
+                for page_title in self.category_titles.get(category, list()):
+                    if page_title in self.page_titles:
+                        ordered_titles.setdefault(page_title, self.page_titles[page_title])
+            for page_title, revision_date in self.page_titles.items():
+                ordered_titles.setdefault(page_title, revision_date)
+            # Update in place, the page titles are shared with the checkpoint
+            self.page_titles.clear()
+            self.page_titles.update(ordered_titles)
+
+    def add_page_title(self, page_title: str) -> bool:
+        """Add an extracted page title, if it has not already been extracted from another category.
+
+        :param page_title: The wiki page title.
+        :return: A boolean to indicate if the page title is new.
         """
-        for category in self.categories:
-            self.extract_page_titles_from_category(category)
+        with self.lock:
+            if page_title in self.page_titles:
+                return False
+            self.page_titles[page_title] = None
+            return True
 
-    def extract_page_titles_from_category(self, category: str):
+    def extract_page_titles_from_category(self, category: str, new_title_callback: Callable[[str], None] = None):
         """Query a specific category in the OSRS Wiki and populate a list of page tiles.
 
         A function to extract all page titles from a provided OSRS Wiki category. The
@@ -105,21 +222,37 @@ class WikiPageTitles:
         extracting wiki text or revision timestamps.
 
         :param category: A string representing the OSRS Wiki category to extract.
+        :param new_title_callback: A function called with every new page title, if provided.
         """
+        # Resume the category from the checkpoint, if the category has been started
+        last_continue = dict()
+        if self.checkpoint is not None:
+            last_continue = self.checkpoint.category_continue(category)
+            if last_continue is None:
+                # The category is complete
+                return
+
         # Start construct MediaWiki request
         request = {'list': 'categorymembers'}
+        category_titles = self.category_titles.setdefault(category, list())
 
-        for result in self._extract_page_titles_from_category_callback(request, category):
+        for result, next_continue in self._extract_page_titles_from_category_callback(request, category, last_continue):
             # Process JSON result data
             for entry in result['categorymembers']:
                 page_title = entry["title"]
                 if page_title.startswith("File:"):
                     continue
+                category_titles.append(page_title)
 
                 # Log the page title, and append to list
-                self.page_titles[page_title] = None
+                if self.add_page_title(page_title) and new_title_callback is not None:
+                    new_title_callback(page_title)
+
+            if self.checkpoint is not None:
+                self.checkpoint.update_category(category, next_continue)
 
-    def _extract_page_titles_from_category_callback(self, request: Dict, category: str):
+    def _extract_page_titles_from_category_callback(self, request: Dict, category: str,
+                                                    last_continue: Dict = None) -> Generator[Tuple[Dict, Dict], None, None]:
         """Query callback function for OSRS Wiki category query.
 
         A callback function for using MediaWiki generators. Since the category query is a
@@ -128,13 +261,15 @@ class WikiPageTitles:
 
         :param request: A dictionary to be populated with the OSRS Wiki API request.
         :param category: A string representing the OSRS Wiki category to extract.
+        :param last_continue: The 'continue' section to start the query from, to resume a category.
+        :return: The query response, and the 'continue' section of the next query (None for the last query).
         """
         request['cmtitle'] = 'Category:' + category
         request['action'] = 'query'
         request['format'] = 'json'
         request['cmlimit'] = '500'
 
-        last_continue = {}
+        last_continue = last_continue or {}
 
         while True:
             # Clone original request
@@ -145,16 +280,14 @@ class WikiPageTitles:
 
             # Perform HTTP GET request
             try:
-                result = requests.get(self.base_url,
-                                      headers=self.custom_agent,
-                                      params=req).json()
+                result = self.session.get_json(self.base_url, req)
             except requests.exceptions.RequestException as e:
                 raise SystemExit(">>> ERROR: Get request error. Exiting.") from e
 
             # Handle HTTP response
             if 'query' in result:
                 # If "query" entry is in JSON result, extract the query response
-                yield result['query']
+                yield result['query'], result.get('continue')
             if 'continue' not in result:
                 # If "continue" entry is not JSON result, there are no more page titles in category
                 break
@@ -190,9 +323,7 @@ class WikiPageTitles:
             'rvprop': 'timestamp'
         }
 
-        page_data = requests.get(self.base_url,
-                                 headers=self.custom_agent,
-                                 params=request).json()
+        page_data = self.session.get_json(self.base_url, request)
 
         # Loop returned page revision data
         pages_revision_data = page_data["query"]["pages"]
@@ -206,6 +337,15 @@ class WikiPageTitles:
 
         return pages_revision_data
 
+    def extract_revision_batch(self, page_titles: List[str]):
+        """Extract the last revision timestamp of a batch of page titles, saving the checkpoint if used.
+
+        :param page_titles: The wiki page titles, up to 50.
+        """
+        self.extract_last_revision_timestamp("|".join(page_titles))
+        if self.checkpoint is not None:
+            self.checkpoint.save_later()
+
     def export_page_titles_in_json(self, out_file_name: str):
         """Export all extracted page titles and revision timestamp to a JSON file.
 
@@ -0,0 +1,285 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+The HTTP session shared by every OSRS Wiki API request. Connections are kept
+open and pooled, every request has a timeout, and failed requests are retried
+with jittered exponential backoff. Responses can be saved in an on-disk cache,
+and are revalidated using the ETag and Last-Modified headers, so a repeated
+request only downloads the response again if it has changed.
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import os
+import json
+import time
+import random
+import hashlib
+import logging
+import threading
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+LOG = logging.getLogger(__name__)
+
+# Responses that are worth retrying: rate limited, or a server error
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """This class limits the rate of requests, shared by any number of threads.
+
+    Tokens are added at a fixed rate, up to the bucket capacity. Each request takes
+    one token, waiting until a token is available.
+
+    :param rate: The number of tokens added per second (the sustained request rate).
+    :param capacity: The maximum number of tokens (the largest burst of requests).
+    """
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last_update = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, waiting until one is available."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_update) * self.rate)
+                self.last_update = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class RetryableResponse(requests.exceptions.HTTPError):
+    """Raised for a response that should be retried (see `RETRY_STATUS_CODES`).
+
+    This is an HTTP error, so a response that fails after every retry is handled the
+    same as any other request error.
+    """
+    def __init__(self, response: requests.Response):
+        super().__init__(f"HTTP {response.status_code} response", response=response)
+
+
+def retry_wait(backoff: float, attempt: int) -> float:
+    """Calculate the wait before retrying a failed request.
+
+    The wait doubles with every attempt, and is randomised between half and one and a
+    half times the doubled wait, so requests that failed together are not retried together.
+
+    :param backoff: The wait before the first retry, in seconds.
+    :param attempt: The number of the failed attempt, starting at 0.
+    :return: The wait, in seconds.
+    """
+    return backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+
+
+def request(session: requests.Session, url: str, params: Dict, headers: Dict,
+            rate_limiter: TokenBucket = None, retries: int = 3, backoff: float = 1.0,
+            timeout: float = 30) -> requests.Response:
+    """Perform an HTTP GET request, retrying failed requests.
+
+    Connection errors, timeouts and rate limited or server error responses are retried,
+    see `retry_wait`. A rate limited response with a `Retry-After` header waits the
+    requested time instead.
+
+    :param session: The HTTP session, shared so connections are reused.
+    :param url: The request URL.
+    :param params: The request query parameters.
+    :param headers: The request headers.
+    :param rate_limiter: Every attempt waits for a token from the rate limiter, if provided.
+    :param retries: The number of times a failed request is retried.
+    :param backoff: The wait before the first retry, in seconds.
+    :param timeout: The connect and read timeout, in seconds.
+    :return: The response.
+    """
+    for attempt in range(retries + 1):
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        try:
+            response = session.get(url, params=params, headers=headers, timeout=timeout)
+            if response.status_code in RETRY_STATUS_CODES:
+                raise RetryableResponse(response)
+            response.raise_for_status()
+            return response
+        except (RetryableResponse, requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if attempt == retries:
+                raise
+            wait = retry_wait(backoff, attempt)
+            if isinstance(e, RetryableResponse) and e.response.headers.get("Retry-After", "").isdigit():
+                wait = int(e.response.headers["Retry-After"])
+            LOG.warning("Request failed (%s), retrying in %.1f seconds", e, wait)
+            time.sleep(wait)
+
+
+def request_json(session: requests.Session, url: str, params: Dict, headers: Dict,
+                 rate_limiter: TokenBucket = None, retries: int = 3, backoff: float = 1.0,
+                 timeout: float = 30) -> Dict:
+    """Perform an HTTP GET request and return the JSON response, retrying failed requests.
+
+    See `request` for the parameters.
+
+    :return: The JSON response.
+    """
+    return request(session, url, params, headers, rate_limiter, retries, backoff, timeout).json()
+
+
+class HttpCache:
+    """This class saves HTTP responses on disk, to revalidate them with a conditional request.
+
+    Only responses with an `ETag` or `Last-Modified` header are saved, as other responses
+    cannot be revalidated. Each response is saved in a JSON file named by a hash of the
+    request URL and query parameters.
+
+    :param cache_dir: The directory to save responses in, created if it does not exist.
+    """
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def entry_path(self, url: str, params: Dict) -> str:
+        """Return the file name of the saved response to a request.
+
+        :param url: The request URL.
+        :param params: The request query parameters.
+        :return: The cache entry file name.
+        """
+        key = json.dumps([url, sorted(params.items())])
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def load(self, url: str, params: Dict) -> Dict:
+        """Load the saved response to a request.
+
+        :param url: The request URL.
+        :param params: The request query parameters.
+        :return: A dictionary of the response `etag`, `last_modified` and `body`, or None if not saved.
+        """
+        try:
+            with open(self.entry_path(url, params)) as entry_file:
+                return json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, url: str, params: Dict, response: requests.Response):
+        """Save the response to a request, if it can be revalidated.
+
+        :param url: The request URL.
+        :param params: The request query parameters.
+        :param response: The response.
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag is None and last_modified is None:
+            return
+        entry_path = self.entry_path(url, params)
+        # Each thread writes a separate temporary file, and the last complete file is kept
+        temp_entry_path = f"{entry_path}.{threading.get_ident()}.tmp"
+        with open(temp_entry_path, "w") as entry_file:
+            json.dump({"etag": etag, "last_modified": last_modified, "body": response.text}, entry_file)
+        os.replace(temp_entry_path, entry_path)
+
+
+def conditional_headers(entry: Dict) -> Dict[str, str]:
+    """Construct the headers to revalidate a saved response.
+
+    :param entry: The saved response, see `HttpCache.load`.
+    :return: The `If-None-Match` and `If-Modified-Since` headers.
+    """
+    headers = dict()
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+class WikiSession:
+    """This class handles every HTTP request to the OSRS Wiki API, using a shared, pooled session.
+
+    The session is safe to share between threads. Requests wait for the rate limiter,
+    if a request rate is provided, and every response is saved in the HTTP cache, if
+    a cache directory is provided.
+
+    :param user_agent: A custom user-agent name to be used for the API request.
+    :param user_email: A custom user-agent email to be used for the API request.
+    :param requests_per_second: The maximum request rate, shared by every thread. Not limited if None.
+    :param pool_size: The maximum number of open connections, which should be the number of threads.
+    :param retries: The number of times a failed request is retried.
+    :param backoff: The wait before the first retry, in seconds.
+    :param timeout: The connect and read timeout, in seconds.
+    :param cache_dir: The directory to save responses in. Responses are not saved if None.
+    """
+    def __init__(self, user_agent: str, user_email: str, requests_per_second: float = None,
+                 pool_size: int = 4, retries: int = 3, backoff: float = 1.0, timeout: float = 30,
+                 cache_dir: str = None):
+        self.custom_agent = {
+            'User-Agent': user_agent,
+            'From': user_email
+        }
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.rate_limiter = None
+        if requests_per_second:
+            self.rate_limiter = TokenBucket(requests_per_second)
+        self.cache = None
+        if cache_dir is not None:
+            self.cache = HttpCache(cache_dir)
+        self.session = requests.Session()
+        # Keep a pooled connection for every thread
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get_json(self, url: str, params: Dict, use_cache: bool = True) -> Dict:
+        """Perform an HTTP GET request and return the JSON response.
+
+        If the response was saved by an earlier request, the request is conditional, and
+        the saved response is used if the server responds that it has not been modified.
+
+        :param url: The request URL.
+        :param params: The request query parameters.
+        :param use_cache: Set to False to skip the cache, for responses that will not be requested again.
+        :return: The JSON response.
+        """
+        cache = self.cache if use_cache else None
+        headers = self.custom_agent
+        entry = None
+        if cache is not None:
+            entry = cache.load(url, params)
+            if entry is not None:
+                headers = dict(headers, **conditional_headers(entry))
+        response = request(self.session, url, params, headers, self.rate_limiter, self.retries, self.backoff,
+                           self.timeout)
+        if response.status_code == 304 and entry is not None:
+            return json.loads(entry["body"])
+        if cache is not None:
+            cache.save(url, params, response)
+        return response.json()
+
+    def close(self):
+        """Close the HTTP session."""
+        self.session.close()
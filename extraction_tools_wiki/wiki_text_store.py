@@ -0,0 +1,294 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+An on-disk store of OSRS Wiki page wiki text, read one page at a time. Pages
+are saved in a JSON lines file (one page per line), with an index of the byte
+offset of every page title, so the wiki text of every page does not need to be
+loaded into memory.
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import os
+import json
+from collections.abc import Mapping
+from typing import Dict
+from typing import Generator
+from typing import Tuple
+
+
+class WikiTextStore(Mapping):
+    """This class reads and writes wiki text in a JSON lines store, one page at a time.
+
+    Each line of the store is a JSON object with a `title` and `text`. The index of
+    page titles to (offset, length) is saved next to the store, and rebuilt if the
+    store has changed size since the index was saved. The store can be used like a
+    dictionary of page titles to wiki text.
+
+    Pages are written by appending a line to the store, so writing a page does not
+    depend on the size of the store. A page written again is appended again, and
+    the last entry is used. Call `compact` to remove the older entries. If a write
+    is interrupted, the partly written line is ignored, and removed before the next
+    page is written.
+
+    :param store_path: The JSON lines file name, for example `extract_page_text_items.jsonl`.
+    """
+    def __init__(self, store_path: str):
+        self.store_path = store_path
+        self.index_path = store_path + ".index"
+        self.index: Dict[str, Tuple[int, int]] = dict()
+        # The size of the store, up to the end of the last complete line
+        self.store_size = 0
+        self.store_file = None
+        self.store_pid = None
+        self.append_file = None
+        self.index_changed = False
+        if os.path.isfile(store_path):
+            self.load_index()
+
+    def __getstate__(self) -> Dict:
+        # Open files are not sent to other processes, each process opens the store when it is first read
+        state = self.__dict__.copy()
+        state["store_file"] = None
+        state["store_pid"] = None
+        state["append_file"] = None
+        return state
+
+    def __enter__(self) -> "WikiTextStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __contains__(self, page_title) -> bool:
+        return page_title in self.index
+
+    def __getitem__(self, page_title: str) -> str:
+        """Read the wiki text of a page from the store.
+
+        :param page_title: The wiki page title.
+        :return: The page wiki text.
+        """
+        offset, length = self.index[page_title]
+        store_file = self.open_store()
+        store_file.seek(offset)
+        return json.loads(store_file.read(length))["text"]
+
+    def __iter__(self) -> Generator[str, None, None]:
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def open_store(self):
+        """Return the open store file, opening the file in the current process if needed."""
+        if self.store_file is None or self.store_pid != os.getpid():
+            self.store_file = open(self.store_path, "rb")
+            self.store_pid = os.getpid()
+        return self.store_file
+
+    def add(self, page_title: str, wiki_text: str):
+        """Write the wiki text of a page, by appending a line to the store.
+
+        The line is flushed to the operating system before returning, so a page is not
+        lost if the process stops. The index is saved when the store is closed.
+
+        :param page_title: The wiki page title.
+        :param wiki_text: The page wiki text.
+        """
+        if self.append_file is None:
+            self.append_file = open(self.store_path, "ab")
+            # Remove a line left partly written by an interrupted write
+            if self.append_file.tell() != self.store_size:
+                self.append_file.truncate(self.store_size)
+                self.append_file.seek(self.store_size)
+        line = store_line(page_title, wiki_text).encode("utf-8")
+        self.append_file.write(line)
+        self.append_file.flush()
+        self.index[page_title] = (self.store_size, len(line))
+        self.store_size += len(line)
+        self.index_changed = True
+
+    def close(self):
+        """Close the store files, saving the index if pages were written."""
+        if self.append_file is not None:
+            os.fsync(self.append_file.fileno())
+            self.append_file.close()
+            self.append_file = None
+        if self.index_changed:
+            self.save_index()
+        if self.store_file is not None:
+            self.store_file.close()
+            self.store_file = None
+
+    def compact(self):
+        """Rewrite the store with only the last entry of each page, in the order pages were first written."""
+        self.close()
+        temp_store_path = self.store_path + ".tmp"
+        with open(temp_store_path, "wb") as temp_store_file:
+            for page_title in self.index:
+                temp_store_file.write(self.read_line(page_title))
+            temp_store_file.flush()
+            os.fsync(temp_store_file.fileno())
+        self.close()
+        os.replace(temp_store_path, self.store_path)
+        self.build_index()
+
+    def read_line(self, page_title: str) -> bytes:
+        """Read the store line of a page, without decoding it.
+
+        :param page_title: The wiki page title.
+        :return: The line, including the line break.
+        """
+        offset, length = self.index[page_title]
+        store_file = self.open_store()
+        store_file.seek(offset)
+        return store_file.read(length)
+
+    def export_json(self, out_file_name: str):
+        """Export every page to a JSON file of page titles to wiki text.
+
+        The file is identical to the file written by `WikiPageText.export_wiki_text_to_json`,
+        and is written one page at a time.
+
+        :param out_file_name: The file name to save wiki text to.
+        """
+        temp_file_name = out_file_name + ".tmp"
+        with open(temp_file_name, mode="w") as out_file:
+            if not self.index:
+                out_file.write("{}")
+            else:
+                separator = "{\n"
+                for page_title in self.index:
+                    out_file.write(separator + "    " + json.dumps(page_title) + ": " + json.dumps(self[page_title]))
+                    separator = ",\n"
+                out_file.write("\n}")
+        os.replace(temp_file_name, out_file_name)
+        # The export is not newer than the store, so `open_wiki_text` does not convert it again
+        if os.path.isfile(self.store_path):
+            os.utime(self.store_path)
+
+    def load_index(self):
+        """Load the saved index, or build the index if the store has changed since the index was saved."""
+        if os.path.isfile(self.index_path):
+            with open(self.index_path) as index_file:
+                index_data = json.load(index_file)
+            if index_data["size"] == os.path.getsize(self.store_path):
+                self.index = {page_title: tuple(entry) for page_title, entry in index_data["pages"].items()}
+                self.store_size = index_data["size"]
+                return
+        self.build_index()
+
+    def build_index(self):
+        """Scan the store, and save the offset and length of every page.
+
+        If a page title is in the store more than once, the last entry is used.
+        """
+        self.index = dict()
+        offset = 0
+        with open(self.store_path, "rb") as store_file:
+            for line in store_file:
+                # A line without a line break was not completely written, and is ignored
+                if not line.endswith(b"\n"):
+                    break
+                self.index[json.loads(line)["title"]] = (offset, len(line))
+                offset += len(line)
+        self.store_size = offset
+        self.save_index()
+
+    def save_index(self):
+        """Save the index next to the store."""
+        temp_index_path = self.index_path + ".tmp"
+        with open(temp_index_path, "w") as index_file:
+            json.dump({"size": self.store_size, "pages": self.index}, index_file)
+        os.replace(temp_index_path, self.index_path)
+        self.index_changed = False
+
+
+def store_line(page_title: str, wiki_text: str) -> str:
+    """Format a page as a single line of the store.
+
+    :param page_title: The wiki page title.
+    :param wiki_text: The page wiki text.
+    :return: The JSON line, including the line break.
+    """
+    return json.dumps({"title": page_title, "text": wiki_text}) + "\n"
+
+
+def iter_json_dump(json_file) -> Generator[Tuple[str, str], None, None]:
+    """Iterate over the pages of a wiki text JSON file, one line at a time.
+
+    The JSON file is written by `WikiPageText` with `indent=4`, so every page is on
+    a single line. A file with a different layout is loaded completely instead.
+
+    :param json_file: The open wiki text JSON file.
+    :return: A (page title, wiki text) tuple for every page.
+    """
+    if json_file.readline().strip() != "{":
+        json_file.seek(0)
+        yield from json.load(json_file).items()
+        return
+    for line in json_file:
+        line = line.strip()
+        if line == "}":
+            break
+        if line.endswith(","):
+            line = line[:-1]
+        yield from json.loads("{" + line + "}").items()
+
+
+def convert_json_dump(json_path: str, store_path: str) -> WikiTextStore:
+    """Convert a wiki text JSON file (as saved by `WikiPageText`) to a store, without loading the whole file.
+
+    :param json_path: The wiki text JSON file, for example `extract_page_text_items.json`.
+    :param store_path: The JSON lines file name to save the store to.
+    :return: The converted store.
+    """
+    temp_store_path = store_path + ".tmp"
+    try:
+        with open(json_path) as json_file, open(temp_store_path, "w", newline="\n") as store_file:
+            for page_title, wiki_text in iter_json_dump(json_file):
+                store_file.write(store_line(page_title, wiki_text))
+    except ValueError:
+        # An unreadable JSON file is not converted, and the partly converted store is removed
+        os.remove(temp_store_path)
+        raise
+    # The index of any previous store is not valid for the new store
+    if os.path.isfile(store_path + ".index"):
+        os.remove(store_path + ".index")
+    os.replace(temp_store_path, store_path)
+    return WikiTextStore(store_path)
+
+
+def open_wiki_text(path_without_extension: str, missing_ok: bool = False) -> WikiTextStore:
+    """Open the wiki text store, converting the wiki text JSON file first if it is newer.
+
+    :param path_without_extension: The wiki text file name, without the `.json` or `.jsonl` extension.
+    :param missing_ok: Return an empty store if there is no store or JSON file, instead of raising
+                       FileNotFoundError. Used to start a new store.
+    :return: The wiki text store.
+    """
+    json_path = path_without_extension + ".json"
+    store_path = path_without_extension + ".jsonl"
+    if not missing_ok and not os.path.isfile(json_path) and not os.path.isfile(store_path):
+        raise FileNotFoundError(f"No wiki text store or JSON file: {store_path}, {json_path}")
+    if os.path.isfile(json_path):
+        if not os.path.isfile(store_path) or os.path.getmtime(json_path) > os.path.getmtime(store_path):
+            return convert_json_dump(json_path, store_path)
+    return WikiTextStore(store_path)
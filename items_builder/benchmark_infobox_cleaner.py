@@ -0,0 +1,145 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Benchmark the infobox_cleaner functions, using every infobox value in the wiki
+text dumps in the extraction_tools_wiki folder. Each cleaner is timed without
+memoization, with an empty cache and with a full cache, and the memoized
+output is checked against the output without memoization.
+Run from the items_builder folder, the same as builder.py.
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import os
+import glob
+import json
+import time
+from collections import defaultdict
+from typing import Callable
+from typing import Dict
+from typing import List
+
+import mwparserfromhell
+
+from items_builder import infobox_cleaner
+from items_builder.benchmark_infobox_parsing import print_timings
+from items_builder.wiki_templates import InfoboxParams
+from items_builder.wiki_templates import template_params
+
+# The infobox parameters cleaned by each cleaner, the same as BuildItem.parse_primary_infobox
+CLEANER_KEYS = {
+    "weight": "clean_weight",
+    "quest": "clean_quest",
+    "release": "clean_release_date",
+    "store": "clean_store_price",
+    "seller": "clean_seller",
+    "tradeable": "clean_tradeable",
+    "examine": "clean_examine",
+    "itemexamine": "clean_examine"
+}
+
+
+def extract_cleaner_values(wiki_text: Dict[str, str]) -> Dict[str, List[tuple]]:
+    """Extract the arguments of every cleaner call, from the infobox templates of wiki pages.
+
+    :param wiki_text: A dictionary of wiki page titles to wiki text.
+    :return: A dictionary of cleaner names to a list of argument tuples (repeated values are kept).
+    """
+    values = defaultdict(list)
+    for page_title, page_text in wiki_text.items():
+        for template in mwparserfromhell.parse(page_text).filter_templates(recursive=False):
+            if not str(template.name).strip().lower().startswith("infobox"):
+                continue
+            params = InfoboxParams(template_params(template))
+            for (key, version), value in params.params.items():
+                cleaner_name = CLEANER_KEYS.get(key)
+                if cleaner_name == "clean_examine":
+                    values[cleaner_name].append((value, params.value("name", version) or page_title))
+                elif cleaner_name is not None:
+                    values[cleaner_name].append((value,))
+    return values
+
+
+def call_cleaner(cleaner: Callable, args: tuple):
+    """Call a cleaner, returning the raised exception type name (as a string) instead of raising.
+
+    :param cleaner: The cleaner function.
+    :param args: The cleaner arguments.
+    :return: The cleaned value, or the exception type name.
+    """
+    try:
+        return cleaner(*args)
+    except Exception as e:
+        return type(e).__name__
+
+
+def time_calls(cleaner: Callable, values: List[tuple]) -> tuple:
+    """Time a cleaner over a list of arguments.
+
+    :param cleaner: The cleaner function.
+    :param values: The argument tuples.
+    :return: The cleaned values, and the time taken by each call in seconds.
+    """
+    results = list()
+    timings = list()
+    for args in values:
+        start = time.perf_counter()
+        results.append(call_cleaner(cleaner, args))
+        timings.append(time.perf_counter() - start)
+    return results, timings
+
+
+def benchmark_cleaners(values: Dict[str, List[tuple]]) -> Dict[str, int]:
+    """Time and check every memoized cleaner.
+
+    :param values: The cleaner arguments, as returned by `extract_cleaner_values`.
+    :return: A dictionary of cleaner names to the number of values with a different memoized output.
+    """
+    mismatches = dict()
+    for cleaner_name, cleaner_values in sorted(values.items()):
+        cleaner = getattr(infobox_cleaner, cleaner_name)
+        expected, uncached = time_calls(cleaner.__wrapped__, cleaner_values)
+        cleaner.cache_clear()
+        cold_results, cold = time_calls(cleaner, cleaner_values)
+        warm_results, warm = time_calls(cleaner, cleaner_values)
+
+        print(f">>> {cleaner_name}: {len(cleaner_values)} values, {len(set(cleaner_values))} unique")
+        print_timings("uncached", uncached)
+        print_timings("cached (empty cache)", cold)
+        print_timings("cached (full cache)", warm)
+        mismatches[cleaner_name] = sum(1 for results in (cold_results, warm_results)
+                                       for result, expected_result in zip(results, expected)
+                                       if result != expected_result)
+    return mismatches
+
+
+if __name__ == "__main__":
+    print(">>> Loading wiki text...")
+    all_wiki_text = dict()
+    for file_name in sorted(glob.glob(os.path.join("..", "extraction_tools_wiki", "extract_page_text_*.json"))):
+        with open(file_name) as wiki_text_file:
+            all_wiki_text.update(json.load(wiki_text_file))
+
+    print(">>> Benchmarking infobox cleaners...")
+    cleaner_mismatches = benchmark_cleaners(extract_cleaner_values(all_wiki_text))
+    for name, count in cleaner_mismatches.items():
+        if count:
+            print(f">>> ERROR: {name} memoized output differs for {count} values")
+    if any(cleaner_mismatches.values()):
+        exit(1)
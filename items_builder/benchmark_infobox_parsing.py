@@ -0,0 +1,118 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Benchmark the wiki text parsing stages of the items builder, over every item
+in the items-scraper.json file. Items are not exported, so the items-json
+folder is not modified. Run from the items_builder folder, the same as builder.py.
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import io
+import time
+import logging
+import contextlib
+from typing import Dict
+from typing import List
+
+from items_builder import builder
+from items_builder import item_builder
+from items_builder.wiki_templates import WikiTemplateCache
+
+
+def print_timings(name: str, timings: List[float]):
+    """Print the count, total, mean and percentiles of a list of timings.
+
+    :param name: The name of the timed stage to display.
+    :param timings: The timings, in seconds.
+    """
+    if not timings:
+        print(f"  > {name:<28} no items")
+        return
+    timings = sorted(timings)
+    count = len(timings)
+    p50 = timings[int(0.50 * (count - 1))] * 1e6
+    p99 = timings[int(0.99 * (count - 1))] * 1e6
+    mean = sum(timings) / count * 1e6
+    print(f"  > {name:<28} items: {count:6d}  total: {sum(timings):7.3f}s  mean: {mean:8.1f}us  "
+          f"p50: {p50:8.1f}us  p99: {p99:8.1f}us")
+
+
+def benchmark_items(inputs: Dict, wiki_templates: WikiTemplateCache = None) -> Dict[str, List[float]]:
+    """Time the infobox extraction and parsing of every item.
+
+    :param inputs: The build inputs, as returned by `builder.load_inputs`.
+    :param wiki_templates: The wiki text templates cache, a new (empty) cache is used if not provided.
+    :return: A dictionary of stage names to a list of per-item timings, in seconds.
+    """
+    if wiki_templates is None:
+        wiki_templates = WikiTemplateCache(inputs["wiki_text"], inputs.get("wiki_revisions"))
+    timings = {"extract infobox (page parse)": list(),
+               "extract infobox (cached)": list(),
+               "parse infobox": list(),
+               "parse bonuses": list(),
+               "total": list()}
+
+    # The builder debug logging is not part of the benchmark
+    logging.disable(logging.CRITICAL)
+    for item_id, item_json in inputs["cache_items"].items():
+        build_item = item_builder.BuildItem(item_id,
+                                            item_json,
+                                            inputs["wiki_text"],
+                                            inputs["normalized_names"],
+                                            inputs["buy_limits"],
+                                            inputs["skill_requirements"],
+                                            inputs["current_db"],
+                                            wiki_templates)
+        build_item.populate_from_scraper()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if not build_item.determine_wiki_page():
+                continue
+
+        misses = wiki_templates.misses
+        start = time.perf_counter()
+        has_infobox = build_item.extract_infobox()
+        extracted = time.perf_counter()
+        if has_infobox or build_item.status_code == 6:
+            build_item.parse_primary_infobox()
+        parsed = time.perf_counter()
+        if has_infobox and build_item.itemDefinition.equipable:
+            build_item.extract_bonuses()
+            timings["parse bonuses"].append(time.perf_counter() - parsed)
+        end = time.perf_counter()
+
+        if wiki_templates.misses > misses:
+            timings["extract infobox (page parse)"].append(extracted - start)
+        else:
+            timings["extract infobox (cached)"].append(extracted - start)
+        if has_infobox or build_item.status_code == 6:
+            timings["parse infobox"].append(parsed - extracted)
+        timings["total"].append(end - start)
+    logging.disable(logging.NOTSET)
+
+    return timings
+
+
+if __name__ == "__main__":
+    print(">>> Loading build inputs...")
+    build_inputs = builder.load_inputs()
+
+    print(">>> Benchmarking infobox parsing for every item...")
+    for stage, stage_timings in benchmark_items(build_inputs).items():
+        print_timings(stage, stage_timings)
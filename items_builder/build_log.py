@@ -0,0 +1,126 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Structured logging for the items builder. Every log message is written as a
+single line JSON object, and each item has one build record (stage timings,
+status code and outcome). Log messages are passed through a queue, so the
+file is written by a listener thread, not the processes building items.
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+import logging
+import logging.handlers
+import multiprocessing
+
+# The logger used by every items builder module
+LOGGER_NAME = "items_builder"
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Format log records as single line JSON objects.
+
+    The build record of an item (passed as the `build_record` extra) is merged
+    into the JSON object.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        log_record = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        build_record = getattr(record, "build_record", None)
+        if build_record is not None:
+            log_record.update(build_record)
+        if record.exc_text:
+            log_record["exception"] = record.exc_text
+        elif record.exc_info:
+            log_record["exception"] = self.formatException(record.exc_info)
+        return json.dumps(log_record, default=str)
+
+
+def configure_logger(log_queue: multiprocessing.Queue, level: int):
+    """Send every items builder log message at or above a level to a queue.
+
+    Called in the main process, and in each builder worker process.
+
+    :param log_queue: The queue read by the log listener.
+    :param level: The minimum log level, messages below the level are not formatted.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+def reset_logger():
+    """Remove the queue handler, and restore the default items builder logger."""
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.setLevel(logging.NOTSET)
+    logger.propagate = True
+
+
+class BuildLog:
+    """This class writes the items builder log to a file, using a queue and listener thread.
+
+    Use as a context manager around the build:
+
+        with BuildLog("builder.log", logging.INFO) as build_log:
+            build_items(inputs, workers, log_queue=build_log.queue, log_level=build_log.level)
+
+    :param log_file: The file to write the log to (any existing file is replaced).
+    :param level: The minimum log level.
+    """
+    def __init__(self, log_file: str, level: int = logging.INFO):
+        self.log_file = log_file
+        self.level = level
+        self.queue = None
+        self.listener = None
+
+    def __enter__(self) -> "BuildLog":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """Start the listener thread, and send the items builder log messages to it."""
+        # A process-safe queue, so worker processes can log to the same file
+        self.queue = multiprocessing.Queue()
+        file_handler = logging.FileHandler(self.log_file, mode="w")
+        file_handler.setFormatter(JsonLogFormatter())
+        self.listener = logging.handlers.QueueListener(self.queue, file_handler)
+        self.listener.start()
+        configure_logger(self.queue, self.level)
+
+    def stop(self):
+        """Write any queued log messages, stop the listener thread and close the log file."""
+        reset_logger()
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        self.queue.close()
+        self.queue.join_thread()
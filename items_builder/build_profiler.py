@@ -0,0 +1,226 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Opt-in timing and profiling for the items builder. Records the time taken by
+each BuildItem.populate stage and each call to the wiki text parsing and
+infobox cleaning helpers, summarises them as percentiles, and profiles the
+slowest items with cProfile.
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import os
+import time
+import pstats
+import cProfile
+import logging
+import functools
+from collections import defaultdict
+from typing import Callable
+from typing import Dict
+from typing import List
+
+import mwparserfromhell
+
+from items_builder import item_builder
+from items_builder import infobox_cleaner
+from items_builder.wiki_templates import InfoboxParams
+
+# The timing of every helper call since the last item, keyed by helper name
+_helper_timings: Dict[str, List[float]] = defaultdict(list)
+
+
+def helper_targets() -> List[tuple]:
+    """List the helper functions that are timed when helpers are instrumented.
+
+    :return: A list of (owner, attribute name, display name) tuples.
+    """
+    targets = [(mwparserfromhell, "parse", "mwparserfromhell.parse"),
+               (InfoboxParams, "get", "InfoboxParams.get"),
+               (InfoboxParams, "value", "InfoboxParams.value"),
+               (item_builder.BuildItem, "clean_bonuses_value", "BuildItem.clean_bonuses_value")]
+    for name in sorted(vars(infobox_cleaner)):
+        if name.startswith("clean_"):
+            targets.append((infobox_cleaner, name, f"infobox_cleaner.{name}"))
+    return targets
+
+
+def timed(function: Callable, name: str) -> Callable:
+    """Wrap a function, recording the time taken by every call.
+
+    :param function: The function to time.
+    :param name: The helper name the timings are recorded under.
+    :return: The wrapped function.
+    """
+    timings = _helper_timings
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timings[name].append(time.perf_counter() - start)
+    wrapper.timed_helper = name
+    return wrapper
+
+
+def instrument_helpers():
+    """Replace every helper function with a timed version, in the current process."""
+    for owner, attribute, name in helper_targets():
+        function = getattr(owner, attribute)
+        if not hasattr(function, "timed_helper"):
+            setattr(owner, attribute, timed(function, name))
+
+
+def remove_instrumentation():
+    """Restore every helper function replaced by `instrument_helpers`."""
+    for owner, attribute, _ in helper_targets():
+        function = getattr(owner, attribute)
+        if hasattr(function, "timed_helper"):
+            setattr(owner, attribute, function.__wrapped__)
+    _helper_timings.clear()
+
+
+def take_item_profile(stage_timings: Dict[str, float]) -> Dict:
+    """Return the timings of the item just built, and reset the helper timings for the next item.
+
+    :param stage_timings: The stage timings of the item, from `BuildItem.stage_timings`.
+    :return: A dictionary of the `stages` and `helpers` timings, in seconds.
+    """
+    helpers = dict(_helper_timings)
+    _helper_timings.clear()
+    return {"stages": dict(stage_timings), "helpers": helpers}
+
+
+def percentile(timings: List[float], fraction: float) -> float:
+    """Return a percentile of a sorted list of timings (using the nearest rank).
+
+    :param timings: The timings, sorted in ascending order.
+    :param fraction: The percentile, as a fraction between 0 and 1.
+    :return: The timing at the percentile.
+    """
+    return timings[int(fraction * (len(timings) - 1))]
+
+
+def summarise(timings: List[float]) -> Dict[str, float]:
+    """Summarise a list of timings.
+
+    :param timings: The timings, in seconds.
+    :return: The count, total, mean, p50, p90, p99 and max of the timings.
+    """
+    timings = sorted(timings)
+    return {
+        "count": len(timings),
+        "total": sum(timings),
+        "mean": sum(timings) / len(timings),
+        "p50": percentile(timings, 0.50),
+        "p90": percentile(timings, 0.90),
+        "p99": percentile(timings, 0.99),
+        "max": timings[-1]
+    }
+
+
+class BuildProfiler:
+    """This class aggregates the stage and helper timings of every item in a build.
+
+    Pass to `builder.build_items` to enable the instrumentation, which is off by default.
+    """
+    def __init__(self):
+        self.stages: Dict[str, List[float]] = defaultdict(list)
+        self.helpers: Dict[str, List[float]] = defaultdict(list)
+        self.item_totals: Dict[str, float] = dict()
+
+    def add_item(self, item_id: str, item_profile: Dict):
+        """Add the timings of a single item.
+
+        :param item_id: The item ID number.
+        :param item_profile: The item timings, as returned by `take_item_profile`.
+        """
+        for stage, seconds in item_profile["stages"].items():
+            self.stages[stage].append(seconds)
+        for helper, timings in item_profile["helpers"].items():
+            self.helpers[helper].extend(timings)
+        if "total" in item_profile["stages"]:
+            self.item_totals[item_id] = item_profile["stages"]["total"]
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Summarise the timings of every stage and helper.
+
+        :return: A dictionary of `stages` and `helpers`, each a dictionary of names to `summarise` results.
+        """
+        return {
+            "stages": {stage: summarise(timings) for stage, timings in self.stages.items()},
+            "helpers": {helper: summarise(timings) for helper, timings in sorted(self.helpers.items())}
+        }
+
+    def print_summary(self):
+        """Print a table of the stage and helper timings."""
+        for group, rows in self.summary().items():
+            print(f">>> Build timings by {group[:-1]}:")
+            print(f"  {'name':<40} {'calls':>8} {'total s':>9} {'mean us':>10} {'p50 us':>10} "
+                  f"{'p90 us':>10} {'p99 us':>10} {'max us':>10}")
+            for name, stats in rows.items():
+                print(f"  {name:<40} {stats['count']:8d} {stats['total']:9.3f} {stats['mean'] * 1e6:10.1f} "
+                      f"{stats['p50'] * 1e6:10.1f} {stats['p90'] * 1e6:10.1f} {stats['p99'] * 1e6:10.1f} "
+                      f"{stats['max'] * 1e6:10.1f}")
+
+    def slowest_items(self, count: int) -> List[str]:
+        """Return the item ID numbers of the slowest items to build.
+
+        :param count: The number of items.
+        :return: The item ID numbers, slowest first.
+        """
+        return sorted(self.item_totals, key=self.item_totals.get, reverse=True)[:count]
+
+
+def profile_items(item_ids: List[str], build: Callable, output_path: str) -> List[str]:
+    """Build items again under cProfile, saving a pstats file for each item.
+
+    :param item_ids: The item ID numbers to profile.
+    :param build: The function to build a single item, called with the item ID number.
+    :param output_path: The folder to save the `<item ID>.prof` files to.
+    :return: The saved file paths.
+    """
+    os.makedirs(output_path, exist_ok=True)
+    file_paths = list()
+    # The builder logging is not part of the profile
+    logging.disable(logging.CRITICAL)
+    try:
+        for item_id in item_ids:
+            profiler = cProfile.Profile()
+            profiler.runcall(build, item_id)
+            file_path = os.path.join(output_path, f"{item_id}.prof")
+            profiler.dump_stats(file_path)
+            file_paths.append(file_path)
+    finally:
+        logging.disable(logging.NOTSET)
+    return file_paths
+
+
+def print_profiles(file_paths: List[str], count: int = 20):
+    """Print the functions with the highest cumulative time, over a set of pstats files.
+
+    :param file_paths: The pstats files, as saved by `profile_items`.
+    :param count: The number of functions to print.
+    """
+    if not file_paths:
+        return
+    stats = pstats.Stats(*file_paths)
+    stats.sort_stats("cumulative").print_stats(count)
@@ -19,17 +19,40 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 ###############################################################################
 """
 
+import io
 import os
 import json
+import logging
+import contextlib
+import traceback
+import multiprocessing
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Iterable
 
 from items_builder import item_builder
+from items_builder import build_log
+from items_builder import build_profiler
+from items_builder import item_fingerprints
+from items_builder.json_writer import ItemJsonWriter
+from items_builder.wiki_templates import WikiTemplateCache
+from items_builder.update_tools import item_diff
+from extraction_tools_wiki.wiki_text_store import open_wiki_text
 
+# The read-only build inputs, set once in each worker process by init_worker
+_inputs: Dict = dict()
+# The parsed wiki text templates, shared by every item built in the process
+_wiki_templates: WikiTemplateCache = None
+# Whether item stage and helper timings are returned with each item
+_profile: bool = False
 
-if __name__ == "__main__":
-    # Delete old log file
-    if os.path.exists("builder.log"):
-        os.remove("builder.log")
 
+def load_inputs() -> Dict:
+    """Load every input needed to build the items database.
+
+    :return: A dictionary of the build inputs, keyed by the BuildItem argument name.
+    """
     # Load the raw output from OSRS cache
     scraper_path = os.path.join("..", "docs", "items-scraper.json")
     with open(scraper_path) as f:
@@ -44,9 +67,14 @@ if __name__ == "__main__":
     extraction_path_wiki = os.path.join("..", "extraction_tools_wiki", "")
     extraction_path_other = os.path.join("..", "extraction_tools_other", "")
 
-    # Load the wiki text file
-    with open(extraction_path_wiki + "extract_page_text_items.json") as wiki_text_file:
-        wiki_text = json.load(wiki_text_file)
+    # Open the wiki text store, the wiki text of each page is read from disk when needed
+    wiki_text = open_wiki_text(extraction_path_wiki + "extract_page_text_items")
+
+    # Load the wiki page revision dates, used to key the parsed wiki text templates
+    wiki_revisions = dict()
+    if os.path.isfile(extraction_path_wiki + "extract_page_titles_items.json"):
+        with open(extraction_path_wiki + "extract_page_titles_items.json") as wiki_titles_file:
+            wiki_revisions = json.load(wiki_titles_file)
 
     # Load all normalized names
     normalized_names = dict()
@@ -73,16 +101,270 @@ if __name__ == "__main__":
         for k, v in temp.items():
             skill_requirements[k] = v
 
-    # Start processing every item!
-    for item_id in cache_items:
-        json_data = cache_items[item_id]
-        # Initialize the BuildItem class
-        builder = item_builder.BuildItem(item_id,
-                                         json_data,
-                                         wiki_text,
-                                         normalized_names,
-                                         buy_limits,
-                                         skill_requirements,
-                                         current_db)
-        # Start the build item population function
-        builder.populate()
+    return {
+        "cache_items": cache_items,
+        "wiki_text": wiki_text,
+        "wiki_revisions": wiki_revisions,
+        "normalized_names": normalized_names,
+        "buy_limits": buy_limits,
+        "skill_requirements": skill_requirements,
+        "current_db": current_db
+    }
+
+
+def init_worker(inputs: Dict, wiki_templates: WikiTemplateCache, log_queue=None, log_level: int = logging.INFO,
+                profile: bool = False):
+    """Store the read-only build inputs for the current process.
+
+    Used as the process pool initializer, so the inputs are sent to each worker
+    once (or inherited when processes are forked), rather than with every item.
+
+    :param inputs: The build inputs, as returned by `load_inputs`.
+    :param wiki_templates: The parsed wiki text templates cache.
+    :param log_queue: The build log queue, None leaves logging unchanged.
+    :param log_level: The minimum build log level.
+    :param profile: Time each build stage and helper function, see `build_profiler`.
+    """
+    global _inputs, _wiki_templates, _profile
+    _inputs = inputs
+    _wiki_templates = wiki_templates
+    _profile = profile
+    if log_queue is not None:
+        build_log.configure_logger(log_queue, log_level)
+    if profile:
+        build_profiler.instrument_helpers()
+
+
+def build_item(item_id: str) -> Tuple[str, str, str, Dict, Dict, Dict]:
+    """Build a single item, using the inputs stored by `init_worker`.
+
+    Anything the item build prints is captured and returned, so the output of
+    each item can be printed in order, no matter which process built it. The item
+    JSON is returned (rather than saved) so every file is written by the main process.
+
+    :param item_id: The item ID number, as a key of `items-scraper.json`.
+    :return: The item ID number, an error message (None if the item was built), the printed
+             output, any wiki pages parsed while building the item, the item JSON to save
+             and the item timings (None unless profiling).
+    """
+    error = None
+    item_json = None
+    builder = None
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            builder = item_builder.BuildItem(item_id,
+                                             _inputs["cache_items"][item_id],
+                                             _inputs["wiki_text"],
+                                             _inputs["normalized_names"],
+                                             _inputs["buy_limits"],
+                                             _inputs["skill_requirements"],
+                                             _inputs["current_db"],
+                                             _wiki_templates)
+            item_json = builder.populate(export=False)
+        except item_builder.BuildItemError as e:
+            error = str(e)
+        except Exception:
+            error = traceback.format_exc()
+    item_profile = None
+    if _profile:
+        item_profile = build_profiler.take_item_profile(builder.stage_timings if builder is not None else dict())
+    return item_id, error, output.getvalue(), _wiki_templates.take_new_entries(), item_json, item_profile
+
+
+def build_items(inputs: Dict, workers: int = 1, chunk_size: int = 64,
+                wiki_templates: WikiTemplateCache = None, item_ids: List[str] = None,
+                export_path: str = os.path.join("..", "docs", "items-json"),
+                log_queue=None, log_level: int = logging.INFO,
+                profiler: build_profiler.BuildProfiler = None,
+                outcomes: Dict[str, str] = None,
+                built_items: Dict[str, Dict] = None) -> List[Tuple[str, str]]:
+    """Build every item in the items-scraper.json file, or a selection of items.
+
+    Items are independent, so with more than one worker the item IDs are split into
+    chunks and shared across a pool of processes. Results (and any printed output)
+    are handled in items-scraper.json order either way.
+
+    :param inputs: The build inputs, as returned by `load_inputs`.
+    :param workers: The number of processes to use, 1 builds every item in this process.
+    :param chunk_size: The number of item IDs sent to a worker at a time.
+    :param wiki_templates: The parsed wiki text templates cache, updated with every page parsed.
+    :param item_ids: The item ID numbers to build, None builds every item.
+    :param export_path: The folder to save the item JSON files to.
+    :param log_queue: The build log queue used by worker processes, see `build_log.BuildLog`.
+    :param log_level: The minimum build log level used by worker processes.
+    :param profiler: Collects the stage and helper timings of every item, None disables the timings.
+    :param outcomes: If provided, filled with the build outcome of every item that did not fail:
+                     `item_fingerprints.EXPORTED`, or `item_fingerprints.SKIPPED` if the item is not exported.
+    :param built_items: If provided, filled with the item JSON of every exported item, see `database_changeset`.
+    :return: A list of (item ID, error message) tuples for the items that failed to build.
+    """
+    if item_ids is None:
+        item_ids = list(inputs["cache_items"])
+    failed = list()
+
+    if wiki_templates is None:
+        wiki_templates = WikiTemplateCache(inputs["wiki_text"], inputs.get("wiki_revisions"))
+
+    if workers > 1:
+        pool = multiprocessing.Pool(workers, initializer=init_worker,
+                                    initargs=(inputs, wiki_templates, log_queue, log_level, profiler is not None))
+        results = pool.imap(build_item, item_ids, chunksize=chunk_size)
+    else:
+        pool = None
+        init_worker(inputs, wiki_templates, profile=profiler is not None)
+        results = map(build_item, item_ids)
+
+    json_writer = ItemJsonWriter(export_path)
+    try:
+        for item_id, error, output, parsed_pages, item_json, item_profile in results:
+            if pool is not None:
+                # Keep the pages parsed by the worker processes, so the cache can be saved
+                wiki_templates.update(parsed_pages)
+            print(output, end="")
+            if profiler is not None:
+                profiler.add_item(item_id, item_profile)
+            if error is not None:
+                print(f">>> ERROR: Item {item_id} failed to build: {error}")
+                failed.append((item_id, error))
+            elif item_json is not None:
+                json_writer.add(item_json["id"], item_json)
+                if outcomes is not None:
+                    outcomes[item_id] = item_fingerprints.EXPORTED
+                if built_items is not None:
+                    built_items[item_id] = item_json
+            elif outcomes is not None:
+                outcomes[item_id] = item_fingerprints.SKIPPED
+    finally:
+        json_writer.close()
+        if pool is not None:
+            pool.close()
+            pool.join()
+        else:
+            build_profiler.remove_instrumentation()
+
+    print(f">>> Item JSON files written: {json_writer.written}, unchanged: {json_writer.unchanged}")
+    return failed
+
+
+def database_changeset(current_db: Dict, item_ids: Iterable[str], built_items: Dict[str, Dict],
+                       outcomes: Dict[str, str]) -> item_diff.Changeset:
+    """Compare the items database before and after a build, see `item_diff.diff_databases`.
+
+    Exported items have the built item JSON, and items that were not built (or failed to
+    build) keep their current record. Skipped items, and items no longer in the inputs,
+    are removed from the database.
+
+    :param current_db: The current database contents (`items-complete.json`).
+    :param item_ids: The item ID numbers in the build inputs (`items-scraper.json`).
+    :param built_items: The item JSON of every exported item, see `build_items`.
+    :param outcomes: The build outcome of every built item, see `build_items`.
+    :return: The changeset.
+    """
+    item_ids = set(item_ids)
+    built_db = {item_id: record for item_id, record in current_db.items()
+                if item_id in item_ids and outcomes.get(item_id) != item_fingerprints.SKIPPED}
+    built_db.update(built_items)
+    return item_diff.diff_databases(current_db, built_db)
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-w",
+                    "--workers",
+                    type=int,
+                    default=1,
+                    help="The number of processes used to build items")
+    ap.add_argument("-t",
+                    "--template-cache",
+                    help="A JSON file to load and save the parsed wiki text templates, reused between runs")
+    ap.add_argument("-i",
+                    "--incremental",
+                    action="store_true",
+                    help="Only build items with inputs that changed since the last build")
+    ap.add_argument("-l",
+                    "--log-level",
+                    default="INFO",
+                    choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+                    help="The minimum level of messages written to builder.log")
+    ap.add_argument("-p",
+                    "--profile",
+                    action="store_true",
+                    help="Print a table of the time taken by each build stage and helper function")
+    ap.add_argument("--profile-slowest",
+                    type=int,
+                    default=0,
+                    help="With --profile, save cProfile stats for this many of the slowest items to builder-profile")
+    args = vars(ap.parse_args())
+
+    build_inputs = load_inputs()
+
+    # Load the parsed wiki text templates from the last run, pages changed since are parsed again
+    templates_cache = WikiTemplateCache(build_inputs["wiki_text"], build_inputs["wiki_revisions"])
+    if args["template_cache"]:
+        templates_cache.load(args["template_cache"])
+
+    # Fingerprint the inputs of every item, and determine which items need to be built
+    fingerprints_path = os.path.join("..", "docs", "items-fingerprints.json")
+    fingerprints = item_fingerprints.compute_fingerprints(build_inputs, templates_cache)
+    past_fingerprints = item_fingerprints.load_fingerprints(fingerprints_path)
+    build_ids = None
+    if args["incremental"]:
+        build_ids = item_fingerprints.items_to_build(fingerprints,
+                                                     past_fingerprints,
+                                                     os.path.join("..", "docs", "items-json"))
+        print(f">>> Incremental build: {len(build_ids)} of {len(fingerprints)} items changed")
+
+    # Remove the JSON files of items built by the last build that are no longer in items-scraper.json
+    removed_ids = item_fingerprints.remove_deleted_items(fingerprints, past_fingerprints, os.path.join("..", "docs", "items-json"))
+    if removed_ids:
+        print(f">>> Removed {len(removed_ids)} items no longer in items-scraper.json")
+
+    # Stage and helper timings are only recorded when requested, the instrumentation slows the build
+    items_profiler = build_profiler.BuildProfiler() if args["profile"] else None
+
+    # Start processing every item! The builder.log file is replaced, with one JSON record per line
+    build_outcomes = dict()
+    built_items = dict()
+    with build_log.BuildLog("builder.log", getattr(logging, args["log_level"])) as items_build_log:
+        failed_items = build_items(build_inputs,
+                                   args["workers"],
+                                   wiki_templates=templates_cache,
+                                   item_ids=build_ids,
+                                   log_queue=items_build_log.queue,
+                                   log_level=items_build_log.level,
+                                   profiler=items_profiler,
+                                   outcomes=build_outcomes,
+                                   built_items=built_items)
+
+    # Report every added, removed and changed item, compared to the current database
+    changeset = database_changeset(build_inputs["current_db"], build_inputs["cache_items"], built_items, build_outcomes)
+    print(changeset.summary())
+    changeset.save("builder-changes.json")
+    print(">>> Changes saved to: builder-changes.json")
+
+    if items_profiler is not None:
+        items_profiler.print_summary()
+        if args["profile_slowest"]:
+            # Build the slowest items again under cProfile, parsing their wiki pages from scratch
+            init_worker(build_inputs, WikiTemplateCache(build_inputs["wiki_text"], build_inputs["wiki_revisions"]))
+            profile_files = build_profiler.profile_items(items_profiler.slowest_items(args["profile_slowest"]),
+                                                         build_item,
+                                                         "builder-profile")
+            build_profiler.print_profiles(profile_files)
+            print(f">>> Saved cProfile stats for {len(profile_files)} items to builder-profile")
+
+    if args["template_cache"]:
+        templates_cache.save(args["template_cache"])
+    item_fingerprints.save_fingerprints(item_fingerprints.built_fingerprints(fingerprints,
+                                                                             [item_id for item_id, _ in failed_items],
+                                                                             build_outcomes,
+                                                                             past_fingerprints),
+                                        fingerprints_path)
+
+    if failed_items:
+        print(f">>> {len(failed_items)} items failed to build:")
+        for failed_id, failed_error in failed_items:
+            print(f"{failed_id}: {failed_error.splitlines()[-1]}")
+        exit(1)
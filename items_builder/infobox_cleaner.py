@@ -21,11 +21,30 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import re
 import datetime
+import functools
 from typing import List
 
 import dateparser
 
+# The number of distinct raw values remembered by each cleaner, the same values repeat across many items
+CACHE_SIZE = 4096
 
+# Translation tables, to remove a set of characters in a single pass
+REMOVE_BRACKETS = str.maketrans("", "", "[]")
+REMOVE_BRACES = str.maketrans("", "", "{}")
+REMOVE_ANGLE_BRACKETS = str.maketrans("", "", "<>")
+
+# Quest related examine texts (mostly for keys), for example: "A key (Witch's House)"
+EXAMINE_PARENTHESES = re.compile(r' \([^()]*\)')
+
+CLUE_SCROLLS = frozenset(["Clue scroll (easy)",
+                          "Clue scroll (medium)",
+                          "Clue scroll (hard)",
+                          "Clue scroll (elite)"])
+TRADEABLE_TRUE = frozenset(["True", "true", "Yes", "yes"])
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
 def clean_weight(value: str) -> float:
     """A helper method to convert the weight entry from a OSRS Wiki infobox to a float.
 
@@ -36,8 +55,7 @@ def clean_weight(value: str) -> float:
     weight = weight.strip()
 
     # Replace generic wiki text links
-    weight = weight.replace("[", "")
-    weight = weight.replace("]", "")
+    weight = weight.translate(REMOVE_BRACKETS)
 
     # Remove "kg" from weight
     weight = weight.replace("kg", "")
@@ -46,8 +64,7 @@ def clean_weight(value: str) -> float:
     # For example: "'''Inventory:''' 0.3{{kg}}<br> '''Equipped:''' -4.5"
     if "inventory" in weight.lower():
         weight = weight.replace("'''", "")
-        weight = weight.replace("{", "")
-        weight = weight.replace("}", "")
+        weight = weight.translate(REMOVE_BRACES)
         # Split based on HTML break
         if "<br>" in weight:
             weight_list = weight.split("<br>")
@@ -62,10 +79,7 @@ def clean_weight(value: str) -> float:
         weight = weight.replace("inventory:", "")
 
     # Remove greater than, less than for approximate weights
-    if ">" in weight:
-        weight = weight.replace(">", "")
-    if "<" in weight:
-        weight = weight.replace("<", "")
+    weight = weight.translate(REMOVE_ANGLE_BRACKETS)
 
     # Strip the string again...
     weight = weight.strip()
@@ -82,6 +96,7 @@ def clean_weight(value: str) -> float:
     return weight
 
 
+@functools.lru_cache(maxsize=CACHE_SIZE)
 def clean_quest(value: str) -> List:
     """A helper method to convert the quest entry from an OSRS Wiki infobox to a boolean.
 
@@ -106,6 +121,7 @@ def clean_quest(value: str) -> List:
     return quest
 
 
+@functools.lru_cache(maxsize=CACHE_SIZE)
 def clean_release_date(value: str) -> str:
     """A helper method to convert the release date entry from an OSRS Wiki infobox.
 
@@ -117,8 +133,7 @@ def clean_release_date(value: str) -> str:
     """
     release_date = value
     release_date = release_date.strip()
-    release_date = release_date.replace("[", "")
-    release_date = release_date.replace("]", "")
+    release_date = release_date.translate(REMOVE_BRACKETS)
     try:
         release_date = datetime.datetime.strptime(release_date, "%d %B %Y")
         return release_date.strftime("%d %B %Y")
@@ -134,6 +149,7 @@ def clean_release_date(value: str) -> str:
     return release_date
 
 
+@functools.lru_cache(maxsize=CACHE_SIZE)
 def clean_tradeable(value: str) -> bool:
     """A helper method to convert the tradeable entry from an OSRS Wiki infobox.
 
@@ -143,19 +159,13 @@ def clean_tradeable(value: str) -> bool:
     tradeable = str(value)
     tradeable = tradeable.strip()
 
-    tradeable = tradeable.replace("[", "")
-    tradeable = tradeable.replace("]", "")
-
-    if tradeable in ["True", "true", True, "Yes", "yes"]:
-        tradeable = True
-    elif tradeable in ["False", "false", False, "No", "no"]:
-        tradeable = False
-    else:
-        tradeable = False
+    tradeable = tradeable.translate(REMOVE_BRACKETS)
 
-    return tradeable
+    # Anything other than a true value (including unknown values) is not tradeable
+    return tradeable in TRADEABLE_TRUE
 
 
+@functools.lru_cache(maxsize=CACHE_SIZE)
 def clean_examine(value: str, name: str) -> str:
     """A helper method to convert the examine text entry from an OSRS Wiki infobox.
 
@@ -166,15 +176,10 @@ def clean_examine(value: str, name: str) -> str:
     examine = str(value)
     examine = examine.strip()
 
-    examine = examine.replace("[", "")
-    examine = examine.replace("]", "")
+    examine = examine.translate(REMOVE_BRACKETS)
 
     # Generic fix for clue scroll related items
-    clue_scrolls = ["Clue scroll (easy)",
-                    "Clue scroll (medium)",
-                    "Clue scroll (hard)",
-                    "Clue scroll (elite)"]
-    if name in clue_scrolls:
+    if name in CLUE_SCROLLS:
         examine = "A clue!"
         return examine
     if name == "Key (medium)":
@@ -182,7 +187,7 @@ def clean_examine(value: str, name: str) -> str:
         return examine
 
     # Fix for quest related examine texts (mostly for keys)
-    examine = re.sub(r' \([^()]*\)', '', examine)
+    examine = EXAMINE_PARENTHESES.sub('', examine)
 
     # Remove nowiki tags
     examine = examine.replace("<nowiki>", "")
@@ -214,6 +219,7 @@ def clean_examine(value: str, name: str) -> str:
     return examine
 
 
+@functools.lru_cache(maxsize=CACHE_SIZE)
 def clean_store_price(value: str) -> str:
     """"A helper method to convert the store price entry from an OSRS Wiki infobox.
 
@@ -242,6 +248,7 @@ def clean_store_price(value: str) -> str:
     return store_price
 
 
+@functools.lru_cache(maxsize=CACHE_SIZE)
 def clean_seller(value: str) -> str:
     """A helper method to convert the seller entry from an OSRS Wiki infobox.
 
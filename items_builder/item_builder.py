@@ -20,17 +20,27 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import os
+import time
 import logging
-import mwparserfromhell
+from typing import Dict
 
 from osrsbox.items_api.item_definition import ItemDefinition
 from osrsbox.items_api.item_stats import ItemStats
 from osrsbox.items_api.item_equipment import ItemEquipment
 from items_builder import infobox_cleaner
+from items_builder.update_tools import item_diff
+from items_builder.wiki_templates import InfoboxParams
+from items_builder.wiki_templates import WikiTemplateCache
+
+
+class BuildItemError(Exception):
+    """Raised when an item cannot be built, instead of exiting the whole build."""
+    pass
 
 
 class BuildItem:
-    def __init__(self, item_id, item_json, wiki_text, normalized_names, buy_limits, skill_requirements, current_db):
+    def __init__(self, item_id, item_json, wiki_text, normalized_names, buy_limits, skill_requirements, current_db,
+                 wiki_templates=None):
         # Input item ID number
         self.item_id = item_id
         # Input JSON file (from RuneLite ItemScraper plugin)
@@ -42,68 +52,91 @@ class BuildItem:
         self.buy_limits = buy_limits  # Dictionary of item buy limits
         self.skill_requirements = skill_requirements  # Dictionary of item requirements
         self.current_db = current_db  # Dictionary dump of current database contents
+        # Parsed wiki text templates, shared between items to avoid parsing a page more than once
+        if wiki_templates is None:
+            wiki_templates = WikiTemplateCache(wiki_text)
+        self.wiki_templates = wiki_templates
 
         # For this item, initialize the required objects
         self.itemDefinition = ItemDefinition()
         self.itemDefinition.item_stats = ItemStats()
         self.itemDefinition.item_equipment = ItemEquipment()
 
-        # Setup logging
-        logging.basicConfig(filename="builder.log",
-                            filemode='a',
-                            level=logging.DEBUG)
+        # Logging is configured by the builder (see build_log.py)
         self.logger = logging.getLogger(__name__)
 
         # If a page does not have a wiki page, it may be given a status number
         self.status_code = None
 
-        self.properties = [
-            "id",
-            "name",
-            "members",
-            "tradeable",
-            "tradeable_on_ge",
-            "stackable",
-            "noted",
-            "noteable",
-            "linked_id",
-            "equipable",
-            "cost",
-            "lowalch",
-            "highalch",
-            "weight",
-            "buy_limit",
-            "quest_item",
-            "release_date",
-            "examine",
-            "url"]
-
-        self.stat_properties = [
-            "attack_stab",
-            "attack_slash",
-            "attack_crush",
-            "attack_magic",
-            "attack_ranged",
-            "defence_stab",
-            "defence_slash",
-            "defence_crush",
-            "defence_magic",
-            "defence_ranged",
-            "melee_strength",
-            "ranged_strength",
-            "magic_damage",
-            "prayer"]
-
-        self.equipment_properties = [
-            "attack_speed",
-            "slot",
-            "skill_reqs"]
-
-    def populate(self):
-        """The primary entry and item object population function."""
+        # The build record: the time taken by each stage, and the build outcome
+        self.stage_timings = dict()
+        self.stage_start = None
+        self.outcome = None
+        self.error = None
+
+        # The difference to the item in the current database, see compare_json_files
+        self.changes = dict()
+
+    def populate(self, export: bool = True) -> Dict:
+        """The primary entry and item object population function.
+
+        A single structured log record is written for every item, with the time
+        taken by each stage, the item status code and the build outcome.
+
+        :param export: Save the item JSON file, otherwise the caller is responsible for saving the item.
+        :return: The item JSON to save, or None if the item is not saved (for example, invalid items).
+        """
+        start = time.perf_counter()
+        self.stage_start = start
+        try:
+            return self.populate_stages(export)
+        except BuildItemError as e:
+            self.outcome = "failed"
+            self.error = str(e)
+            raise
+        except Exception as e:
+            self.outcome = "error"
+            self.error = repr(e)
+            raise
+        finally:
+            self.stage_timings["total"] = time.perf_counter() - start
+            self.log_build_record()
+
+    def end_stage(self, stage: str):
+        """Record the time taken by a build stage, since the end of the last stage.
+
+        :param stage: The stage name.
+        """
+        now = time.perf_counter()
+        self.stage_timings[stage] = now - self.stage_start
+        self.stage_start = now
+
+    def log_build_record(self):
+        """Log the build record for the item, as a single log message."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        build_record = {
+            "item_id": self.item_id,
+            "name": self.itemDefinition.name,
+            "wiki_name": getattr(self.itemDefinition, "wiki_name", None),
+            "status_code": self.status_code,
+            "outcome": self.outcome,
+            "error": self.error,
+            "timings_ms": {stage: round(seconds * 1000, 3) for stage, seconds in self.stage_timings.items()}
+        }
+        if self.changes:
+            build_record["changes"] = self.changes
+        self.logger.info("item %s: %s", self.item_id, self.outcome, extra={"build_record": build_record})
+
+    def populate_stages(self, export: bool) -> Dict:
+        """Run each stage of the item population.
+
+        :param export: Save the item JSON file.
+        :return: The item JSON to save, or None if the item is not saved.
+        """
         # Start section in logger
         self.logger.debug("============================================ START")
-        self.logger.debug(f"item_id: {self.item_id}")
+        self.logger.debug("item_id: %s", self.item_id)
 
         # STAGE ZERO: CREATE OBJECTS
         self.logger.debug("STAGE ZERO: Create object...")
@@ -116,14 +149,16 @@ class BuildItem:
         self.logger.debug("STAGE ONE: Loading item-scraper.json data to object...")
 
         self.populate_from_scraper()
+        self.end_stage("scraper")
 
-        self.logger.debug(f"id: {self.itemDefinition.id}|name: {self.itemDefinition.name}")
+        self.logger.debug("id: %s|name: %s", self.itemDefinition.id, self.itemDefinition.name)
         # print(f"<<<<<<<<<<<<<< id: {self.itemDefinition.id}\tname: {self.itemDefinition.name}")
 
         # STAGE TWO: DETERMINE WIKI PAGE
         self.logger.debug("STAGE TWO: Determining OSRS Wiki page...")
 
         has_wiki_page = self.determine_wiki_page()
+        self.end_stage("wiki_page")
 
         # # This commented code can be used to determine wiki page normalization
         # # You must comment out the normalization lookup in determine_wiki_page
@@ -142,7 +177,7 @@ class BuildItem:
             # These will be items that cannot be processed and the program should exit
             print(">>> Cannot find wiki page...")
             print(f"{self.itemDefinition.id}|{self.itemDefinition.name}|{self.itemDefinition.name}|2")
-            quit()
+            raise BuildItemError("Cannot find wiki page")
 
         # STAGE THREE: EXTRACT and PARSE INFOBOX
         self.logger.debug("STAGE THREE: Extracting the infobox...")
@@ -154,28 +189,36 @@ class BuildItem:
         if has_infobox:
             self.logger.debug("INFOBOX: Success")
             self.parse_primary_infobox()
+            self.end_stage("infobox")
         elif self.status_code == 1:
             self.logger.debug("INFOBOX: Invalid item saved")
+            self.outcome = "skipped"
             return  # Cannot do any other population
         elif self.status_code == 2:
             self.logger.debug("INFOBOX: Unobtainable item saved")
+            self.outcome = "skipped"
             return  # Cannot do any other population
         elif self.status_code == 3:
             self.logger.debug("INFOBOX: Unusable item saved")
+            self.outcome = "skipped"
             return  # Cannot do any other population
         elif self.status_code == 4:
             self.logger.debug("INFOBOX: Not really an item, item saved")
+            self.outcome = "skipped"
             return  # Cannot do any other population
         elif self.status_code == 5:
             self.logger.debug("INFOBOX: No dedicated wiki page for item, saved")
+            self.outcome = "skipped"
             return  # Cannot do any other population
         elif self.status_code == 6:
             self.logger.debug("INFOBOX: No item bonuses")
             self.parse_primary_infobox()
+            self.end_stage("infobox")
+            self.outcome = "skipped"
             return  # Cannot do any other population
         else:
             self.logger.critical("INFOBOX: Extraction error.")
-            quit()
+            raise BuildItemError("Infobox extraction error")
 
         # STAGE FOUR: PARSE INFOBOX FOR EQUIPABLE ITEMS
         self.logger.debug("STAGE FIVE: Parsing the bonuses...")
@@ -187,22 +230,30 @@ class BuildItem:
                 self.logger.debug("Item InfoBox Bonuses extracted successfully")
             else:
                 self.logger.critical("Item InfoBox Bonuses extraction error.")
-                self.logger.critical("Status Code: %s" % self.status_code)
+                self.logger.critical("Status Code: %s", self.status_code)
                 print(">>> ERROR: Could not determine equipable item bonuses...")
-                quit()
+                raise BuildItemError("Could not determine equipable item bonuses")
+            self.end_stage("bonuses")
 
         # STAGE FIVE: COMPARE TO CURRENT DATABASE CONTENTS
         self.logger.debug("STAGE FIVE: Compare object to existing database entry...")
 
-        self.compare_json_files()
         json_out = self.itemDefinition.construct_json()
-        self.logger.debug(json_out)
+        self.compare_json_files(json_out)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(json_out)
+        self.end_stage("compare")
 
         self.logger.debug("============================================ END")
 
         # Actually output a JSON file, comment out for testing
-        output_dir = os.path.join("..", "docs", "items-json")
-        self.itemDefinition.export_json(True, output_dir)
+        if export:
+            output_dir = os.path.join("..", "docs", "items-json")
+            self.itemDefinition.export_json(True, output_dir)
+            self.end_stage("export")
+
+        self.outcome = "built"
+        return json_out
 
     def populate_from_scraper(self):
         """Populate the itemDefinition object from the item-scraper file content."""
@@ -276,37 +327,23 @@ class BuildItem:
         self.template_primary = None
         self.template_bonuses = None
 
-        try:
-            wiki_text_entry = self.wiki_text[self.itemDefinition.wiki_name]
-            wikicode = mwparserfromhell.parse(wiki_text_entry)
-        except KeyError:
+        templates = self.wiki_templates.get_params(self.itemDefinition.wiki_name)
+        if templates is None:
             # The wiki_name was not found in the available dumped wikitext pages
             # Return false to indicate no wikitext was extracted
             self.logger.debug("extract_infobox: KeyError for self.wikitext")
             return False
 
-        # Loop through templates in wikicode from wiki page
-        # Then call Inforbox Item processing method
-        templates = wikicode.filter_templates()
-        for template in templates:
-            template_name = template.name.strip()
-            template_name = template_name.lower()
-            if "infobox item" in template_name:
-                self.template_primary = template
-            if "infobox bonuses" in template_name:
-                self.template_bonuses = template
-            if "infobox construction" in template_name:
-                self.template_primary = template
-            if "infobox pet" in template_name:
-                self.template_primary = template
+        self.template_primary = templates["infobox"]
+        self.template_bonuses = templates["bonuses"]
 
         # If no template_primary was found, return false
-        if not self.template_primary:
+        if self.template_primary is None:
             self.logger.debug("extract_infobox: not self.template_primary")
             return False
 
         # If any equipable item, and no bonuses was found, return false
-        if self.itemDefinition.equipable and not self.template_bonuses:
+        if self.itemDefinition.equipable and not templates["has_bonuses"]:
             self.logger.debug("extract_infobox: not self.template_bonuses")
             return False
 
@@ -316,135 +353,51 @@ class BuildItem:
     def parse_primary_infobox(self):
         """Parse an actual Infobox template."""
         template = self.template_primary
-        # Set defaults for versioned infoboxes
-        is_versioned = False  # has multiple versions available
-        self.current_version = None  # The version that matches the item
-        version_count = 0  # the number of versions available
-
-        # STAGE ONE: Determine if we have a versioned infobox, and the version count
-
-        version_identifiers = ["version",
-                               "name",
-                               "itemname"]
-
-        for version_identifier in version_identifiers:
-            # Check if the infobox is versioned, and get a version count
-            if version_count == 0:
-                try:
-                    template.get(version_identifier + "1").value
-                    is_versioned = True
-                    # Now, try to determine how many versions are present
-                    i = 1
-                    while i <= 20:  # Guessing max version number is 20
-                        try:
-                            template.get(version_identifier + "1").value
-                            version_count += 1
-                        except ValueError:
-                            break
-                        i += 1
-                except ValueError:
-                    pass
-
-        # STAGE TWO: Match a versioned infobox to the item name
-
-        if is_versioned:
-            # Try determine
-            for version_identifier in version_identifiers:
-                try:
-                    template.get(version_identifier + "1").value
-                    i = 1
-                    while i <= version_count:
-                        versioned_name = version_identifier + str(i)
-                        if self.itemDefinition.name == template.get(versioned_name).value.strip():
-                            self.current_version = i
-                        i += 1
-                except ValueError:
-                    pass
-
-            self.logger.debug("NOTE: versioned infobox: %s" % self.current_version)
-
-        if is_versioned and self.current_version is None:
-            self.current_version = 1
 
-        # WEIGHT: Determine the weight of an item ()
-        weight = None
+        # Determine the version of a versioned infobox that matches the item
+        self.current_version = template.version(self.itemDefinition.name)
         if self.current_version is not None:
-            key = "weight" + str(self.current_version)
-            weight = self.extract_infobox_value(template, key)
-        if weight is None:
-            weight = self.extract_infobox_value(template, "weight")
+            self.logger.debug("NOTE: versioned infobox: %s", self.current_version)
+
+        # WEIGHT: Determine the weight of an item ()
+        weight = template.value("weight", self.current_version)
         if weight is not None:
             self.itemDefinition.weight = infobox_cleaner.clean_weight(weight)
 
         # QUEST: Determine if item is associated with a quest ()
-        quest = None
-        if self.current_version is not None:
-            key = "quest" + str(self.current_version)
-            quest = self.extract_infobox_value(template, key)
-        if quest is None:
-            quest = self.extract_infobox_value(template, "quest")
+        quest = template.value("quest", self.current_version)
         if quest is not None:
             self.itemDefinition.quest_item = infobox_cleaner.clean_quest(quest)
 
         # Determine the release date of an item ()
-        release_date = None
-        if self.current_version is not None:
-            key = "release" + str(self.current_version)
-            release_date = self.extract_infobox_value(template, key)
-        if release_date is None:
-            release_date = self.extract_infobox_value(template, "release")
+        release_date = template.value("release", self.current_version)
         if release_date is not None:
             self.itemDefinition.release_date = infobox_cleaner.clean_release_date(release_date)
 
         # Determine if item has a store price ()
-        store_price = None
-        if self.current_version is not None:
-            key = "store" + str(self.current_version)
-            store_price = self.extract_infobox_value(template, key)
-        if store_price is None:
-            store_price = self.extract_infobox_value(template, "store")
+        store_price = template.value("store", self.current_version)
         if store_price is not None:
             self.itemDefinition.store_price = infobox_cleaner.clean_store_price(store_price)
 
         # Determine if item has a store price ()
-        seller = None
-        if self.current_version is not None:
-            key = "seller" + str(self.current_version)
-            seller = self.extract_infobox_value(template, key)
-        if seller is None:
-            seller = self.extract_infobox_value(template, "seller")
+        seller = template.value("seller", self.current_version)
         if seller is not None:
             self.itemDefinition.seller = infobox_cleaner.clean_seller(seller)
 
         # Determine the examine text of an item ()
-        tradeable = None
-        if self.current_version is not None:
-            key = "tradeable" + str(self.current_version)
-            tradeable = self.extract_infobox_value(template, key)
-        if tradeable is None:
-            tradeable = self.extract_infobox_value(template, "tradeable")
+        tradeable = template.value("tradeable", self.current_version)
         if tradeable is not None:
             self.itemDefinition.tradeable = infobox_cleaner.clean_tradeable(tradeable)
         else:
             self.itemDefinition.tradeable = False
 
         # Determine the examine text of an item ()
-        examine = None
-        if self.current_version is not None:
-            key = "examine" + str(self.current_version)
-            examine = self.extract_infobox_value(template, key)
+        examine = template.value("examine", self.current_version)
         if examine is None:
-            examine = self.extract_infobox_value(template, "examine")
+            # Being here means the extraction for "examine" failed
+            examine = template.value("itemexamine", self.current_version)
         if examine is not None:
             self.itemDefinition.examine = infobox_cleaner.clean_examine(examine, self.itemDefinition.name)
-        else:
-            # Being here means the extraction for "examine" failed
-            key = "itemexamine" + str(self.current_version)
-            examine = self.extract_infobox_value(template, key)
-            if examine is None:
-                examine = self.extract_infobox_value(template, "itemexamine")
-            if examine is not None:
-                self.itemDefinition.examine = infobox_cleaner.clean_examine(examine, self.itemDefinition.name)
 
         # Determine if item has a buy limit ()
         if not self.itemDefinition.tradeable:
@@ -459,67 +412,42 @@ class BuildItem:
 
         return True
 
-    def extract_infobox_value(self, template: mwparserfromhell.nodes.template.Template, key: str) -> str:
-        """Helper method to extract a value from a template using a specified key.
-
-        This helper method is a simple solution to repeatedly try to fetch a specific
-        entry from a wiki text template (a mwparserfromhell template object).
-
-        :param template: A mediawiki wiki text template.
-        :param key: The key to query in the template.
-        :return value: The extracted template value based on supplied key.
-        """
-        value = None
-        try:
-            value = template.get(key).value
-            value = value.strip()
-            return value
-        except ValueError:
-            return value
-
     def extract_bonuses(self) -> bool:
         """Extract the infobox bonuses template from raw wikitext.
 
         :return: If the infobox bonuses template was extracted successfully or not.
         """
         # Extract Infobox Bonuses from wikitext
-        try:
-            wikicode = mwparserfromhell.parse(self.wiki_text[self.itemDefinition.wiki_name])
-        except KeyError:
+        templates = self.wiki_templates.get_params(self.itemDefinition.wiki_name)
+        if templates is None or templates["bonuses"] is None:
             return False
-        templates = wikicode.filter_templates()
-        for template in templates:
-            if "infobox bonuses" in template.lower():
-                extracted_infobox = self.parse_bonuses(template)
-                if extracted_infobox:
-                    return True
 
-        return False
+        return self.parse_bonuses(templates["bonuses"])
 
-    def parse_bonuses(self, template: mwparserfromhell.nodes.template.Template) -> bool:
+    def parse_bonuses(self, params: InfoboxParams) -> bool:
         """Parse the wiki text template and extract item bonus values from it.
 
-        :param template: A mediawiki wiki text template.
+        :param params: The infobox bonuses template parameters.
         """
-        self.itemDefinition.item_stats.attack_stab = self.clean_bonuses_value(template, "astab")
-        self.itemDefinition.item_stats.attack_slash = self.clean_bonuses_value(template, "aslash")
-        self.itemDefinition.item_stats.attack_crush = self.clean_bonuses_value(template, "acrush")
-        self.itemDefinition.item_stats.attack_magic = self.clean_bonuses_value(template, "amagic")
-        self.itemDefinition.item_stats.attack_ranged = self.clean_bonuses_value(template, "arange")
-        self.itemDefinition.item_stats.defence_stab = self.clean_bonuses_value(template, "dstab")
-        self.itemDefinition.item_stats.defence_slash = self.clean_bonuses_value(template, "dslash")
-        self.itemDefinition.item_stats.defence_crush = self.clean_bonuses_value(template, "dcrush")
-        self.itemDefinition.item_stats.defence_magic = self.clean_bonuses_value(template, "dmagic")
-        self.itemDefinition.item_stats.defence_ranged = self.clean_bonuses_value(template, "drange")
-        self.itemDefinition.item_stats.melee_strength = self.clean_bonuses_value(template, "str")
-        self.itemDefinition.item_stats.ranged_strength = self.clean_bonuses_value(template, "rstr")
-        self.itemDefinition.item_stats.magic_damage = self.clean_bonuses_value(template, "mdmg")
-        self.itemDefinition.item_stats.prayer = self.clean_bonuses_value(template, "prayer")
-
-        try:
-            self.itemDefinition.item_equipment.slot = self.strip_infobox(template.get("slot").value)
-            self.itemDefinition.item_equipment.slot = self.itemDefinition.item_equipment.slot.lower()
-        except ValueError:
+        self.itemDefinition.item_stats.attack_stab = self.clean_bonuses_value(params, "astab")
+        self.itemDefinition.item_stats.attack_slash = self.clean_bonuses_value(params, "aslash")
+        self.itemDefinition.item_stats.attack_crush = self.clean_bonuses_value(params, "acrush")
+        self.itemDefinition.item_stats.attack_magic = self.clean_bonuses_value(params, "amagic")
+        self.itemDefinition.item_stats.attack_ranged = self.clean_bonuses_value(params, "arange")
+        self.itemDefinition.item_stats.defence_stab = self.clean_bonuses_value(params, "dstab")
+        self.itemDefinition.item_stats.defence_slash = self.clean_bonuses_value(params, "dslash")
+        self.itemDefinition.item_stats.defence_crush = self.clean_bonuses_value(params, "dcrush")
+        self.itemDefinition.item_stats.defence_magic = self.clean_bonuses_value(params, "dmagic")
+        self.itemDefinition.item_stats.defence_ranged = self.clean_bonuses_value(params, "drange")
+        self.itemDefinition.item_stats.melee_strength = self.clean_bonuses_value(params, "str")
+        self.itemDefinition.item_stats.ranged_strength = self.clean_bonuses_value(params, "rstr")
+        self.itemDefinition.item_stats.magic_damage = self.clean_bonuses_value(params, "mdmg")
+        self.itemDefinition.item_stats.prayer = self.clean_bonuses_value(params, "prayer")
+
+        slot = params.get("slot")
+        if slot is not None:
+            self.itemDefinition.item_equipment.slot = self.strip_infobox(slot).lower()
+        else:
             self.itemDefinition.item_equipment.slot = None
             self.logger.critical("Could not determine equipable item slot")
 
@@ -528,7 +456,7 @@ class BuildItem:
                 self.itemDefinition.item_equipment.slot == "two-handed" or
                 self.itemDefinition.item_equipment.slot == "2h"):
             try:
-                self.itemDefinition.item_equipment.attack_speed = int(self.strip_infobox(template.get("aspeed").value))
+                self.itemDefinition.item_equipment.attack_speed = int(self.strip_infobox(params.get("aspeed") or ""))
             except ValueError:
                 self.itemDefinition.item_equipment.attack_speed = None
                 self.logger.critical("Could not determine equipable item attack speed")
@@ -544,23 +472,15 @@ class BuildItem:
 
         return True
 
-    def clean_bonuses_value(self, template: mwparserfromhell.nodes.template.Template, prop: str):
+    def clean_bonuses_value(self, params: InfoboxParams, prop: str):
         """Clean a item bonuses value extracted from a wiki template.
 
-        :param template: A mediawiki wiki text template.
+        :param params: The infobox bonuses template parameters.
         :param prop: The key to query in the template.
         :return value: The extracted template value that has been int cast.
         """
-        value = None
-
-        # Try and get the versioned infobox value
-        if self.current_version is not None:
-            key = prop + str(self.current_version)
-            value = self.extract_infobox_value(template, key)
-
-        # If unsuccessful, try and get the normal infoxbox value
-        if value is None:
-            value = self.extract_infobox_value(template, prop)
+        # Get the versioned infobox value, or the normal infobox value
+        value = params.value(prop, self.current_version)
 
         if value is not None:
             value = self.strip_infobox(value)
@@ -612,49 +532,24 @@ class BuildItem:
         self.itemDefinition.item_equipment.attack_speed = None
         self.itemDefinition.item_equipment.skill_reqs = None
 
-    def compare_json_files(self) -> bool:
-        """Print the difference between this item object, and the item that exists in the database.
+    def compare_json_files(self, current_json: Dict = None) -> bool:
+        """Determine the difference between this item object, and the item that exists in the database.
 
+        Every field is compared (including the bonuses and equipment fields), and the changed
+        fields are stored in `changes` and written to the build log with the item build record.
+
+        :param current_json: The item JSON, as returned by `construct_json`, built if not provided.
         :return changed: A boolean if the item is different, or not.
         """
-        changed = False
-        changes = dict()
+        # Try get existing entry (a missing entry means a new item)
+        existing_json = self.current_db.get(self.item_id)
+        if existing_json is None:
+            return False
 
-        # Create JSON out object to compare
-        current_json = self.itemDefinition.construct_json()
+        if current_json is None:
+            current_json = self.itemDefinition.construct_json()
+        if existing_json == current_json:
+            return False
 
-        # Try get existing entry (KeyError means it doesn't exist - aka a new item)
-        try:
-            existing_json = self.current_db[self.item_id]
-        except KeyError:
-            return changed
-
-        for prop in self.properties:
-            if current_json[prop] != existing_json[prop]:
-                changed = True
-                changes[prop] = [current_json[prop], existing_json[prop]]
-
-                # Also check equipable
-                if self.itemDefinition.equipable:
-                    for stats_prop in self.stat_properties:
-                        if current_json["bonuses"][stats_prop] != existing_json["bonuses"][stats_prop]:
-                            changed = True
-                            changes[stats_prop] = [current_json["bonuses"][stats_prop],
-                                                   existing_json["bonuses"][stats_prop]]
-                    for equipment_prop in self.equipment_properties:
-                        if current_json["equipment"][equipment_prop] != existing_json["equipment"][equipment_prop]:
-                            changed = True
-                            changes[equipment_prop] = [current_json["equipment"][equipment_prop],
-                                                       existing_json["equipment"][equipment_prop]]
-
-        # Print any item changes
-        if changed:
-            print(f">>>>>>>>>>> id: {self.itemDefinition.id}\tname: {self.itemDefinition.name}")
-            for prop in changes:
-                print("+++ MISMATCH!:", prop)
-                print("TYPES:", type(changes[prop][1]), type(changes[prop][0]))
-                print("OLD: %r" % changes[prop][1])
-                print("NEW: %r" % changes[prop][0])
-            print()
-
-        return changed
+        self.changes = item_diff.diff_records(existing_json, current_json)
+        return bool(self.changes)
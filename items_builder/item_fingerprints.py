@@ -0,0 +1,182 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Fingerprint the inputs used to build each item, so an incremental build only
+rebuilds the items with changed inputs. An item fingerprint covers the
+items-scraper.json entry, the revision of the wiki page, and the
+normalized_names, buy_limits and skill_requirements entries for the item.
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import os
+import json
+import hashlib
+from typing import Dict
+from typing import List
+from typing import Iterable
+
+from items_builder.wiki_templates import WikiTemplateCache
+from items_builder.update_tools.determine_new_items import DetermineNewItems
+
+# Change this to rebuild every item on the next incremental build (for example, when the builder changes)
+FINGERPRINT_VERSION = 1
+
+# The build outcome saved with each fingerprint: the item JSON was exported, or the item is not exported
+EXPORTED = "exported"
+SKIPPED = "skipped"
+
+
+def item_fingerprint(item_id: str, inputs: Dict, wiki_templates: WikiTemplateCache) -> str:
+    """Calculate the fingerprint of the inputs used to build an item.
+
+    :param item_id: The item ID number, as a key of `items-scraper.json`.
+    :param inputs: The build inputs, as returned by `builder.load_inputs`.
+    :param wiki_templates: The wiki text templates cache, used to determine the wiki page revision.
+    :return: A hex digest of the item inputs.
+    """
+    item_json = inputs["cache_items"][item_id]
+    id_key = str(item_json["id"])
+
+    # The wiki page is found the same way as BuildItem.determine_wiki_page
+    if id_key in inputs["normalized_names"]:
+        wiki_name = inputs["normalized_names"][id_key][1]
+    else:
+        wiki_name = item_json["name"]
+    wiki_revision = wiki_templates.revision(wiki_name) if wiki_name in wiki_templates else None
+
+    item_inputs = {
+        "version": FINGERPRINT_VERSION,
+        "scraper": item_json,
+        "wiki_name": wiki_name,
+        "wiki_revision": wiki_revision,
+        "normalized_name": inputs["normalized_names"].get(id_key),
+        "buy_limit": inputs["buy_limits"].get(item_json["name"]),
+        "skill_requirements": inputs["skill_requirements"].get(id_key)
+    }
+    item_inputs = json.dumps(item_inputs, sort_keys=True)
+    return hashlib.sha1(item_inputs.encode("utf-8")).hexdigest()
+
+
+def compute_fingerprints(inputs: Dict, wiki_templates: WikiTemplateCache) -> Dict[str, str]:
+    """Calculate the fingerprint of every item in the items-scraper.json file.
+
+    :param inputs: The build inputs, as returned by `builder.load_inputs`.
+    :param wiki_templates: The wiki text templates cache, used to determine the wiki page revisions.
+    :return: A dictionary of item ID numbers to fingerprints.
+    """
+    return {item_id: item_fingerprint(item_id, inputs, wiki_templates) for item_id in inputs["cache_items"]}
+
+
+def load_fingerprints(in_file_name: str) -> Dict[str, Dict]:
+    """Load the item fingerprints saved by the last build.
+
+    Fingerprints saved without a build outcome (by an older builder) are loaded as exported.
+
+    :param in_file_name: The name of the JSON file to load.
+    :return: A dictionary of item ID numbers to a dictionary of the `fingerprint` and build
+             `outcome` (`EXPORTED` or `SKIPPED`), empty if the file does not exist.
+    """
+    if not os.path.isfile(in_file_name):
+        return dict()
+    with open(in_file_name) as in_file:
+        entries = json.load(in_file)
+    return {item_id: entry if isinstance(entry, dict) else {"fingerprint": entry, "outcome": EXPORTED}
+            for item_id, entry in entries.items()}
+
+
+def save_fingerprints(entries: Dict[str, Dict], out_file_name: str):
+    """Save the item fingerprints.
+
+    :param entries: A dictionary of item ID numbers to fingerprint entries, see `load_fingerprints`.
+    :param out_file_name: The name of the JSON file to save to.
+    """
+    with open(out_file_name, "w") as out_file:
+        json.dump(entries, out_file, indent=4, sort_keys=True)
+
+
+def items_to_build(current_fingerprints: Dict[str, str], past_entries: Dict[str, Dict],
+                   path_to_items_json: str) -> List[str]:
+    """Determine the items to build, using the item fingerprints of the current and last builds.
+
+    Added items and items with changed inputs are built, as well as any exported item that
+    has no JSON file (for example, if it was deleted). Unchanged items that were skipped by
+    the last build (items that are not exported, such as invalid items) are not built.
+
+    :param current_fingerprints: The item fingerprints for the current inputs.
+    :param past_entries: The item fingerprint entries saved by the last build, see `load_fingerprints`.
+    :param path_to_items_json: The path to the `items-json` directory.
+    :return: A list of item ID numbers to build, in the same order as `current_fingerprints`.
+    """
+    past_fingerprints = {item_id: entry["fingerprint"] for item_id, entry in past_entries.items()}
+    dd = DetermineNewItems(current_fingerprints, past_fingerprints)
+    build_ids = set(dd.added()) | set(dd.changed())
+    for item_id in dd.unchanged():
+        if past_entries[item_id]["outcome"] == SKIPPED:
+            continue
+        if not os.path.isfile(os.path.join(path_to_items_json, item_id + ".json")):
+            build_ids.add(item_id)
+    return [item_id for item_id in current_fingerprints if item_id in build_ids]
+
+
+def remove_deleted_items(current_fingerprints: Dict[str, str], past_entries: Dict[str, Dict],
+                         path_to_items_json: str) -> List[str]:
+    """Remove the JSON file of every item built by the last build that is no longer in the inputs.
+
+    :param current_fingerprints: The item fingerprints for the current inputs.
+    :param past_entries: The item fingerprint entries saved by the last build, see `load_fingerprints`.
+    :param path_to_items_json: The path to the `items-json` directory.
+    :return: A list of the removed item ID numbers.
+    """
+    removed_ids = [item_id for item_id in past_entries if item_id not in current_fingerprints]
+    for item_id in removed_ids:
+        item_path = os.path.join(path_to_items_json, item_id + ".json")
+        if os.path.isfile(item_path):
+            os.remove(item_path)
+    return removed_ids
+
+
+def built_fingerprints(current_fingerprints: Dict[str, str], failed_ids: Iterable[str],
+                       outcomes: Dict[str, str] = None, past_entries: Dict[str, Dict] = None) -> Dict[str, Dict]:
+    """Determine the item fingerprint entries to save after a build.
+
+    Items that failed to build are left out, so they are built again by the next build.
+    Items that were not built keep the entry of the last build. Items that are no longer
+    in the inputs are left out.
+
+    :param current_fingerprints: The item fingerprints for the current inputs.
+    :param failed_ids: The item ID numbers that failed to build.
+    :param outcomes: A dictionary of built item ID numbers to the build outcome (`EXPORTED` or
+                     `SKIPPED`), see `builder.build_items`. Every item is exported if not provided.
+    :param past_entries: The item fingerprint entries saved by the last build.
+    :return: A dictionary of item ID numbers to fingerprint entries, see `load_fingerprints`.
+    """
+    failed_ids = set(failed_ids)
+    past_entries = past_entries or dict()
+    entries = dict()
+    for item_id, fingerprint in current_fingerprints.items():
+        if item_id in failed_ids:
+            continue
+        if outcomes is None:
+            entries[item_id] = {"fingerprint": fingerprint, "outcome": EXPORTED}
+        elif item_id in outcomes:
+            entries[item_id] = {"fingerprint": fingerprint, "outcome": outcomes[item_id]}
+        elif item_id in past_entries:
+            entries[item_id] = past_entries[item_id]
+    return entries
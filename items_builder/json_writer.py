@@ -0,0 +1,122 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+A batched writer for the items-json files produced by the builder. Items are
+queued, serialized in batches and written atomically (to a temporary file,
+then renamed). Files that would not change are not written at all, so file
+modification times (and rsync deltas) only change for items that changed.
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import os
+import json
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+
+def serialize_item(json_data: Dict) -> bytes:
+    """Serialize an item, identical to `ItemDefinition.export_json` with pretty output.
+
+    :param json_data: The item dictionary, as returned by `ItemDefinition.construct_json`.
+    :return: The JSON file contents.
+    """
+    return json.dumps(json_data, indent=4).encode("utf-8")
+
+
+def write_atomic(out_file_path: str, data: bytes):
+    """Write a file atomically, so the file is never left partly written.
+
+    The contents are written to a temporary file and synced to disk before the temporary
+    file replaces the target, so after a crash the file has either the old or new contents.
+
+    :param out_file_path: The file to write.
+    :param data: The file contents.
+    """
+    temp_file_path = out_file_path + ".tmp"
+    try:
+        with open(temp_file_path, "wb") as out_file:
+            out_file.write(data)
+            out_file.flush()
+            os.fsync(out_file.fileno())
+        os.replace(temp_file_path, out_file_path)
+    except BaseException:
+        if os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+        raise
+
+
+class ItemJsonWriter:
+    """This class writes item JSON files in batches, skipping files that would not change.
+
+    The size of every existing file is read with a single directory scan, so an
+    existing file is only read (to compare the contents) when the new file is the
+    same size. Use as a context manager, or call `close` to write any queued items.
+
+    :param export_path: The folder to save the JSON files to.
+    :param batch_size: The number of items queued before they are written.
+    """
+    def __init__(self, export_path: str, batch_size: int = 512):
+        self.export_path = export_path
+        self.batch_size = batch_size
+        self.queue: List[Tuple[int, Dict]] = list()
+        self.written = 0
+        self.unchanged = 0
+        self.existing_sizes: Dict[str, int] = dict()
+        with os.scandir(export_path) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    self.existing_sizes[entry.name] = entry.stat().st_size
+
+    def __enter__(self) -> "ItemJsonWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add(self, id_number: int, json_data: Dict):
+        """Queue an item to be written.
+
+        :param id_number: The item ID number, used as the file name.
+        :param json_data: The item dictionary, as returned by `ItemDefinition.construct_json`.
+        """
+        self.queue.append((id_number, json_data))
+        if len(self.queue) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Serialize and write every queued item."""
+        serialized = [(str(id_number) + ".json", serialize_item(json_data)) for id_number, json_data in self.queue]
+        self.queue = list()
+
+        for out_file_name, data in serialized:
+            out_file_path = os.path.join(self.export_path, out_file_name)
+            if self.existing_sizes.get(out_file_name) == len(data):
+                with open(out_file_path, "rb") as existing_file:
+                    if existing_file.read() == data:
+                        self.unchanged += 1
+                        continue
+            write_atomic(out_file_path, data)
+            self.existing_sizes[out_file_name] = len(data)
+            self.written += 1
+
+    def close(self):
+        """Write any queued items."""
+        self.flush()
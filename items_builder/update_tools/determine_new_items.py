@@ -31,6 +31,8 @@ import json
 from typing import Set
 from typing import Dict
 
+from items_builder.update_tools.item_diff import diff_databases
+
 
 class DetermineNewItems:
     """A simple class to determine added, removed, changed and unchanged items.
@@ -38,39 +40,30 @@ class DetermineNewItems:
     Every OSRS weekly update has the potential to add, remove or change item
     properties. This class analyzes the OSRS cache dump of the existing
     database entries and compares to a new database dump.
-    Calculate the difference between two dictionaries as:
+    The difference is calculated once, in a single pass, see `item_diff.diff_databases`.
 
     :param current_dict: A dictionary of the new items_scraper.json file
     :param past_dict: A dictionary of the old items_scraper.json file
     """
     def __init__(self, current_dict: Dict, past_dict: Dict):
         self.current_dict, self.past_dict = current_dict, past_dict
-        self.set_current, self.set_past = set(current_dict.keys()), set(past_dict.keys())
-        self.intersect = self.set_current.intersection(self.set_past)
+        self.changeset = diff_databases(past_dict, current_dict)
 
     def added(self) -> Set:
         """Return a set of only new item IDs that is sorted."""
-        added_items = self.set_current - self.intersect
-        added_items = sorted(added_items)
-        return added_items
+        return sorted(self.changeset.added)
 
     def removed(self) -> Set:
         """Return a set of only removed item IDs that is sorted."""
-        removed_items = self.set_past - self.intersect
-        removed_items = sorted(removed_items)
-        return removed_items
+        return sorted(self.changeset.removed)
 
     def changed(self) -> Set:
         """Return a set of only changed items (including properties) that is sorted."""
-        changed_items = set(o for o in self.intersect if self.past_dict[o] != self.current_dict[o])
-        changed_items = sorted(changed_items)
-        return changed_items
+        return sorted(self.changeset.changed)
 
     def unchanged(self) -> Set:
         """Return a set of only unchanged items (including properties) that is sorted."""
-        unchanged_items = set(o for o in self.intersect if self.past_dict[o] == self.current_dict[o])
-        unchanged_items = sorted(unchanged_items)
-        return unchanged_items
+        return sorted(self.changeset.unchanged)
 
 
 if __name__ == "__main__":
@@ -89,37 +82,9 @@ if __name__ == "__main__":
     # Initialize class
     dd = DetermineNewItems(new_items, old_items)
 
-    # Determine added items
-    added = dd.added()
-    print("- Added items: %d" % len(added))
-    for itemID in added:
-        print("    - %s,%s" % (itemID,
-                               new_items[itemID]["name"]))
-
-    # Determine removed items
-    removed = dd.removed()
-    print("- Removed items: %d" % len(removed))
-    for itemID in removed:
-        print("    - %s,%s" % (itemID,
-                               old_items[itemID]["name"]))
-
-    # Determine changed items
-    changed = dd.changed()
-    print("- Changed items: %d" % len(changed))
-    for itemID in changed:
-        changed_keys = list()
-        for key in new_items[itemID]:
-            if new_items[itemID][key] != old_items[itemID][key]:
-                changed_keys.append(key)
-        if changed_keys:
-            print("    - %s,%s,%s" % (itemID,
-                                      old_items[itemID]["name"],
-                                      '|'.join(changed_keys)))
-
-    # # Determine unchanged items
-    # # This is commented out, as the results are always large
-    # unchanged = dd.unchanged()
-    # print("- Unchanged items: %d" % len(unchanged))
-    # for itemID in unchanged:
-    #     print("    - %s,%s" % (itemID,
-    #                            new_items[itemID]["name"]))
+    # Print the added, removed and changed items (with the changed properties)
+    print(dd.changeset.summary())
+
+    # Save every changed property, with the old and new values
+    dd.changeset.save("items-changes.json")
+    print(">>> Changes saved to: items-changes.json")
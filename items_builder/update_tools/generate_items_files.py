@@ -0,0 +1,152 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Script to generate the items-complete.json file, the equipment slot-based
+JSON files (items-json-slot) and the items-summary.json file from the
+items-json folder in a single pass. Each item is read, written to every
+output file it belongs in and then discarded, so memory use stays low no
+matter how many items are in the database.
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import os
+import json
+import glob
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Generator
+
+from osrsbox.items_api.item_definition import ItemDefinition
+
+
+class JsonObjectWriter:
+    """Write a JSON object to a file one entry at a time.
+
+    The output is identical to calling `json.dump` on a dictionary holding every entry,
+    using the same separators and encoding options.
+
+    :param out_file_name: The file name to write to.
+    :param separators: The JSON item and key separators, as used by `json.dumps`.
+    :param ensure_ascii: Escape non-ASCII characters, as used by `json.dumps`.
+    :param escape_slashes: Escape forward slashes (as in the items-summary.json file).
+    """
+    def __init__(self, out_file_name: str, separators: Tuple[str, str] = (", ", ": "),
+                 ensure_ascii: bool = True, escape_slashes: bool = False):
+        self.out_file = open(out_file_name, "w", newline="\n", encoding="utf-8")
+        self.item_separator, self.key_separator = separators
+        self.separators = separators
+        self.ensure_ascii = ensure_ascii
+        self.escape_slashes = escape_slashes
+        self.count = 0
+        self.out_file.write("{")
+
+    def write(self, key: str, value: Dict):
+        """Write a single key and value to the JSON object.
+
+        :param key: The entry key.
+        :param value: The entry value.
+        """
+        entry = json.dumps(key, ensure_ascii=self.ensure_ascii) + self.key_separator
+        entry += json.dumps(value, separators=self.separators, ensure_ascii=self.ensure_ascii)
+        if self.escape_slashes:
+            entry = entry.replace("/", "\\/")
+        if self.count:
+            self.out_file.write(self.item_separator)
+        self.out_file.write(entry)
+        self.count += 1
+
+    def close(self):
+        """Finish the JSON object, and close the file."""
+        self.out_file.write("}")
+        self.out_file.close()
+
+
+def iter_item_files(path_to_items_json: str) -> Generator[Dict, None, None]:
+    """Read each file in the items-json folder, sorted by file name.
+
+    :param path_to_items_json: The path to the `items-json` directory.
+    :return: A generator of item dictionaries, as exported by `ItemDefinition.construct_json`.
+    """
+    json_files = sorted(json_file for json_file in glob.glob(os.path.join(path_to_items_json, "*.json")))
+    for json_file in json_files:
+        with open(json_file) as input_json_file:
+            item_json = json.load(input_json_file)
+        item_def = ItemDefinition()
+        item_def.load_item_definition_from_file(item_json)
+        yield item_def.construct_json()
+
+
+def generate_items_files(path_to_items_json: str, path_to_docs: str):
+    """Write items-complete.json, items-json-slot/items-<slot>.json and items-summary.json.
+
+    Items are written in file name order, which is the order the items-complete.json
+    and items-json-slot files have always used. The items-summary.json file is sorted
+    by item ID number, so only the item names and ID numbers are kept until the end.
+
+    :param path_to_items_json: The path to the `items-json` directory.
+    :param path_to_docs: The path to the `docs` directory to write the files to.
+    """
+    complete_writer = JsonObjectWriter(os.path.join(path_to_docs, "items-complete.json"))
+    slot_writers: Dict[str, JsonObjectWriter] = dict()
+    summary: List[Tuple[int, str]] = list()
+
+    for item_json in iter_item_files(path_to_items_json):
+        item_id = item_json["id"]
+        complete_writer.write(str(item_id), item_json)
+
+        if item_json["equipable"]:
+            slot = item_json["equipment"]["slot"]
+            if slot is not None:
+                if slot not in slot_writers:
+                    out_file_name = os.path.join(path_to_docs, "items-json-slot", "items-" + slot + ".json")
+                    slot_writers[slot] = JsonObjectWriter(out_file_name)
+                slot_writers[slot].write(str(item_id), item_json)
+
+        summary.append((item_id, item_json["name"]))
+
+    complete_writer.close()
+    for slot_writer in slot_writers.values():
+        slot_writer.close()
+
+    summary_writer = JsonObjectWriter(os.path.join(path_to_docs, "items-summary.json"),
+                                      separators=(",", ":"),
+                                      ensure_ascii=False,
+                                      escape_slashes=True)
+    for item_id, name in sorted(summary):
+        summary_writer.write(str(item_id), {"name": name, "id": item_id})
+    summary_writer.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-i",
+                    "--input",
+                    required=True,
+                    help="The folder of JSON item files (items-json)")
+    ap.add_argument("-o",
+                    "--output",
+                    default=os.path.join("..", "..", "docs"),
+                    help="The docs folder to write the items-complete.json, slot and summary files to")
+    args = vars(ap.parse_args())
+
+    print(">>> Generating items-complete.json, items-json-slot and items-summary.json files...")
+    generate_items_files(args["input"], args["output"])
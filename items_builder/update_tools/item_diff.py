@@ -0,0 +1,160 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+A structural diff of two item databases (or two single items). Produces a
+changeset of added, removed and changed items, with the old and new value of
+every changed field. Nested dictionaries (such as bonuses and equipment) are
+compared field by field, using dotted field names like `bonuses.attack_stab`.
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+from typing import Dict
+from typing import List
+
+
+def diff_records(old, new, prefix: str = "", changes: Dict = None) -> Dict[str, Dict]:
+    """Compare two item records, field by field.
+
+    Dictionaries are compared key by key, and any other value (including lists) is
+    compared as a whole. A field missing from one record has no `old` or `new` value.
+
+    :param old: The old record.
+    :param new: The new record.
+    :param prefix: The field name of the records, used for nested dictionaries.
+    :param changes: The dictionary to add the changes to, a new dictionary if not provided.
+    :return: A dictionary of changed field names to a dictionary of the `old` and `new` values.
+             The field name of a record that is not a dictionary is an empty string.
+    """
+    if changes is None:
+        changes = dict()
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, new_value in new.items():
+            field = prefix + key
+            if key not in old:
+                changes[field] = {"new": new_value}
+            elif old[key] != new_value:
+                diff_records(old[key], new_value, field + ".", changes)
+        for key, old_value in old.items():
+            if key not in new:
+                changes[prefix + key] = {"old": old_value}
+    elif old != new:
+        changes[prefix[:-1]] = {"old": old, "new": new}
+    return changes
+
+
+class Changeset:
+    """This class holds the difference between two item databases.
+
+    :param added: A dictionary of added item ID numbers to the new record.
+    :param removed: A dictionary of removed item ID numbers to the old record.
+    :param changed: A dictionary of changed item ID numbers to the field changes, see `diff_records`.
+    :param unchanged: A list of unchanged item ID numbers.
+    :param changed_names: A dictionary of changed item ID numbers to the old item name, used in the summary.
+    """
+    def __init__(self, added: Dict, removed: Dict, changed: Dict[str, Dict], unchanged: List[str],
+                 changed_names: Dict[str, str] = None):
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+        self.unchanged = unchanged
+        self.changed_names = changed_names or dict()
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def report(self) -> Dict:
+        """Return the changeset as a JSON serializable dictionary.
+
+        :return: A dictionary of the sorted added and removed item ID numbers, the changed
+                 items and their field changes, and the number of unchanged items.
+        """
+        return {
+            "added": sorted(self.added),
+            "removed": sorted(self.removed),
+            "changed": {item_id: self.changed[item_id] for item_id in sorted(self.changed)},
+            "unchanged": len(self.unchanged)
+        }
+
+    def save(self, out_file_name: str):
+        """Save the changeset report to a JSON file.
+
+        :param out_file_name: The file to save to.
+        """
+        with open(out_file_name, "w", newline="\n") as out_file:
+            json.dump(self.report(), out_file, indent=4)
+
+    def summary(self) -> str:
+        """Summarise the changeset, listing the item names and the changed field names.
+
+        :return: The summary, one line per item.
+        """
+        lines = list()
+        lines.append("- Added items: %d" % len(self.added))
+        for item_id in sorted(self.added):
+            lines.append("    - %s,%s" % (item_id, record_name(self.added[item_id])))
+        lines.append("- Removed items: %d" % len(self.removed))
+        for item_id in sorted(self.removed):
+            lines.append("    - %s,%s" % (item_id, record_name(self.removed[item_id])))
+        lines.append("- Changed items: %d" % len(self.changed))
+        for item_id in sorted(self.changed):
+            lines.append("    - %s,%s,%s" % (item_id, self.changed_names.get(item_id), "|".join(self.changed[item_id])))
+        lines.append("- Unchanged items: %d" % len(self.unchanged))
+        return "\n".join(lines)
+
+
+def record_name(record) -> str:
+    """Return the name of an item record, if it has one.
+
+    :param record: The item record.
+    :return: The item name, or None.
+    """
+    if isinstance(record, dict):
+        return record.get("name")
+    return None
+
+
+def diff_databases(past_db: Dict, current_db: Dict) -> Changeset:
+    """Compare two item databases in a single pass.
+
+    Items with equal records are skipped with a dictionary equality check, without a
+    field by field comparison. The check stops at the first difference, and a record
+    that is the same object in both databases is not compared at all.
+
+    :param past_db: A dictionary of item ID numbers to the old item records.
+    :param current_db: A dictionary of item ID numbers to the new item records.
+    :return: The changeset.
+    """
+    added = dict()
+    changed = dict()
+    changed_names = dict()
+    unchanged = list()
+    for item_id, current_record in current_db.items():
+        if item_id not in past_db:
+            added[item_id] = current_record
+            continue
+        past_record = past_db[item_id]
+        if past_record == current_record:
+            unchanged.append(item_id)
+            continue
+        changed[item_id] = diff_records(past_record, current_record)
+        changed_names[item_id] = record_name(past_record)
+    removed = {item_id: past_record for item_id, past_record in past_db.items() if item_id not in current_db}
+    return Changeset(added, removed, changed, unchanged, changed_names)
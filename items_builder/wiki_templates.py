@@ -0,0 +1,284 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+A cache of the infobox templates extracted from OSRS Wiki pages. Many items
+(noted, charged and degraded versions) share a single wiki page, so each page
+is only parsed once per build, or once per revision when the cache is saved.
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import os
+import re
+import json
+import hashlib
+from typing import Dict
+from typing import Tuple
+
+import mwparserfromhell
+
+# The template parameters used to name each version of a versioned infobox
+VERSION_IDENTIFIERS = ("version", "name", "itemname")
+# The maximum number of versions checked in a versioned infobox
+MAX_VERSIONS = 20
+# A parameter name ending in a version number, for example weight2 or name12
+VERSIONED_KEY = re.compile(r"^(.*?)([1-9][0-9]*)$")
+
+
+def template_params(template: mwparserfromhell.nodes.template.Template) -> Dict[str, str]:
+    """Convert a wiki text template into a dictionary of parameter names and values.
+
+    Parameter names are stripped, and values are kept as raw wiki text. When a parameter
+    is repeated, the last value is kept (the same as `Template.get`).
+
+    :param template: A mediawiki wiki text template.
+    :return: A dictionary of the template parameters.
+    """
+    return {str(param.name).strip(): str(param.value) for param in template.params}
+
+
+def parse_templates(wiki_text: str) -> Dict:
+    """Extract the item infobox templates from the wiki text of a page.
+
+    :param wiki_text: The raw wiki text of an OSRS Wiki page.
+    :return: A dictionary with the `infobox` (the last Infobox Item, Construction or Pet template),
+             `bonuses` (the first template containing an Infobox Bonuses template) and
+             `has_bonuses` (if any template is named Infobox Bonuses).
+    """
+    infobox = None
+    bonuses = None
+    has_bonuses = False
+
+    wikicode = mwparserfromhell.parse(wiki_text)
+    for template in wikicode.filter_templates():
+        template_name = template.name.strip().lower()
+        if "infobox item" in template_name or "infobox construction" in template_name or "infobox pet" in template_name:
+            infobox = template
+        if "infobox bonuses" in template_name:
+            has_bonuses = True
+        # The bonuses are parsed from the first template with Infobox Bonuses in its text,
+        # which may be a template that contains the Infobox Bonuses template
+        if bonuses is None and "infobox bonuses" in template.lower():
+            bonuses = template
+
+    return {
+        "infobox": None if infobox is None else template_params(infobox),
+        "bonuses": None if bonuses is None else template_params(bonuses),
+        "has_bonuses": has_bonuses
+    }
+
+
+class InfoboxParams:
+    """This class holds the parameters of an infobox template, keyed by base key and version.
+
+    The template parameters are split into a base key and version number in a single
+    pass, for example `weight2` is stored as `("weight", 2)` and `weight` as
+    `("weight", None)`, so every versioned or plain value is a single lookup.
+    Values are stripped of surrounding whitespace.
+
+    :param template: A mediawiki wiki text template, as a dictionary of parameters.
+    """
+    def __init__(self, template: Dict[str, str]):
+        self.params: Dict[Tuple[str, int], str] = dict()
+        self.versions: Dict[str, int] = dict()
+        for key, value in template.items():
+            match = VERSIONED_KEY.match(key)
+            if match:
+                self.params[(match.group(1), int(match.group(2)))] = value.strip()
+            else:
+                self.params[(key, None)] = value.strip()
+
+    def get(self, key: str, version: int = None) -> str:
+        """Return a single parameter value.
+
+        :param key: The base parameter name, for example `weight`.
+        :param version: The version number, or None for the plain parameter.
+        :return: The parameter value, or None if the template does not have the parameter.
+        """
+        return self.params.get((key, version))
+
+    def value(self, key: str, version: int = None) -> str:
+        """Return the value of a parameter for a version, or the plain parameter if there is no versioned value.
+
+        :param key: The base parameter name, for example `weight`.
+        :param version: The version number, or None for the plain parameter.
+        :return: The parameter value, or None if the template does not have the parameter.
+        """
+        value = None
+        if version is not None:
+            value = self.params.get((key, version))
+        if value is None:
+            value = self.params.get((key, None))
+        return value
+
+    def version(self, item_name: str) -> int:
+        """Determine the version of a versioned infobox that matches an item name.
+
+        An infobox is versioned if it has a `version1`, `name1` or `itemname1` parameter.
+        Up to `MAX_VERSIONS` versions of each of these parameters are compared to the item
+        name, and the last match is used. If no version matches, the first version is used.
+
+        :param item_name: The item name.
+        :return: The matching version number, or None if the infobox is not versioned.
+        """
+        if item_name in self.versions:
+            return self.versions[item_name]
+
+        is_versioned = False
+        current_version = None
+        for version_identifier in VERSION_IDENTIFIERS:
+            if (version_identifier, 1) not in self.params:
+                continue
+            is_versioned = True
+            for version in range(1, MAX_VERSIONS + 1):
+                versioned_name = self.params.get((version_identifier, version))
+                if versioned_name is None:
+                    break
+                if item_name == versioned_name:
+                    current_version = version
+
+        if is_versioned and current_version is None:
+            current_version = 1
+        self.versions[item_name] = current_version
+        return current_version
+
+
+class WikiTemplateCache:
+    """This class caches the infobox templates extracted from OSRS Wiki pages.
+
+    Entries are keyed by page title and revision, so an entry is reused until the
+    page is changed on the wiki. When the revision timestamp of a page is not known,
+    a hash of the page wiki text is used as the revision instead. The InfoboxParams
+    for each page are also kept (in memory only), so they are built once per page.
+
+    :param wiki_text: A dictionary (or `WikiTextStore`) of page titles to raw wiki text.
+    :param wiki_revisions: A dictionary of page titles to last revision timestamps.
+    """
+    def __init__(self, wiki_text: Dict[str, str], wiki_revisions: Dict[str, str] = None):
+        self.wiki_text = wiki_text
+        self.wiki_revisions = wiki_revisions or dict()
+        self.entries: Dict[str, Tuple[str, Dict]] = dict()
+        self.new_entries: Dict[str, Tuple[str, Dict]] = dict()
+        self.infobox_params: Dict[str, Tuple[Dict, Dict[str, InfoboxParams]]] = dict()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, page_title: str) -> bool:
+        """Check if a page has wiki text available.
+
+        :param page_title: The wiki page title.
+        :return: True if the page has wiki text.
+        """
+        return page_title in self.wiki_text
+
+    def revision(self, page_title: str) -> str:
+        """Return the revision of a page, used as part of the cache key.
+
+        :param page_title: The wiki page title.
+        :return: The last revision timestamp, or a hash of the page wiki text.
+        """
+        try:
+            return self.wiki_revisions[page_title]
+        except KeyError:
+            return "sha1:" + hashlib.sha1(self.wiki_text[page_title].encode("utf-8")).hexdigest()
+
+    def get(self, page_title: str) -> Dict:
+        """Return the infobox templates for a page, parsing the page if needed.
+
+        :param page_title: The wiki page title.
+        :return: The templates, as returned by `parse_templates`, or None if the page has no wiki text.
+        """
+        if page_title not in self.wiki_text:
+            return None
+        revision = self.revision(page_title)
+        entry = self.entries.get(page_title)
+        if entry is not None and entry[0] == revision:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        templates = parse_templates(self.wiki_text[page_title])
+        self.entries[page_title] = (revision, templates)
+        self.new_entries[page_title] = (revision, templates)
+        return templates
+
+    def get_params(self, page_title: str) -> Dict[str, InfoboxParams]:
+        """Return the infobox templates for a page as InfoboxParams, parsing the page if needed.
+
+        :param page_title: The wiki page title.
+        :return: A dictionary with the `infobox` and `bonuses` InfoboxParams (None if the page does not have
+                 the template) and `has_bonuses`, or None if the page has no wiki text.
+        """
+        templates = self.get(page_title)
+        if templates is None:
+            return None
+        entry = self.infobox_params.get(page_title)
+        # The params are built again if the page was parsed again (for a new revision)
+        if entry is not None and entry[0] is templates:
+            return entry[1]
+
+        params = {
+            "infobox": None if templates["infobox"] is None else InfoboxParams(templates["infobox"]),
+            "bonuses": None if templates["bonuses"] is None else InfoboxParams(templates["bonuses"]),
+            "has_bonuses": templates["has_bonuses"]
+        }
+        self.infobox_params[page_title] = (templates, params)
+        return params
+
+    def take_new_entries(self) -> Dict[str, Tuple[str, Dict]]:
+        """Return and clear the entries parsed since the last call.
+
+        Used to send the pages parsed by a worker process back to the main process.
+
+        :return: A dictionary of page titles to (revision, templates) tuples.
+        """
+        new_entries = self.new_entries
+        self.new_entries = dict()
+        return new_entries
+
+    def update(self, entries: Dict[str, Tuple[str, Dict]]):
+        """Add entries to the cache, for example entries parsed by a worker process.
+
+        :param entries: A dictionary of page titles to (revision, templates) tuples.
+        """
+        self.entries.update(entries)
+
+    def load(self, in_file_name: str) -> bool:
+        """Load cache entries from a JSON file.
+
+        :param in_file_name: The name of the JSON file to load.
+        :return: True if the file was loaded, False if it does not exist.
+        """
+        if not os.path.isfile(in_file_name):
+            return False
+        with open(in_file_name) as in_file:
+            json_data = json.load(in_file)
+        for page_title, entry in json_data.items():
+            self.entries[page_title] = (entry["revision"], entry["templates"])
+        return True
+
+    def save(self, out_file_name: str):
+        """Save the cache entries to a JSON file.
+
+        :param out_file_name: The name of the JSON file to save to.
+        """
+        json_data = {page_title: {"revision": revision, "templates": templates}
+                     for page_title, (revision, templates) in self.entries.items()}
+        with open(out_file_name, "w") as out_file:
+            json.dump(json_data, out_file)
@@ -22,27 +22,65 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import os
 import json
 import glob
+import collections
+import concurrent.futures
 from typing import Dict
 from typing import List
+from typing import Union
 from typing import Generator
 
+from osrsbox.items_api.item_columns import ItemColumns
 from osrsbox.items_api.item_definition import ItemDefinition
+from osrsbox.items_api.item_indexes import ItemIndexes
+from osrsbox.items_api.item_query import ItemQuery
+from osrsbox.items_api.item_search import ItemNameSearch
+from osrsbox.items_api.item_snapshot import ItemSnapshot
+from osrsbox.items_api.item_snapshot import is_snapshot_file
+from osrsbox.items_api.item_snapshot import write_snapshot
 
 
 class AllItems:
     """This class handles loading of the osrsbox-db items database.
 
-    :param input_data_file_or_directory: The osrsbox-db items folder of JSON files, or single JSON file.
+    The items database can be loaded from a folder of JSON files, a single JSON file
+    or a binary snapshot (see :mod:`osrsbox.items_api.item_snapshot`). Items loaded from
+    a snapshot, or loaded in lazy mode, are only converted to :class:`ItemDefinition`
+    objects when first accessed.
+
+    A folder of JSON files can be read by a pool of workers. Decoding JSON holds the GIL,
+    so a thread pool is no faster than the serial loader, and only a process pool
+    (`use_processes`) can use more than one CPU core.
+
+    :param input_data_file_or_directory: The osrsbox-db items folder of JSON files, single JSON file or snapshot.
+    :param workers: The number of threads (or processes) used to read a folder of JSON files, 1 loads serially.
+    :param lazy: Only keep the raw item data (or file name) when loading, and create each item on first use.
+    :param use_processes: Read a folder of JSON files using a process pool instead of a thread pool.
     """
-    def __init__(self, input_data_file_or_directory: str):
-        self.all_items: List[ItemDefinition] = list()
-        self.all_items_dict: Dict[int, ItemDefinition] = dict()
+    def __init__(self, input_data_file_or_directory: str, workers: int = 1, lazy: bool = False,
+                 use_processes: bool = False):
+        # Every item ID in load order, mapped to the ItemDefinition (or None if not materialized yet)
+        self._items: Dict[int, ItemDefinition] = dict()
+        self._unmaterialized = 0
+        # The all_items list, columns, indexes and name search are built on first use,
+        # and cleared when items are loaded (see `_invalidate_caches`)
+        self._all_items_list: List[ItemDefinition] = None
+        # Lazily loaded items, mapped to the raw item dictionary or item JSON file name
+        self._lazy_items: Dict[int, Union[Dict, str]] = dict()
+        self._snapshot: ItemSnapshot = None
+        self._columns: ItemColumns = None
+        self._indexes: ItemIndexes = None
+        self._name_search: ItemNameSearch = None
+        self.workers = workers
+        self.lazy = lazy
+        self.use_processes = use_processes
         self.load_all_items(input_data_file_or_directory)
 
-    def __iter__(self) -> Generator[str, None, None]:
+    def __iter__(self) -> Generator[ItemDefinition, None, None]:
         """Iterate (loop) over each ItemDefinition object."""
-        for item_id in self.all_items:
-            yield item_id
+        for id_number, item_def in self._items.items():
+            if item_def is None:
+                item_def = self._materialize(id_number)
+            yield item_def
 
     def __getitem__(self, id_number: int) -> ItemDefinition:
         """Return the item definition object for a loaded item.
@@ -50,17 +88,122 @@ class AllItems:
         :param id_number: The item ID number.
         :return: The item definition object linked to a specific ID number.
         """
-        return self.all_items_dict[id_number]
+        item_def = self._items[id_number]
+        if item_def is None:
+            item_def = self._materialize(id_number)
+        return item_def
 
     def __len__(self) -> int:
         """Return the count of the total number of items.
 
         :return: The total number of items.
         """
-        return len(self.all_items)
+        return len(self._items)
+
+    @property
+    def all_items(self) -> List[ItemDefinition]:
+        """A list of every ItemDefinition object, in load order.
+
+        The list is built once (materializing every item) and reused, until more items are loaded.
+        """
+        if self._all_items_list is None:
+            self._materialize_all()
+            self._all_items_list = list(self._items.values())
+        return self._all_items_list
+
+    @property
+    def all_items_dict(self) -> Dict[int, ItemDefinition]:
+        """A dictionary of every ItemDefinition object, keyed by item ID number."""
+        self._materialize_all()
+        return self._items
+
+    @property
+    def columns(self) -> ItemColumns:
+        """A columnar (NumPy) view of the bonuses, slot, attack speed and weight of every equipable item.
+
+        The columns are built on first use, and every item is materialized to build them.
+        """
+        if self._columns is None:
+            self._columns = ItemColumns(self)
+        return self._columns
+
+    @property
+    def indexes(self) -> ItemIndexes:
+        """Secondary indexes of items by name, slot, linked ID and boolean flags.
+
+        The indexes are built on first use, and every item is materialized to build them.
+        """
+        if self._indexes is None:
+            self._indexes = ItemIndexes(self)
+        return self._indexes
+
+    def get_items_by_name(self, name: str) -> List[ItemDefinition]:
+        """Return every item with a name, ignoring case.
+
+        :param name: The item name.
+        :return: A list of matching items.
+        """
+        return self.indexes.items_by_name(name)
+
+    def get_items_by_slot(self, slot: str) -> List[ItemDefinition]:
+        """Return every equipable item in an equipment slot.
+
+        :param slot: The equipment slot name, for example `weapon` or `head`.
+        :return: A list of matching items.
+        """
+        return self.indexes.items_by_slot(slot)
+
+    def get_items_by_flag(self, flag: str, value: bool = True) -> List[ItemDefinition]:
+        """Return every item with a boolean property set to a value.
+
+        :param flag: One of `members`, `tradeable_on_ge`, `stackable`, `equipable` or `quest_item`.
+        :param value: The property value to match.
+        :return: A list of matching items.
+        """
+        return self.indexes.items_by_flag(flag, value)
+
+    def get_linked_item(self, id_number: int) -> ItemDefinition:
+        """Return the linked item, for example the noted version of an unnoted item.
+
+        :param id_number: The item ID number.
+        :return: The linked item, or None if the item has no linked item.
+        """
+        return self.indexes.linked_item(id_number)
+
+    @property
+    def name_search(self) -> ItemNameSearch:
+        """A prefix and fuzzy search of item names, built on first use."""
+        if self._name_search is None:
+            self._name_search = ItemNameSearch(self)
+        return self._name_search
+
+    def search_items_by_prefix(self, prefix: str, limit: int = 10) -> List[ItemDefinition]:
+        """Return items with a name that starts with a prefix (ignoring case), sorted by name.
+
+        :param prefix: The start of an item name.
+        :param limit: The maximum number of items to return.
+        :return: A list of matching items.
+        """
+        return self.name_search.prefix(prefix, limit)
+
+    def search_items_fuzzy(self, query: str, limit: int = 10) -> List[ItemDefinition]:
+        """Return items with a name similar to a (possibly misspelled) query, most similar first.
+
+        :param query: The item name to search for.
+        :param limit: The maximum number of items to return.
+        :return: A list of matching items.
+        """
+        return self.name_search.fuzzy(query, limit)
+
+    def query(self) -> ItemQuery:
+        """Start a query over the loaded items, see :class:`ItemQuery`.
+
+        :return: A query that matches every item.
+        """
+        return ItemQuery(self)
 
     def load_all_items(self, input_data_file_or_directory: str) -> None:
-        """Load the items database via a JSON file, or directory of JSON files.
+        """Load the items database via a JSON file, directory of JSON files or snapshot.
 
         :param input_data_file_or_directory: The path to the data input.
         """
@@ -74,13 +217,26 @@ class AllItems:
             self._load_items_from_directory(path_to_directory=path)
 
         elif os.path.isfile(input_data_file_or_directory):
-            self._load_items_from_file(input_data_file_or_directory)
+            if is_snapshot_file(input_data_file_or_directory):
+                self._load_items_from_snapshot(input_data_file_or_directory)
+            else:
+                self._load_items_from_file(input_data_file_or_directory)
 
     def _load_items_from_directory(self, path_to_directory: str) -> None:
         """Load item database from a directory of JSON files (`items-json`).
 
         :param path_to_directory: The path to the `items-json` directory.
         """
+        if self.lazy:
+            self._load_items_from_directory_lazy(path_to_directory)
+            return
+
+        if self.workers > 1:
+            for item_def in iter_items_from_directory(path_to_directory, workers=self.workers,
+                                                      use_processes=self.use_processes):
+                self._store_item(item_def)
+            return
+
         # Loop through every item file
         for json_file in glob.glob(path_to_directory):
 
@@ -101,14 +257,166 @@ class AllItems:
             temp = json.load(input_json_file)
 
         for entry in temp:
-            self._load_item(temp[entry])
+            if self.lazy:
+                self._store_lazy_item(int(entry), temp[entry])
+            else:
+                self._load_item(temp[entry])
+
+    def _load_items_from_directory_lazy(self, path_to_directory: str) -> None:
+        """Index a directory of JSON files by item ID, without reading any item files.
+
+        Item files are named using the item ID number (for example, `4151.json`). Any other
+        file is read straight away to determine the item ID number.
+
+        :param path_to_directory: The path to the `items-json` directory.
+        """
+        for json_file in glob.glob(path_to_directory):
+
+            if os.path.isdir(json_file):
+                continue
+
+            file_name = os.path.splitext(os.path.basename(json_file))[0]
+            if file_name.isdigit():
+                self._store_lazy_item(int(file_name), json_file)
+            else:
+                with open(json_file) as input_json_file:
+                    temp = json.load(input_json_file)
+                self._store_lazy_item(temp["id"], temp)
+
+    def _load_items_from_snapshot(self, path_to_snapshot: str) -> None:
+        """Load item database from a binary snapshot, without materializing any items.
+
+        :param path_to_snapshot: The path to the snapshot file.
+        """
+        self._snapshot = ItemSnapshot(path_to_snapshot)
+        self._items.update(dict.fromkeys(self._snapshot.ids))
+        self._invalidate_caches()
+        self._unmaterialized += len(self._snapshot)
 
     def _load_item(self, item_json: Dict) -> None:
         """Convert the `item_json` into a :class:`ItemDefinition` and store it."""
         # Load the item using the ItemDefinition class
         item_def = ItemDefinition()
         item_def.load_item_definition_from_file(item_json)
+        self._store_item(item_def)
+
+    def _store_item(self, item_def: ItemDefinition) -> None:
+        """Add a loaded :class:`ItemDefinition` to the item lookup dictionary."""
+        self._items[item_def.id] = item_def
+        self._invalidate_caches()
+
+    def _store_lazy_item(self, id_number: int, item_json_or_file: Union[Dict, str]) -> None:
+        """Add a placeholder for an item that is materialized on first access.
+
+        :param id_number: The item ID number.
+        :param item_json_or_file: The raw item dictionary, or the file name of the item JSON file.
+        """
+        self._items[id_number] = None
+        self._lazy_items[id_number] = item_json_or_file
+        self._invalidate_caches()
+        self._unmaterialized += 1
+
+    def _invalidate_caches(self) -> None:
+        """Clear the all_items list, columns, indexes and name search, after items are loaded."""
+        self._all_items_list = None
+        self._columns = None
+        self._indexes = None
+        self._name_search = None
+
+    def _materialize(self, id_number: int) -> ItemDefinition:
+        """Convert a lazily loaded item into a :class:`ItemDefinition` and store it.
+
+        :param id_number: The item ID number.
+        :return item_def: The item definition object linked to a specific ID number.
+        """
+        item_json = self._lazy_items.pop(id_number, None)
+        if item_json is None:
+            item_json = self._snapshot.load_item_json(id_number)
+        elif isinstance(item_json, str):
+            with open(item_json) as input_json_file:
+                item_json = json.load(input_json_file)
+
+        item_def = ItemDefinition()
+        item_def.load_item_definition_from_file(item_json)
+        self._items[id_number] = item_def
+        self._unmaterialized -= 1
+        return item_def
+
+    def _materialize_all(self) -> None:
+        """Convert any lazily loaded items into :class:`ItemDefinition` objects."""
+        if self._unmaterialized:
+            for id_number, item_def in self._items.items():
+                if item_def is None:
+                    self._materialize(id_number)
+
+    def export_snapshot(self, out_file_name: str) -> None:
+        """Export the loaded items database to a binary snapshot file.
+
+        :param out_file_name: The file name for the snapshot.
+        """
+        write_snapshot((item_def.construct_json() for item_def in self), out_file_name)
+
+
+def _load_item_files(json_files: List[str]) -> List[ItemDefinition]:
+    """Read a batch of item JSON files, and convert each item into a :class:`ItemDefinition`.
+
+    :param json_files: A list of paths to item JSON files.
+    :return: The ItemDefinition objects, in the same order as `json_files`.
+    """
+    batch = list()
+    for json_file in json_files:
+        with open(json_file) as input_json_file:
+            item_json = json.load(input_json_file)
+        item_def = ItemDefinition()
+        item_def.load_item_definition_from_file(item_json)
+        batch.append(item_def)
+    return batch
+
+
+def iter_items_from_directory(path_to_directory: str,
+                              workers: int = 4,
+                              batch_size: int = 256,
+                              use_processes: bool = False) -> Generator[ItemDefinition, None, None]:
+    """Read a directory of item JSON files in parallel, and yield each item as it is decoded.
+
+    Files are read in batches by a bounded pool of workers. At most two batches per worker
+    are in flight at any time, and items are yielded in the same order as a serial `glob`
+    of the directory, so the result matches the serial loader exactly. Each worker also
+    creates the ItemDefinition objects, so a process pool returns finished items.
+
+    Reading and decoding JSON holds the GIL, so a thread pool is no faster than the serial
+    loader. Only a process pool can use more than one CPU core, at the cost of sending every
+    item back to this process.
+
+    :param path_to_directory: The path to the `items-json` directory, or a glob pattern of files.
+    :param workers: The number of threads (or processes) reading files.
+    :param batch_size: The number of files read and decoded by each task.
+    :param use_processes: Read files in a process pool instead of a thread pool.
+    :return: A generator of :class:`ItemDefinition` objects.
+    """
+    if os.path.isdir(path_to_directory):
+        path_to_directory = os.path.join(path_to_directory, "*")
+    json_files = [json_file for json_file in glob.glob(path_to_directory) if not os.path.isdir(json_file)]
+    batches = [json_files[i:i + batch_size] for i in range(0, len(json_files), batch_size)]
+
+    if use_processes:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+
+    with executor:
+        pending = collections.deque()
+        batches = iter(batches)
+        for batch in batches:
+            pending.append(executor.submit(_load_item_files, batch))
+            if len(pending) >= workers * 2:
+                break
 
-        # Add item to list
-        self.all_items.append(item_def)
-        self.all_items_dict[item_def.id] = item_def
+        while pending:
+            item_defs = pending.popleft().result()
+            # Keep the pool busy while this batch is stored
+            for batch in batches:
+                pending.append(executor.submit(_load_item_files, batch))
+                break
+            for item_def in item_defs:
+                yield item_def
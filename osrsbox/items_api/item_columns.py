@@ -0,0 +1,138 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+from typing import Dict
+from typing import List
+from typing import Iterable
+
+import numpy as np
+
+from osrsbox.items_api.item_definition import ItemDefinition
+from osrsbox.items_api.item_stats import ItemStats
+
+
+class ItemColumns:
+    """This class provides a columnar (NumPy) view of the equipable items in the database.
+
+    Every array is aligned by row, so row `i` of each array belongs to `items[i]`. This
+    allows gear queries to be written as vectorized filters and sorts. For example, the
+    top 20 weapons by slash attack with an attack speed of 4 or less:
+
+        mask = columns.slot_mask("weapon") & (columns.attack_speed <= 4)
+        columns.top("attack_slash", 20, mask)
+
+    :param items: The ItemDefinition objects to include, only equipable items are used.
+    """
+    # The bonus columns, in the same order as the ItemStats properties
+    BONUSES = ItemStats.PROPERTIES
+
+    def __init__(self, items: Iterable[ItemDefinition]):
+        self.items: List[ItemDefinition] = [item for item in items if item.equipable and item.item_stats is not None]
+        self.bonus_index: Dict[str, int] = {bonus: index for index, bonus in enumerate(self.BONUSES)}
+
+        # The equipment slot names, the slot codes array holds an index into this list
+        self.slot_names: List[str] = sorted({item.item_equipment.slot for item in self.items
+                                             if item.item_equipment.slot is not None})
+        slot_codes = {slot: code for code, slot in enumerate(self.slot_names)}
+
+        count = len(self.items)
+        self.ids = np.empty(count, dtype=np.int32)
+        # Missing bonuses, attack speeds and weights are NaN, so any comparison with them is False
+        self.bonuses = np.full((count, len(self.BONUSES)), np.nan, dtype=np.float64)
+        self.slots = np.full(count, -1, dtype=np.int8)
+        self.attack_speed = np.full(count, np.nan, dtype=np.float64)
+        self.weight = np.full(count, np.nan, dtype=np.float64)
+
+        for row, item in enumerate(self.items):
+            self.ids[row] = item.id
+            for column, bonus in enumerate(self.BONUSES):
+                value = getattr(item.item_stats, bonus)
+                # Bonuses that could not be parsed into a number are left missing, as a scan never matches them
+                if isinstance(value, (int, float)):
+                    self.bonuses[row, column] = value
+            if item.item_equipment.slot is not None:
+                self.slots[row] = slot_codes[item.item_equipment.slot]
+            if item.item_equipment.attack_speed is not None:
+                self.attack_speed[row] = item.item_equipment.attack_speed
+            if item.weight is not None:
+                self.weight[row] = item.weight
+
+    def __len__(self) -> int:
+        """Return the number of equipable items (rows).
+
+        :return: The number of rows in every column.
+        """
+        return len(self.items)
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a single column by name.
+
+        :param name: A bonus name (for example, `attack_slash`), `attack_speed`, `weight`, `id` or `slot`.
+        :return: The column array, aligned with `items`.
+        """
+        if name in self.bonus_index:
+            return self.bonuses[:, self.bonus_index[name]]
+        if name == "attack_speed":
+            return self.attack_speed
+        if name == "weight":
+            return self.weight
+        if name == "id":
+            return self.ids
+        if name == "slot":
+            return self.slots
+        raise KeyError(f"Unknown item column: {name}")
+
+    def slot_mask(self, slot: str) -> np.ndarray:
+        """Return a boolean mask of the items in an equipment slot.
+
+        :param slot: The equipment slot name, for example `weapon` or `head`.
+        :return: A boolean array, True for items in the slot.
+        """
+        try:
+            return self.slots == self.slot_names.index(slot)
+        except ValueError:
+            return np.zeros(len(self.items), dtype=bool)
+
+    def select(self, mask_or_rows: np.ndarray) -> List[ItemDefinition]:
+        """Return the ItemDefinition objects for a boolean mask, or an array of row numbers.
+
+        :param mask_or_rows: A boolean mask, or an array of row numbers.
+        :return: The selected ItemDefinition objects, in row order.
+        """
+        rows = np.asarray(mask_or_rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        return [self.items[row] for row in rows]
+
+    def top(self, name: str, count: int, mask: np.ndarray = None, descending: bool = True) -> List[ItemDefinition]:
+        """Return the items with the highest (or lowest) values in a column. Missing values are sorted last.
+
+        :param name: The column to sort by.
+        :param count: The maximum number of items to return.
+        :param mask: An optional boolean mask to filter items before sorting.
+        :param descending: Sort from highest to lowest value.
+        :return: The selected ItemDefinition objects, in sorted order.
+        """
+        rows = np.arange(len(self.items)) if mask is None else np.flatnonzero(mask)
+        values = self.column(name)[rows]
+        # A stable sort keeps items with equal values in row order
+        order = np.argsort(-values if descending else values, kind="stable")
+        return self.select(rows[order[:count]])
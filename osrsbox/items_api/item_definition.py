@@ -35,7 +35,21 @@ class ItemDefinition:
     for one specific item. Every item has the properties defined in this class.
     Equipable items have additional properties defined in the linked ItemStats
     and ItemEquipment classes.
+
+    The class uses `__slots__` so no per-instance `__dict__` is created, which keeps
+    the memory use low when the entire items database is loaded.
     """
+    # The exported item properties, in the order they are written to JSON
+    PROPERTIES = ("id", "name", "members", "tradeable", "tradeable_on_ge", "stackable", "noted", "noteable",
+                  "linked_id", "equipable", "cost", "lowalch", "highalch", "weight", "buy_limit",
+                  "quest_item", "release_date", "examine", "url")
+
+    __slots__ = tuple("_" + prop for prop in PROPERTIES) + (
+        "item_stats",  # The ItemStats object, for equipable items
+        "item_equipment",  # The ItemEquipment object, for equipable items
+        "wiki_name",  # The OSRS Wiki page name, used when building the item
+        "store_price",  # The store price, used when building the item
+        "seller")  # The store sellers, used when building the item
 
     def __init__(self):
         self._id = None
@@ -59,6 +73,8 @@ class ItemDefinition:
         # self._store_price = None
         self._examine = None
         self._url = None
+        self.item_stats = None
+        self.item_equipment = None
 
     @property
     def id(self) -> int:
@@ -254,20 +270,19 @@ class ItemDefinition:
 
         :param item_data: A dictionary loaded from a JSON file.
         """
-        for prop in vars(self):
-            prop = prop[1:]
+        for prop in self.PROPERTIES:
             setattr(self, prop, item_data[prop])
 
         # If the item is equipable, it should have stats and equipment objects populated
         if self.equipable:
             # Initialize an empty ItemStats object
-            self.item_stats: object = item_stats.ItemStats()
+            self.item_stats = item_stats.ItemStats()
 
             # Populate items stats
             self.item_stats.load_item_stats_from_file(item_data["bonuses"])
 
             # Initialize an empty ItemEquipment object
-            self.item_equipment: object = item_equipment.ItemEquipment()
+            self.item_equipment = item_equipment.ItemEquipment()
 
             # Populate item equipment
             self.item_equipment.load_item_equipment_from_file(item_data["equipment"])
@@ -278,10 +293,8 @@ class ItemDefinition:
         :return json_out: All class attributes stored in a dictionary.
         """
         json_out: Dict = collections.OrderedDict()
-        for prop in vars(self):
-            if prop.startswith("_"):
-                prop = prop[1:]
-                json_out[prop] = getattr(self, prop)
+        for prop in self.PROPERTIES:
+            json_out[prop] = getattr(self, prop)
 
         if self.equipable:
             json_out["bonuses"] = self.item_stats.construct_json()
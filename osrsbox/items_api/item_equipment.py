@@ -26,6 +26,11 @@ from typing import List
 
 class ItemEquipment:
     """This class defines the equipment structure and properties for an OSRS item."""
+    # The equipment properties, in the order they are written to JSON
+    PROPERTIES = ("slot", "attack_speed", "skill_reqs")
+
+    __slots__ = tuple("_" + prop for prop in PROPERTIES)
+
     def __init__(self):
         self.slot = None
         self.attack_speed = None
@@ -63,8 +68,7 @@ class ItemEquipment:
 
         :param item_data: A dictionary loaded from a JSON file.
         """
-        for prop in vars(self):
-            prop = prop[1:]
+        for prop in self.PROPERTIES:
             setattr(self, prop, item_data[prop])
 
     def construct_json(self) -> Dict:
@@ -73,8 +77,7 @@ class ItemEquipment:
         :return json_out: A dictionary of all equipment properties.
         """
         json_out = collections.OrderedDict()
-        for prop in vars(self):
-            prop = prop[1:]
+        for prop in self.PROPERTIES:
             json_out[prop] = getattr(self, prop)
 
         return json_out
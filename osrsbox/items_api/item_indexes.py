@@ -0,0 +1,94 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import collections
+from typing import Dict
+from typing import List
+from typing import Iterable
+
+from osrsbox.items_api.item_definition import ItemDefinition
+
+
+class ItemIndexes:
+    """This class holds secondary indexes of the items database.
+
+    Each index maps a key to the list of matching items, in load order, so every
+    lookup is a single dictionary access.
+
+    :param items: The ItemDefinition objects to index.
+    """
+    # The boolean item properties that are indexed
+    FLAGS = ("members", "tradeable_on_ge", "stackable", "equipable", "quest_item")
+
+    def __init__(self, items: Iterable[ItemDefinition]):
+        self.by_id: Dict[int, ItemDefinition] = dict()
+        self.by_name: Dict[str, List[ItemDefinition]] = collections.defaultdict(list)
+        self.by_slot: Dict[str, List[ItemDefinition]] = collections.defaultdict(list)
+        self.by_flag: Dict[str, Dict[bool, List[ItemDefinition]]] = {flag: {True: list(), False: list()}
+                                                                     for flag in self.FLAGS}
+
+        for item in items:
+            self.by_id[item.id] = item
+            if item.name is not None:
+                self.by_name[item.name.lower()].append(item)
+            if item.equipable and item.item_equipment is not None and item.item_equipment.slot is not None:
+                self.by_slot[item.item_equipment.slot].append(item)
+            for flag in self.FLAGS:
+                # Unknown (None) values are grouped with False, and quest item lists with True
+                self.by_flag[flag][bool(getattr(item, flag))].append(item)
+
+        # Stop missing keys being added to the indexes when queried
+        self.by_name.default_factory = None
+        self.by_slot.default_factory = None
+
+    def items_by_name(self, name: str) -> List[ItemDefinition]:
+        """Return every item with a name, ignoring case.
+
+        :param name: The item name.
+        :return: A list of matching items.
+        """
+        return list(self.by_name.get(name.lower(), list()))
+
+    def items_by_slot(self, slot: str) -> List[ItemDefinition]:
+        """Return every equipable item in an equipment slot.
+
+        :param slot: The equipment slot name, for example `weapon` or `head`.
+        :return: A list of matching items.
+        """
+        return list(self.by_slot.get(slot, list()))
+
+    def items_by_flag(self, flag: str, value: bool = True) -> List[ItemDefinition]:
+        """Return every item with a boolean property set to a value.
+
+        :param flag: The property name, one of `FLAGS`.
+        :param value: The property value to match.
+        :return: A list of matching items.
+        """
+        return list(self.by_flag[flag][bool(value)])
+
+    def linked_item(self, id_number: int) -> ItemDefinition:
+        """Return the linked item (for example, the noted version of an unnoted item).
+
+        :param id_number: The item ID number.
+        :return: The linked item, or None if the item has no linked item in the database.
+        """
+        linked_id = self.by_id[id_number].linked_id
+        return self.by_id.get(linked_id)
@@ -0,0 +1,315 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import copy
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Generator
+
+import numpy as np
+
+from osrsbox.items_api.item_definition import ItemDefinition
+from osrsbox.items_api.item_equipment import ItemEquipment
+from osrsbox.items_api.item_indexes import ItemIndexes
+from osrsbox.items_api.item_stats import ItemStats
+
+# Fields that only have a value for equipable items, and are held in the item columns
+COLUMN_FIELDS = set(ItemStats.PROPERTIES) | {"attack_speed", "slot"}
+# Fields that can be filtered using the item columns when the query only matches equipable items
+COLUMN_RANGE_FIELDS = set(ItemStats.PROPERTIES) | {"attack_speed", "weight"}
+# Fields with an index, mapped to the index used for equality lookups
+INDEX_FIELDS = {"id": "id", "name": "name", "slot": "slot"}
+INDEX_FIELDS.update({flag: "flag" for flag in ItemIndexes.FLAGS})
+# The relative cost of checking one item in Python compared to one row in the item columns
+COLUMN_SCAN_COST = 0.05
+
+
+def field_value(item: ItemDefinition, field: str) -> Any:
+    """Return the value of an item property, bonus or equipment property.
+
+    :param item: The item.
+    :param field: The property name, for example `name`, `attack_slash` or `slot`.
+    :return: The property value, or None if the item does not have the property.
+    """
+    if field in ItemDefinition.PROPERTIES:
+        return getattr(item, field)
+    if field in ItemStats.PROPERTIES:
+        return None if item.item_stats is None else getattr(item.item_stats, field)
+    return None if item.item_equipment is None else getattr(item.item_equipment, field)
+
+
+class ItemQuery:
+    """This class builds and runs a query over the items database.
+
+    Each method returns a new query, so a partially built query can be reused. When run,
+    the query picks the cheapest way to find candidate items: an index lookup, a
+    vectorized filter over the item columns, or a scan of every item. Any predicates
+    not handled by that path are then checked for each candidate item.
+
+    For example, the 20 weapons with the highest slash attack of 50 or more:
+
+        ai.query().where(equipable=True, slot="weapon").where_range("attack_slash", 50, None)
+          .order_by("attack_slash", descending=True).limit(20).all()
+
+    :param all_items: The loaded AllItems object to query.
+    """
+    def __init__(self, all_items):
+        self._all_items = all_items
+        self._equals: Dict[str, Any] = dict()
+        self._ranges: List[Tuple[str, Any, Any]] = list()
+        self._order_by: Tuple[str, bool] = None
+        self._limit: int = None
+        self._plan: Dict = None
+
+    def __iter__(self) -> Generator[ItemDefinition, None, None]:
+        """Iterate (loop) over each matching ItemDefinition object."""
+        for item in self.all():
+            yield item
+
+    def _copy(self) -> "ItemQuery":
+        query = copy.copy(self)
+        query._equals = dict(self._equals)
+        query._ranges = list(self._ranges)
+        query._plan = None
+        return query
+
+    @staticmethod
+    def _check_field(field: str):
+        if field not in ItemDefinition.PROPERTIES + ItemStats.PROPERTIES + ItemEquipment.PROPERTIES:
+            raise KeyError(f"Unknown item field: {field}")
+
+    def where(self, **equals) -> "ItemQuery":
+        """Match items with properties equal to the given values.
+
+        Names are matched ignoring case. The boolean flags (`members`, `tradeable_on_ge`,
+        `stackable`, `equipable` and `quest_item`) treat a missing value as False.
+
+        :param equals: Property names and values, for example `slot="weapon"`.
+        :return: A new query.
+        """
+        query = self._copy()
+        for field, value in equals.items():
+            self._check_field(field)
+            query._equals[field] = value
+        return query
+
+    def where_range(self, field: str, low: Any = None, high: Any = None) -> "ItemQuery":
+        """Match items with a property between two values (inclusive).
+
+        Items without a value for the property are not matched.
+
+        :param field: The property name, for example `attack_slash` or `weight`.
+        :param low: The lowest value, or None for no lower bound.
+        :param high: The highest value, or None for no upper bound.
+        :return: A new query.
+        """
+        self._check_field(field)
+        query = self._copy()
+        query._ranges.append((field, low, high))
+        return query
+
+    def order_by(self, field: str, descending: bool = False) -> "ItemQuery":
+        """Sort the matching items by a property. Items without a value are sorted last.
+
+        :param field: The property name, a leading `-` sorts in descending order.
+        :param descending: Sort from highest to lowest value.
+        :return: A new query.
+        """
+        if field.startswith("-"):
+            field, descending = field[1:], True
+        self._check_field(field)
+        query = self._copy()
+        query._order_by = (field, descending)
+        return query
+
+    def limit(self, count: int) -> "ItemQuery":
+        """Return at most a number of items.
+
+        :param count: The maximum number of items.
+        :return: A new query.
+        """
+        query = self._copy()
+        query._limit = count
+        return query
+
+    def all(self) -> List[ItemDefinition]:
+        """Run the query.
+
+        :return: A list of matching items.
+        """
+        return self._execute()
+
+    def first(self) -> ItemDefinition:
+        """Run the query, and return the first matching item.
+
+        :return: The first matching item, or None if no items match.
+        """
+        items = self.limit(1)._execute()
+        return items[0] if items else None
+
+    def explain(self) -> Dict:
+        """Run the query, and describe how it was run.
+
+        :return: A dictionary with the path used (`index`, `columns` or `scan`), the index
+                 name, the number of candidate items checked in Python, the predicates
+                 checked in Python and the number of matching items.
+        """
+        self._execute()
+        return dict(self._plan)
+
+    def _matches_column_query(self) -> bool:
+        """Determine if the query only matches equipable items, so the item columns can be used."""
+        if self._equals.get("equipable") is True:
+            return True
+        return any(field in COLUMN_FIELDS for field in self._equals) or \
+            any(field in COLUMN_FIELDS for field, _, _ in self._ranges)
+
+    def _index_candidates(self) -> Tuple[str, List[ItemDefinition]]:
+        """Find the smallest candidate list available from an index.
+
+        :return: The index name and the candidate items, or (None, None) if no index applies.
+        """
+        indexes = self._all_items.indexes
+        best_name, best_items = None, None
+        for field, value in self._equals.items():
+            index = INDEX_FIELDS.get(field)
+            if index == "id":
+                candidates = [indexes.by_id[value]] if value in indexes.by_id else list()
+            elif index == "name":
+                candidates = indexes.by_name.get(str(value).lower(), list())
+            elif index == "slot":
+                candidates = indexes.by_slot.get(value, list())
+            elif index == "flag":
+                candidates = indexes.by_flag[field][bool(value)]
+            else:
+                continue
+            if best_items is None or len(candidates) < len(best_items):
+                best_name, best_items = field, candidates
+        return best_name, best_items
+
+    def _column_candidates(self) -> Tuple[List[ItemDefinition], List[str]]:
+        """Filter the item columns using every predicate they can handle.
+
+        :return: The candidate items, and the predicates that were handled.
+        """
+        columns = self._all_items.columns
+        mask = np.ones(len(columns), dtype=bool)
+        handled = list()
+        for field, value in self._equals.items():
+            if field == "equipable" and value is True:
+                handled.append(field)
+            elif field == "slot":
+                mask &= columns.slot_mask(value)
+                handled.append(field)
+            elif field in COLUMN_RANGE_FIELDS and isinstance(value, (int, float)) and not isinstance(value, bool):
+                mask &= columns.column(field) == value
+                handled.append(field)
+        for field, low, high in self._ranges:
+            # A range without bounds matches any value that is not missing, so is checked in Python
+            if field in COLUMN_RANGE_FIELDS and (low is not None or high is not None):
+                values = columns.column(field)
+                if low is not None:
+                    mask &= values >= low
+                if high is not None:
+                    mask &= values <= high
+                handled.append(f"{field} range")
+        return columns.select(mask), handled
+
+    def _residual_predicates(self, handled: List[str]) -> List:
+        """Build the predicate functions not handled by the candidate path."""
+        predicates = list()
+        for field, value in self._equals.items():
+            if field in handled:
+                continue
+            if field == "name":
+                name = str(value).lower()
+                predicates.append(lambda item, name=name: item.name is not None and item.name.lower() == name)
+            elif field in ItemIndexes.FLAGS:
+                predicates.append(lambda item, field=field, value=bool(value): bool(getattr(item, field)) == value)
+            else:
+                predicates.append(lambda item, field=field, value=value: field_value(item, field) == value)
+        for field, low, high in self._ranges:
+            if f"{field} range" in handled:
+                continue
+            predicates.append(lambda item, field=field, low=low, high=high: _in_range(field_value(item, field), low, high))
+        return predicates
+
+    def _execute(self) -> List[ItemDefinition]:
+        """Plan and run the query, and store the plan for `explain`."""
+        total = len(self._all_items)
+        index_name, index_items = self._index_candidates()
+
+        # Pick the path with the lowest estimated cost
+        path, cost = "scan", total
+        if index_items is not None and len(index_items) < cost:
+            path, cost = "index", len(index_items)
+        if self._matches_column_query():
+            column_cost = len(self._all_items.columns) * COLUMN_SCAN_COST
+            if column_cost < cost:
+                path, cost = "columns", column_cost
+
+        if path == "index":
+            candidates, handled = index_items, [index_name]
+        elif path == "columns":
+            candidates, handled = self._column_candidates()
+        else:
+            candidates, handled = self._all_items, list()
+
+        predicates = self._residual_predicates(handled)
+        touched = 0
+        results = list()
+        for item in candidates:
+            touched += 1
+            if all(predicate(item) for predicate in predicates):
+                results.append(item)
+
+        if self._order_by is not None:
+            field, descending = self._order_by
+            with_value = [item for item in results if field_value(item, field) is not None]
+            without_value = [item for item in results if field_value(item, field) is None]
+            with_value.sort(key=lambda item: field_value(item, field), reverse=descending)
+            results = with_value + without_value
+
+        if self._limit is not None:
+            results = results[:self._limit]
+
+        self._plan = {
+            "path": path,
+            "index": index_name if path == "index" else None,
+            "handled": handled,
+            "residual": [predicate for predicate in list(self._equals) + [f"{field} range" for field, _, _ in self._ranges]
+                         if predicate not in handled],
+            "candidates": touched,
+            "results": len(results)
+        }
+        return results
+
+
+def _in_range(value: Any, low: Any, high: Any) -> bool:
+    """Check a value is between two (optional) bounds, a missing value is never in range."""
+    if value is None:
+        return False
+    try:
+        return (low is None or value >= low) and (high is None or value <= high)
+    except TypeError:
+        return False
@@ -0,0 +1,174 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import bisect
+import collections
+from typing import Dict
+from typing import List
+from typing import Iterable
+
+import numpy as np
+
+from osrsbox.items_api.item_definition import ItemDefinition
+
+
+def trigrams(text: str) -> List[str]:
+    """Split text into overlapping three character sequences, padded with spaces.
+
+    :param text: The text to split.
+    :return: A list of trigrams, for example "whip" is [" wh", "whi", "hip", "ip "].
+    """
+    text = f" {text} "
+    return [text[i:i + 3] for i in range(len(text) - 2)]
+
+
+def edit_distance(first: str, second: str) -> int:
+    """Calculate the Levenshtein edit distance between two strings.
+
+    :param first: The first string.
+    :param second: The second string.
+    :return: The number of single character insertions, deletions or substitutions.
+    """
+    return EditDistance(first).distance(second)
+
+
+class EditDistance:
+    """Calculate the Levenshtein edit distance from one string to many other strings.
+
+    Uses the bit-parallel algorithm by Myers (1999), as described by Hyyrö (2001),
+    where each column of the dynamic programming matrix is held in the bits of an
+    integer. The character masks for the pattern are built once, so comparing the
+    pattern to many strings is cheap.
+
+    :param pattern: The string to compare against.
+    """
+    def __init__(self, pattern: str):
+        self.length = len(pattern)
+        self.full_mask = (1 << self.length) - 1
+        self.last_bit = 1 << (self.length - 1) if pattern else 0
+        self.char_masks: Dict[str, int] = dict()
+        for position, char in enumerate(pattern):
+            self.char_masks[char] = self.char_masks.get(char, 0) | (1 << position)
+
+    def distance(self, text: str) -> int:
+        """Return the edit distance between the pattern and some text.
+
+        :param text: The string to compare to the pattern.
+        :return: The edit distance.
+        """
+        if not self.length:
+            return len(text)
+        full_mask, last_bit, char_masks = self.full_mask, self.last_bit, self.char_masks
+        positive, negative, score = full_mask, 0, self.length
+        for char in text:
+            equal = char_masks.get(char, 0)
+            vertical = equal | negative
+            horizontal = (((equal & positive) + positive) ^ positive) | equal
+            horizontal_positive = negative | (~(horizontal | positive) & full_mask)
+            horizontal_negative = positive & horizontal
+            if horizontal_positive & last_bit:
+                score += 1
+            elif horizontal_negative & last_bit:
+                score -= 1
+            horizontal_positive = ((horizontal_positive << 1) | 1) & full_mask
+            horizontal_negative = (horizontal_negative << 1) & full_mask
+            positive = horizontal_negative | (~(vertical | horizontal_positive) & full_mask)
+            negative = horizontal_positive & vertical
+        return score
+
+
+class ItemNameSearch:
+    """This class provides fast prefix and fuzzy searches of item names.
+
+    Names are matched ignoring case. Prefix searches use binary search over the sorted
+    item names. Fuzzy searches use a trigram index to find candidate names, which are
+    then ranked by edit distance to the query.
+
+    :param items: The ItemDefinition objects to search.
+    """
+    def __init__(self, items: Iterable[ItemDefinition]):
+        self.items_by_name: Dict[str, List[ItemDefinition]] = collections.defaultdict(list)
+        for item in items:
+            if item.name is not None:
+                self.items_by_name[item.name.lower()].append(item)
+        self.items_by_name.default_factory = None
+
+        # Sorted unique names, for prefix searches
+        self.names: List[str] = sorted(self.items_by_name)
+
+        # Trigram to name numbers index, for fuzzy searches
+        trigram_index: Dict[str, List[int]] = collections.defaultdict(list)
+        for name_number, name in enumerate(self.names):
+            for trigram in set(trigrams(name)):
+                trigram_index[trigram].append(name_number)
+        self.trigram_index: Dict[str, np.ndarray] = {trigram: np.array(name_numbers, dtype=np.int32)
+                                                     for trigram, name_numbers in trigram_index.items()}
+
+    def _expand(self, names: Iterable[str], limit: int) -> List[ItemDefinition]:
+        """Convert a list of names into a list of items, up to a maximum number of items."""
+        items = list()
+        for name in names:
+            items.extend(self.items_by_name[name])
+            if len(items) >= limit:
+                break
+        return items[:limit]
+
+    def prefix(self, prefix: str, limit: int = 10) -> List[ItemDefinition]:
+        """Return items with a name that starts with a prefix, sorted by name.
+
+        :param prefix: The start of an item name, ignoring case.
+        :param limit: The maximum number of items to return.
+        :return: A list of matching items.
+        """
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self.names, prefix)
+        end = start
+        # Stop as soon as enough names are found, each name has at least one item
+        while end < len(self.names) and end - start < limit and self.names[end].startswith(prefix):
+            end += 1
+        return self._expand(self.names[start:end], limit)
+
+    def fuzzy(self, query: str, limit: int = 10, candidates: int = 20) -> List[ItemDefinition]:
+        """Return items with a name similar to the query, most similar first.
+
+        Names sharing the most trigrams with the query are selected as candidates,
+        then ranked by edit distance. Ties are ranked by name.
+
+        :param query: The (possibly misspelled) item name.
+        :param limit: The maximum number of items to return.
+        :param candidates: The number of candidate names ranked by edit distance.
+        :return: A list of matching items.
+        """
+        query = query.lower()
+        postings = [self.trigram_index[trigram] for trigram in set(trigrams(query)) if trigram in self.trigram_index]
+        if not postings:
+            return list()
+
+        # Count the trigrams shared by each name, and keep the names sharing the most
+        shared_trigrams = np.bincount(np.concatenate(postings), minlength=len(self.names))
+        candidates = min(candidates, len(self.names))
+        name_numbers = np.argpartition(-shared_trigrams, candidates - 1)[:candidates]
+        name_numbers = name_numbers[shared_trigrams[name_numbers] > 0]
+
+        query_distance = EditDistance(query)
+        ranked = sorted((query_distance.distance(self.names[name_number]), self.names[name_number])
+                        for name_number in name_numbers)
+        return self._expand([name for _, name in ranked], limit)
@@ -0,0 +1,313 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import sys
+import json
+import mmap
+import math
+import array
+import struct
+import collections
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Iterable
+
+from osrsbox.items_api.item_definition import ItemDefinition
+from osrsbox.items_api.item_equipment import ItemEquipment
+from osrsbox.items_api.item_stats import ItemStats
+
+SNAPSHOT_MAGIC = b"OSRSBOXS"
+SNAPSHOT_VERSION = 1
+
+# Header: magic, version, byte order, item count, string count
+HEADER = struct.Struct("<8sIcxxxII")
+
+INT_NULL = -2 ** 31
+BOOL_NULL = -1
+
+# The property order of an item, and the nested bonuses and equipment entries
+ITEM_PROPERTIES = list(ItemDefinition.PROPERTIES)
+STATS_PROPERTIES = list(ItemStats.PROPERTIES)
+EQUIPMENT_PROPERTIES = list(ItemEquipment.PROPERTIES)
+
+# Columns stored in the snapshot, grouped by storage type
+INT_COLUMNS = ["id", "linked_id", "cost", "lowalch", "highalch", "buy_limit"] + STATS_PROPERTIES + ["attack_speed"]
+BOOL_COLUMNS = ["members", "tradeable", "tradeable_on_ge", "stackable", "noted", "noteable", "equipable", "quest_item"]
+FLOAT_COLUMNS = ["weight"]
+STRING_COLUMNS = ["name", "release_date", "examine", "url", "slot"]
+# Columns stored as JSON encoded strings in the string table
+JSON_COLUMNS = ["skill_reqs", "overflow"]
+
+
+def _align(offset: int) -> int:
+    """Round an offset up to the next 8 byte boundary."""
+    return (offset + 7) & ~7
+
+
+def _column_layout(item_count: int, string_count: int) -> Dict[str, tuple]:
+    """Determine the (offset, typecode, length) of every section in a snapshot file.
+
+    :param item_count: The number of items in the snapshot.
+    :param string_count: The number of strings in the string table.
+    :return layout: A dictionary of section name to offset, array typecode and length.
+    """
+    layout = collections.OrderedDict()
+    offset = _align(HEADER.size)
+    sections = [(column, "i", item_count) for column in INT_COLUMNS]
+    sections += [(column, "d", item_count) for column in FLOAT_COLUMNS]
+    sections += [(column, "i", item_count) for column in STRING_COLUMNS + JSON_COLUMNS]
+    sections += [(column, "b", item_count) for column in BOOL_COLUMNS]
+    sections += [("string_offsets", "I", string_count + 1)]
+    for name, typecode, length in sections:
+        layout[name] = (offset, typecode, length)
+        offset = _align(offset + array.array(typecode).itemsize * length)
+    layout["string_data"] = (offset, "B", None)
+    return layout
+
+
+class _StringTable:
+    """Intern strings for a snapshot, each unique string is stored once."""
+    def __init__(self):
+        self.index: Dict[str, int] = dict()
+        self.data = bytearray()
+        self.offsets = array.array("I", [0])
+
+    def add(self, value: str) -> int:
+        if value is None:
+            return -1
+        try:
+            return self.index[value]
+        except KeyError:
+            self.data += value.encode("utf-8")
+            self.offsets.append(len(self.data))
+            self.index[value] = len(self.index)
+            return self.index[value]
+
+
+def _fits_int(value: Any) -> bool:
+    return type(value) is int and INT_NULL < value < 2 ** 31
+
+
+def write_snapshot(item_jsons: Iterable[Dict], out_file_name: str):
+    """Write a binary snapshot of the items database.
+
+    Numeric and boolean properties are stored in fixed-width columns, and strings
+    are stored once in an interned string table. Any value that does not fit in its
+    column (for example, a list in the quest_item property) is stored as JSON in
+    the overflow column, so every item round trips exactly.
+
+    :param item_jsons: Item dictionaries, as returned by `ItemDefinition.construct_json`.
+    :param out_file_name: The file name for the snapshot.
+    """
+    columns = {column: array.array("i") for column in INT_COLUMNS + STRING_COLUMNS + JSON_COLUMNS}
+    columns.update({column: array.array("d") for column in FLOAT_COLUMNS})
+    columns.update({column: array.array("b") for column in BOOL_COLUMNS})
+    strings = _StringTable()
+
+    for item_json in item_jsons:
+        values = dict(item_json)
+        values.update(item_json.get("bonuses", dict()))
+        values.update(item_json.get("equipment", dict()))
+        overflow = dict()
+
+        for column in INT_COLUMNS:
+            value = values.get(column)
+            if value is None or _fits_int(value):
+                columns[column].append(INT_NULL if value is None else value)
+            else:
+                columns[column].append(INT_NULL)
+                overflow[column] = value
+        for column in FLOAT_COLUMNS:
+            value = values.get(column)
+            if value is None or type(value) is float and not math.isnan(value):
+                columns[column].append(math.nan if value is None else value)
+            else:
+                columns[column].append(math.nan)
+                overflow[column] = value
+        for column in BOOL_COLUMNS:
+            value = values.get(column)
+            if value is None or type(value) is bool:
+                columns[column].append(BOOL_NULL if value is None else int(value))
+            else:
+                columns[column].append(BOOL_NULL)
+                overflow[column] = value
+        for column in STRING_COLUMNS:
+            value = values.get(column)
+            if value is None or type(value) is str:
+                columns[column].append(strings.add(value))
+            else:
+                columns[column].append(-1)
+                overflow[column] = value
+
+        skill_reqs = values.get("skill_reqs")
+        columns["skill_reqs"].append(-1 if skill_reqs is None else strings.add(json.dumps(skill_reqs)))
+        columns["overflow"].append(strings.add(json.dumps(overflow)) if overflow else -1)
+
+    item_count = len(columns["id"])
+    string_count = len(strings.index)
+    layout = _column_layout(item_count, string_count)
+    columns["string_offsets"] = strings.offsets
+
+    with open(out_file_name, "wb") as out_file:
+        out_file.write(HEADER.pack(SNAPSHOT_MAGIC,
+                                   SNAPSHOT_VERSION,
+                                   sys.byteorder[0].encode("ascii"),
+                                   item_count,
+                                   string_count))
+        for name, (offset, _, _) in layout.items():
+            out_file.write(b"\x00" * (offset - out_file.tell()))
+            if name == "string_data":
+                out_file.write(strings.data)
+            else:
+                out_file.write(columns[name].tobytes())
+
+
+def is_snapshot_file(file_name: str) -> bool:
+    """Check if a file is an items database snapshot.
+
+    :param file_name: The file name to check.
+    :return: True if the file starts with the snapshot magic bytes.
+    """
+    with open(file_name, "rb") as in_file:
+        return in_file.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC
+
+
+class ItemSnapshot:
+    """This class provides read access to a memory-mapped items database snapshot.
+
+    Opening a snapshot only maps the file and reads the item ID column. Every
+    other value is read from the mapped columns when an item is requested.
+
+    :param snapshot_file: The file name of a snapshot made using `write_snapshot`.
+    """
+    def __init__(self, snapshot_file: str):
+        with open(snapshot_file, "rb") as in_file:
+            self._mmap = mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, byte_order, self.item_count, self.string_count = HEADER.unpack_from(self._mmap)
+        if magic != SNAPSHOT_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not an items database snapshot: {snapshot_file}")
+        if version != SNAPSHOT_VERSION or byte_order != sys.byteorder[0].encode("ascii"):
+            self._mmap.close()
+            raise ValueError(f"Unsupported items database snapshot version or byte order: {snapshot_file}")
+
+        self._buffer = memoryview(self._mmap)
+        self.columns: Dict[str, memoryview] = dict()
+        layout = _column_layout(self.item_count, self.string_count)
+        for name, (offset, typecode, length) in layout.items():
+            if name == "string_data":
+                self._string_data = self._buffer[offset:]
+            else:
+                size = array.array(typecode).itemsize * length
+                self.columns[name] = self._buffer[offset:offset + size].cast(typecode)
+
+        self.ids: List[int] = self.columns["id"].tolist()
+        self._index_of: Dict[int, int] = {id_number: index for index, id_number in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        """Return the number of items in the snapshot."""
+        return self.item_count
+
+    def __contains__(self, id_number: int) -> bool:
+        return id_number in self._index_of
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the memory-mapped snapshot file."""
+        for column in self.columns.values():
+            column.release()
+        self.columns.clear()
+        self._string_data.release()
+        self._buffer.release()
+        self._mmap.close()
+
+    def string(self, string_index: int) -> str:
+        """Return a string from the string table.
+
+        :param string_index: The index of the string, -1 is None.
+        :return: The decoded string.
+        """
+        if string_index < 0:
+            return None
+        offsets = self.columns["string_offsets"]
+        return bytes(self._string_data[offsets[string_index]:offsets[string_index + 1]]).decode("utf-8")
+
+    def load_item_json(self, id_number: int) -> Dict:
+        """Decode a single item from the snapshot.
+
+        :param id_number: The item ID number.
+        :return item_json: A dictionary in the same format as the `items-json` files.
+        """
+        index = self._index_of[id_number]
+        columns = self.columns
+        values = dict()
+        for column in INT_COLUMNS:
+            value = columns[column][index]
+            values[column] = None if value == INT_NULL else value
+        for column in FLOAT_COLUMNS:
+            value = columns[column][index]
+            values[column] = None if math.isnan(value) else value
+        for column in BOOL_COLUMNS:
+            value = columns[column][index]
+            values[column] = None if value == BOOL_NULL else bool(value)
+        for column in STRING_COLUMNS:
+            values[column] = self.string(columns[column][index])
+
+        skill_reqs = self.string(columns["skill_reqs"][index])
+        values["skill_reqs"] = None if skill_reqs is None else json.loads(skill_reqs)
+        overflow = self.string(columns["overflow"][index])
+        if overflow is not None:
+            values.update(json.loads(overflow))
+
+        item_json = collections.OrderedDict((prop, values[prop]) for prop in ITEM_PROPERTIES)
+        if item_json["equipable"]:
+            item_json["bonuses"] = collections.OrderedDict((prop, values[prop]) for prop in STATS_PROPERTIES)
+            item_json["equipment"] = collections.OrderedDict((prop, values[prop]) for prop in EQUIPMENT_PROPERTIES)
+
+        return item_json
+
+
+if __name__ == "__main__":
+    import argparse
+    from osrsbox.items_api import all_items
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-i",
+                    "--input",
+                    required=True,
+                    help="Either 1) Folder of JSON item (items-json), 2) Single JSON file (items-complete.json)")
+    ap.add_argument("-o",
+                    "--output",
+                    required=True,
+                    help="The file name for the items database snapshot")
+    args = vars(ap.parse_args())
+
+    print(">>> Loading items database...")
+    ai = all_items.AllItems(args["input"])
+    print(">>> Writing items database snapshot...")
+    ai.export_snapshot(args["output"])
@@ -25,6 +25,13 @@ from typing import Dict
 
 class ItemStats:
     """This class defines the stats structure and properties for an OSRS item."""
+    # The stats properties, in the order they are written to JSON
+    PROPERTIES = ("attack_stab", "attack_slash", "attack_crush", "attack_magic", "attack_ranged",
+                  "defence_stab", "defence_slash", "defence_crush", "defence_magic", "defence_ranged",
+                  "melee_strength", "ranged_strength", "magic_damage", "prayer")
+
+    __slots__ = tuple("_" + prop for prop in PROPERTIES)
+
     def __init__(self):
         self._attack_stab = None
         self._attack_slash = None
@@ -172,8 +179,7 @@ class ItemStats:
 
         :param item_data: A dictionary loaded from a JSON file.
         """
-        for prop in vars(self):
-            prop = prop[1:]
+        for prop in self.PROPERTIES:
             setattr(self, prop, item_data[prop])
 
     def construct_json(self) -> Dict:
@@ -182,8 +188,7 @@ class ItemStats:
         :return json_out: A dictionary of all stats properties.
         """
         json_out = collections.OrderedDict()
-        for prop in vars(self):
-            prop = prop[1:]
+        for prop in self.PROPERTIES:
             json_out[prop] = getattr(self, prop)
 
         return json_out
@@ -0,0 +1,213 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+A simple benchmark script to compare the different ways of loading the
+osrsbox-db item database using the AllItems class. Each loader is timed
+over a number of runs, and the loaded items are checked against the
+serial loader to ensure every loader produces the same database.
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import os
+import time
+import random
+import tempfile
+import statistics
+import tracemalloc
+from typing import Callable
+
+from osrsbox.items_api import all_items
+from osrsbox.items_api.item_definition import ItemDefinition
+
+LOOKUP_ITEM_ID = 4151  # The item fetched when timing the first item lookup
+
+
+def benchmark(name: str, loader: Callable, runs: int) -> all_items.AllItems:
+    """Time a loader function, measure the peak memory it allocates and print the results.
+
+    :param name: The name of the loader to display.
+    :param loader: A function that returns a loaded AllItems object.
+    :param runs: The number of times to run the loader.
+    :return ai: The AllItems object returned by the last run.
+    """
+    timings = list()
+    for _ in range(runs):
+        start = time.perf_counter()
+        ai = loader()
+        timings.append(time.perf_counter() - start)
+
+    # Measure memory in a separate run, as tracing allocations slows down the loader
+    tracemalloc.start()
+    loader()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"  > {name:<36} min: {min(timings):7.3f}s  median: {statistics.median(timings):7.3f}s  "
+          f"peak memory: {peak / 1024 / 1024:7.1f}MB")
+    return ai
+
+
+def load_and_lookup(input_data_file_or_directory: str, lazy: bool) -> all_items.AllItems:
+    """Load the items database, and fetch a single item.
+
+    :param input_data_file_or_directory: The path to the data input.
+    :param lazy: Load the items database in lazy mode.
+    :return ai: The loaded AllItems object.
+    """
+    ai = all_items.AllItems(input_data_file_or_directory, lazy=lazy)
+    ai[LOOKUP_ITEM_ID]
+    return ai
+
+
+def load_and_materialize(input_data_file_or_directory: str, lazy: bool = False) -> all_items.AllItems:
+    """Load the items database, and convert every lazily loaded item to an ItemDefinition.
+
+    :param input_data_file_or_directory: The path to the data input.
+    :param lazy: Load the items database in lazy mode.
+    :return ai: The loaded AllItems object.
+    """
+    ai = all_items.AllItems(input_data_file_or_directory, lazy=lazy)
+    for _ in ai:
+        pass
+    return ai
+
+
+def measure_bytes_per_item(input_data_file_or_directory: str) -> float:
+    """Measure the memory used by each ItemDefinition object (including stats and equipment).
+
+    The raw item data is loaded first, so only the memory of the item objects is measured.
+
+    :param input_data_file_or_directory: The path to the data input.
+    :return: The average number of bytes allocated for each item.
+    """
+    item_jsons = [item.construct_json() for item in all_items.AllItems(input_data_file_or_directory)]
+    tracemalloc.start()
+    items = list()
+    for item_json in item_jsons:
+        item_def = ItemDefinition()
+        item_def.load_item_definition_from_file(item_json)
+        items.append(item_def)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / len(items)
+
+
+def benchmark_name_search(ai: all_items.AllItems, queries: int):
+    """Time prefix and fuzzy item name searches, and print the median and 99th percentile.
+
+    Prefix searches use the first four characters of random item names. Fuzzy searches
+    use random item names with one character replaced.
+
+    :param ai: A loaded AllItems object.
+    :param queries: The number of queries to time for each search type.
+    """
+    rng = random.Random(0)
+    names = [item.name for item in rng.sample(ai.all_items, queries) if item.name]
+    misspelled = list()
+    for name in names:
+        position = rng.randrange(len(name))
+        misspelled.append(name[:position] + rng.choice("abcdefghijklmnopqrstuvwxyz") + name[position + 1:])
+
+    # Build the search index before timing any searches
+    ai.name_search
+    for search_type, search, search_queries in (("prefix", ai.search_items_by_prefix, [name[:4] for name in names]),
+                                                ("fuzzy", ai.search_items_fuzzy, misspelled)):
+        timings = list()
+        for query in search_queries:
+            start = time.perf_counter()
+            search(query)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(f"  > {search_type:<8} median: {timings[len(timings) // 2] * 1000:7.3f}ms  "
+              f"p99: {timings[int(len(timings) * 0.99)] * 1000:7.3f}ms")
+
+
+def check_same_items(expected: all_items.AllItems, actual: all_items.AllItems) -> bool:
+    """Check two AllItems objects hold the same items, in the same order.
+
+    :param expected: The AllItems object loaded using the serial loader.
+    :param actual: The AllItems object loaded using another loader.
+    :return: True if both objects hold the same items.
+    """
+    if len(expected) != len(actual):
+        return False
+    for expected_item, actual_item in zip(expected, actual):
+        if expected_item.construct_json() != actual_item.construct_json():
+            return False
+    return True
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-i",
+                    "--input",
+                    required=True,
+                    help="The folder of JSON item files (items-json)")
+    ap.add_argument("-r",
+                    "--runs",
+                    type=int,
+                    default=3,
+                    help="The number of runs for each loader")
+    ap.add_argument("-w",
+                    "--workers",
+                    type=int,
+                    default=4,
+                    help="The number of workers for the thread and process pool loaders")
+    args = vars(ap.parse_args())
+
+    print(">>> Benchmarking AllItems loaders...")
+    serial = benchmark("serial",
+                       lambda: all_items.AllItems(args["input"]),
+                       args["runs"])
+    threads = benchmark(f"threads (workers={args['workers']})",
+                        lambda: all_items.AllItems(args["input"], workers=args["workers"]),
+                        args["runs"])
+    processes = benchmark(f"processes (workers={args['workers']})",
+                          lambda: all_items.AllItems(args["input"], workers=args["workers"], use_processes=True),
+                          args["runs"])
+
+    benchmark("lazy (first lookup)",
+              lambda: load_and_lookup(args["input"], lazy=True),
+              args["runs"])
+    lazy = benchmark("lazy (load and materialize)",
+                     lambda: load_and_materialize(args["input"], lazy=True),
+                     args["runs"])
+
+    snapshot_path = os.path.join(tempfile.mkdtemp(), "items.snapshot")
+    serial.export_snapshot(snapshot_path)
+    benchmark("snapshot (first lookup)",
+              lambda: load_and_lookup(snapshot_path, lazy=False),
+              args["runs"])
+    snapshot = benchmark("snapshot (open and materialize)",
+                         lambda: load_and_materialize(snapshot_path),
+                         args["runs"])
+
+    print(">>> Measuring memory of ItemDefinition objects...")
+    print(f"  > bytes per item: {measure_bytes_per_item(args['input']):.0f}")
+
+    print(">>> Benchmarking item name searches...")
+    benchmark_name_search(serial, 1000)
+
+    print(">>> Checking loaded items are identical...")
+    print(f"  > threads: {check_same_items(serial, threads)}")
+    print(f"  > processes: {check_same_items(serial, processes)}")
+    print(f"  > lazy: {check_same_items(serial, lazy)}")
+    print(f"  > snapshot: {check_same_items(serial, snapshot)}")
@@ -1,5 +1,14 @@
+import json
 import pytest
+import hashlib
+import threading
+import http.server
+import socketserver
+import urllib.parse
 from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Tuple
 
 
 PATH_TO_TEST_DIR = Path(__file__).absolute().parent
@@ -13,3 +22,165 @@ def path_to_docs_dir() -> Path:
 @pytest.fixture(scope="session")
 def path_to_cache_dir() -> Path:
     return PATH_TO_TEST_DIR / ".." / "extraction_tools_cache"
+
+
+def scraper_item(id_number: int, name: str, equipable: bool = False) -> Dict:
+    return {"id": id_number, "name": name, "members": False, "tradeable_on_ge": True, "stackable": False,
+            "noted": False, "noteable": True, "linked_id": None, "equipable": equipable,
+            "cost": 5, "lowalch": 2, "highalch": 3}
+
+
+@pytest.fixture
+def build_inputs() -> Dict:
+    return {
+        "cache_items": {
+            "1": scraper_item(1, "Foo"),
+            "2": scraper_item(2, "Missing page"),
+            "3": scraper_item(3, "Bar", equipable=True),
+            "4": scraper_item(4, "No bonuses", equipable=True)
+        },
+        "wiki_text": {
+            "Foo": "{{Infobox Item|name=Foo|tradeable=Yes|examine=A foo.|weight=1.5|quest=No}}",
+            "Bar": "{{Infobox Item|name=Bar|tradeable=No|examine=A bar.}}"
+                   "{{Infobox Bonuses|astab=+5|str=-2|slot=weapon|aspeed=4}}",
+            "No bonuses": "{{Infobox Item|name=No bonuses|examine=Oops.}}"
+        },
+        "normalized_names": dict(),
+        "buy_limits": {"Foo": "100"},
+        "skill_requirements": {"3": {"attack": 10}},
+        "current_db": dict()
+    }
+
+
+@pytest.fixture
+def build_dir(tmp_path: Path, monkeypatch) -> Path:
+    # The builder writes to ../docs/items-json, relative to the working directory
+    (tmp_path / "items_builder").mkdir()
+    (tmp_path / "docs" / "items-json").mkdir(parents=True)
+    monkeypatch.chdir(tmp_path / "items_builder")
+    return tmp_path / "docs" / "items-json"
+
+
+class StubWikiApi:
+    """A local stand-in for the OSRS Wiki API, serving the requests made by extraction_tools_wiki."""
+    def __init__(self):
+        # Page titles to wiki text
+        self.pages: Dict[str, str] = dict()
+        # Category names to the page titles in the category
+        self.categories: Dict[str, List[str]] = dict()
+        # Page titles to the last revision timestamp
+        self.timestamps: Dict[str, str] = dict()
+        # The maximum number of pages with content in a revisions response, the rest need a continue request
+        self.content_limit: int = None
+        # Page titles (or the `titles` of a revisions request) to the number of 503 responses to return first
+        self.failures: Dict[str, int] = dict()
+        # The query parameters of every request received
+        self.requests: List[Dict[str, str]] = list()
+        # The number of requests answered with 304 Not Modified
+        self.not_modified = 0
+        self.lock = threading.Lock()
+
+    def respond(self, params: Dict[str, str]) -> Tuple[int, Dict]:
+        with self.lock:
+            self.requests.append(params)
+            page_title = params.get("page")
+            failure_key = params.get("titles", page_title)
+            if self.failures.get(failure_key):
+                self.failures[failure_key] -= 1
+                return 503, {"error": "Service unavailable"}
+        if params.get("action") == "parse":
+            if page_title not in self.pages:
+                return 200, {"error": {"code": "missingtitle"}}
+            return 200, {"parse": {"title": page_title, "wikitext": {"*": self.pages[page_title]}}}
+        if params.get("action") == "query" and params.get("prop") == "revisions":
+            return 200, self.revisions(params)
+        if params.get("action") == "query" and params.get("list") == "categorymembers":
+            return 200, self.category_members(params)
+        return 400, {"error": "Unsupported request"}
+
+    def revisions(self, params: Dict[str, str]) -> Dict:
+        titles = params["titles"].split("|")
+        if len(titles) > 50:
+            return {"error": {"code": "toomanyvalues"}}
+        # Pages before the continue position, or after the content limit, are returned without revisions
+        start = int(params.get("rvcontinue", "0"))
+        next_continue = None
+        content_pages = 0
+        pages = list()
+        for page_id, title in enumerate(titles, start=1):
+            if title not in self.pages:
+                pages.append({"title": title, "missing": True})
+                continue
+            if page_id - 1 < start or next_continue is not None:
+                pages.append({"pageid": page_id, "title": title})
+                continue
+            revision = {"timestamp": self.timestamps.get(title, "2019-02-10T00:00:00Z")}
+            if "content" in params["rvprop"]:
+                if self.content_limit is not None and content_pages == self.content_limit:
+                    next_continue = page_id - 1
+                    pages.append({"pageid": page_id, "title": title})
+                    continue
+                content_pages += 1
+                revision["slots"] = {"main": {"contentmodel": "wikitext", "content": self.pages[title]}}
+            pages.append({"pageid": page_id, "title": title, "revisions": [revision]})
+        if params.get("formatversion") == "2":
+            result = {"batchcomplete": True, "query": {"pages": pages}}
+        else:
+            result = {"batchcomplete": "", "query": {"pages": {str(page.get("pageid", -i)): page for i, page in enumerate(pages, start=1)}}}
+        if next_continue is not None:
+            del result["batchcomplete"]
+            result["continue"] = {"rvcontinue": str(next_continue), "continue": "||"}
+        return result
+
+    def category_members(self, params: Dict[str, str]) -> Dict:
+        titles = self.categories.get(params["cmtitle"][len("Category:"):], list())
+        start = int(params.get("cmcontinue", "0"))
+        end = start + int(params["cmlimit"])
+        result = {"batchcomplete": "", "query": {"categorymembers": [{"ns": 0, "title": title} for title in titles[start:end]]}}
+        if end < len(titles):
+            result["continue"] = {"cmcontinue": str(end), "continue": "-||"}
+        return result
+
+
+class _Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    # http.server.ThreadingHTTPServer is not available before Python 3.7
+    daemon_threads = True
+
+
+@pytest.fixture
+def wiki_api():
+    api = StubWikiApi()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        # Keep connections open, the same as the OSRS Wiki
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(self.path).query))
+            status, data = api.respond(params)
+            body = json.dumps(data).encode("utf-8")
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            if status == 200 and self.headers.get("If-None-Match") == etag:
+                with api.lock:
+                    api.not_modified += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = _Server(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    api.url = f"http://127.0.0.1:{server.server_address[1]}/api.php"
+    yield api
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,36 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: extraction_tools_wiki.extract_wiki_data
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+from extraction_tools_wiki import extract_wiki_data
+
+
+def test_pages_to_extract():
+    page_titles = {"Unchanged": "2019-02-10T00:00:00Z",
+                   "Revised": "2019-03-01T00:00:00Z",
+                   "New": "2019-03-01T00:00:00Z",
+                   "Unknown revision": "2019-02-10T00:00:00Z"}
+    extracted_pages = {"Unchanged": "Text", "Revised": "Old text", "Unknown revision": "Text"}
+    extracted_revisions = {"Unchanged": "2019-02-10T00:00:00Z", "Revised": "2019-02-10T00:00:00Z"}
+    assert extract_wiki_data.pages_to_extract(page_titles, extracted_pages, extracted_revisions) == \
+        ["Revised", "New", "Unknown revision"]
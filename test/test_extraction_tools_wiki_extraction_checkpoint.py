@@ -0,0 +1,67 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: extraction_tools_wiki.extraction_checkpoint
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import os
+from pathlib import Path
+
+from extraction_tools_wiki.extraction_checkpoint import ExtractionCheckpoint
+
+
+def test_checkpoint_save_load(tmp_path: Path):
+    checkpoint_path = str(tmp_path / "extract_checkpoint_items.json")
+    checkpoint = ExtractionCheckpoint(checkpoint_path, ["Items", "Pets"])
+    assert not checkpoint.load()
+    assert checkpoint.category_continue("Items") == dict()
+
+    checkpoint.update_category("Items", None)
+    checkpoint.update_category("Pets", {"cmcontinue": "page|50455453|1234", "continue": "-||"})
+    checkpoint.page_titles.update({"Abyssal whip": "2019-02-10T00:00:00Z", "Pet rock": None})
+    checkpoint.category_titles.update({"Items": ["Abyssal whip"], "Pets": ["Pet rock"]})
+    checkpoint.revisions["Abyssal whip"] = "2019-02-10T00:00:00Z"
+    checkpoint.save()
+
+    resumed = ExtractionCheckpoint(checkpoint_path, ["Items", "Pets"])
+    assert resumed.load()
+    assert resumed.category_continue("Items") is None
+    assert resumed.category_continue("Pets") == {"cmcontinue": "page|50455453|1234", "continue": "-||"}
+    assert resumed.page_titles == {"Abyssal whip": "2019-02-10T00:00:00Z", "Pet rock": None}
+    assert resumed.category_titles == {"Items": ["Abyssal whip"], "Pets": ["Pet rock"]}
+    assert resumed.revisions == {"Abyssal whip": "2019-02-10T00:00:00Z"}
+
+    # A checkpoint for different categories is not resumed
+    assert not ExtractionCheckpoint(checkpoint_path, ["Items"]).load()
+
+    resumed.remove()
+    assert not os.path.isfile(checkpoint_path)
+
+
+def test_checkpoint_save_later(tmp_path: Path):
+    checkpoint_path = tmp_path / "extract_checkpoint_items.json"
+    checkpoint = ExtractionCheckpoint(str(checkpoint_path), ["Items"], save_interval=60)
+    checkpoint.update_category("Items", {"cmcontinue": "500"})
+    # Not saved until the save interval has passed
+    assert not checkpoint_path.is_file()
+    checkpoint.save_interval = 0
+    checkpoint.update_category("Items", None)
+    assert checkpoint_path.is_file()
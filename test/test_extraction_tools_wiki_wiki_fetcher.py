@@ -0,0 +1,100 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: extraction_tools_wiki.wiki_fetcher
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import pytest
+import requests
+
+from extraction_tools_wiki import wiki_fetcher
+from extraction_tools_wiki import wiki_session
+from extraction_tools_wiki.wiki_page_text import WikiPageText
+from extraction_tools_wiki.wiki_page_text import pages_from_revisions_response
+
+
+def test_fetch_revisions(wiki_api):
+    wiki_api.pages = {f"Page {i}": f"Text {i}" for i in range(120)}
+    wiki_api.timestamps = {"Page 7": "2019-03-01T12:00:00Z"}
+    fetcher = wiki_fetcher.WikiTextFetcher(wiki_api.url, "agent", "name@domain.com", requests_per_second=1000)
+    revisions = {page_title: (wiki_text, timestamp)
+                 for page_title, wiki_text, timestamp in fetcher.fetch_revisions(list(wiki_api.pages) + ["Missing page"])}
+    fetcher.close()
+
+    assert len(revisions) == 121
+    assert revisions["Page 7"] == ("Text 7", "2019-03-01T12:00:00Z")
+    assert revisions["Page 8"] == ("Text 8", "2019-02-10T00:00:00Z")
+    assert revisions["Missing page"] == (None, None)
+    # 50 titles per request
+    assert sorted(len(request["titles"].split("|")) for request in wiki_api.requests) == [21, 50, 50]
+    assert wiki_api.requests[0]["rvprop"] == "content|timestamp"
+    assert wiki_api.requests[0]["formatversion"] == "2"
+
+
+def test_fetch_revisions_retry(wiki_api):
+    wiki_api.pages = {"Abyssal whip": "Whip", "Rune scimitar": "Scimitar"}
+    wiki_api.failures = {"Abyssal whip": 2}
+    fetcher = wiki_fetcher.WikiTextFetcher(wiki_api.url, "agent", "name@domain.com", requests_per_second=1000,
+                                           retries=2, backoff=0.01)
+    revisions = list(fetcher.fetch_revisions(["Abyssal whip", "Rune scimitar"], batch_size=1))
+    assert sorted(revisions) == [("Abyssal whip", "Whip", "2019-02-10T00:00:00Z"),
+                                 ("Rune scimitar", "Scimitar", "2019-02-10T00:00:00Z")]
+    assert len(wiki_api.requests) == 4
+
+    # A batch that fails after every retry raises the error
+    wiki_api.failures = {"Abyssal whip": 3}
+    with pytest.raises(wiki_session.RetryableResponse):
+        list(fetcher.fetch_revisions(["Abyssal whip"]))
+    fetcher.close()
+
+
+def test_fetch_revisions_matches_wiki_page_text(wiki_api):
+    wiki_api.pages = {"Abyssal whip": "{{Infobox Item|name=Abyssal whip}}"}
+    wiki_page_text = WikiPageText(wiki_api.url, "Abyssal whip", "agent", "name@domain.com")
+    wiki_page_text.extract_page_wiki_text()
+    fetcher = wiki_fetcher.WikiTextFetcher(wiki_api.url, "agent", "name@domain.com")
+    assert fetcher.fetch_batch(["Abyssal whip"])["Abyssal whip"][0] == wiki_page_text.wiki_text
+    assert isinstance(fetcher.wiki_session.session, requests.Session)
+    fetcher.close()
+
+
+def test_pages_from_revisions_response():
+    page_data = {"query": {
+        "normalized": [{"from": "abyssal whip", "to": "Abyssal whip"}],
+        "pages": [{"title": "Abyssal whip", "revisions": [{"timestamp": "2019-02-10T00:00:00Z",
+                                                           "slots": {"main": {"content": "Whip"}}}]},
+                  {"title": "Missing", "missing": True}]}}
+    pages = pages_from_revisions_response(["abyssal whip", "Missing"], page_data)
+    assert pages == {"abyssal whip": ("Whip", "2019-02-10T00:00:00Z"), "Missing": (None, None)}
+
+
+def test_fetch_revisions_continue(wiki_api):
+    wiki_api.pages = {f"Page {i}": f"Text {i}" for i in range(50)}
+    # The wiki text of a batch is split across 3 responses
+    wiki_api.content_limit = 20
+    fetcher = wiki_fetcher.WikiTextFetcher(wiki_api.url, "agent", "name@domain.com", requests_per_second=1000)
+    revisions = {page_title: (wiki_text, timestamp)
+                 for page_title, wiki_text, timestamp in fetcher.fetch_revisions(list(wiki_api.pages))}
+    fetcher.close()
+
+    assert revisions == {f"Page {i}": (f"Text {i}", "2019-02-10T00:00:00Z") for i in range(50)}
+    assert [request.get("rvcontinue") for request in wiki_api.requests] == [None, "20", "40"]
+    assert all(request["titles"] == wiki_api.requests[0]["titles"] for request in wiki_api.requests)
@@ -0,0 +1,139 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: extraction_tools_wiki.wiki_page_titles
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+from pathlib import Path
+
+from extraction_tools_wiki.extraction_checkpoint import ExtractionCheckpoint
+from extraction_tools_wiki.wiki_page_titles import WikiPageTitles
+from extraction_tools_wiki.wiki_session import WikiSession
+
+
+def test_extract_page_titles(wiki_api, tmp_path: Path):
+    wiki_api.categories = {"Items": [f"Page {i}" for i in range(1200)] + ["File:Page.png"]}
+    wiki_api.pages = {f"Page {i}": "Text" for i in range(1200)}
+    wiki_api.timestamps = {"Page 3": "2019-03-01T12:00:00Z"}
+    session = WikiSession("agent", "name@domain.com", cache_dir=str(tmp_path / "cache"))
+    wiki_page_titles = WikiPageTitles(wiki_api.url, ["Items"], "agent", "name@domain.com", session)
+    wiki_page_titles.extract_page_titles()
+    # 500 titles per request, and files are skipped
+    assert list(wiki_page_titles) == [f"Page {i}" for i in range(1200)]
+    assert len(wiki_api.requests) == 3
+
+    wiki_page_titles.extract_last_revision_timestamp("Page 3|Page 4")
+    assert wiki_page_titles["Page 3"] == "2019-03-01T12:00:00Z"
+    assert wiki_page_titles["Page 4"] == "2019-02-10T00:00:00Z"
+
+    # A repeated extraction revalidates the saved responses, using the same session
+    WikiPageTitles(wiki_api.url, ["Items"], "agent", "name@domain.com", session).extract_page_titles()
+    assert wiki_api.not_modified == 3
+    session.close()
+
+
+def test_extract_page_titles_checkpoint(wiki_api, tmp_path: Path):
+    wiki_api.categories = {"Items": [f"Page {i}" for i in range(1200)]}
+    wiki_api.pages = {f"Page {i}": "Text" for i in range(1200)}
+    checkpoint = ExtractionCheckpoint(str(tmp_path / "extract_checkpoint_items.json"), ["Items"], save_interval=0)
+    wiki_page_titles = WikiPageTitles(wiki_api.url, ["Items"], "agent", "name@domain.com", checkpoint=checkpoint)
+    wiki_page_titles.extract_page_titles_and_revision_timestamps(workers=2)
+    assert checkpoint.category_continue("Items") is None
+    assert checkpoint.page_titles == {f"Page {i}": "2019-02-10T00:00:00Z" for i in range(1200)}
+    assert checkpoint.category_titles == {"Items": [f"Page {i}" for i in range(1200)]}
+
+
+def test_extract_page_titles_resume(wiki_api, tmp_path: Path):
+    wiki_api.categories = {"Items": [f"Page {i}" for i in range(1200)], "Pets": ["Pet rock"]}
+    wiki_api.pages = {f"Page {i}": "Text" for i in range(1200)}
+    wiki_api.pages["Pet rock"] = "Rock"
+    # A run interrupted after the first 500 page titles of the first category, with revision timestamps for 450
+    checkpoint = ExtractionCheckpoint(str(tmp_path / "extract_checkpoint_items.json"), ["Items", "Pets"])
+    checkpoint.update_category("Items", {"cmcontinue": "500", "continue": "-||"})
+    checkpoint.page_titles.update({f"Page {i}": "2019-01-01T00:00:00Z" if i < 450 else None for i in range(500)})
+    checkpoint.category_titles["Items"] = [f"Page {i}" for i in range(500)]
+    checkpoint.save()
+
+    resumed = ExtractionCheckpoint(str(tmp_path / "extract_checkpoint_items.json"), ["Items", "Pets"])
+    assert resumed.load()
+    wiki_page_titles = WikiPageTitles(wiki_api.url, ["Items", "Pets"], "agent", "name@domain.com", checkpoint=resumed)
+    wiki_page_titles.extract_page_titles_and_revision_timestamps(workers=1)
+    # The category is continued, and the page titles are in category order
+    assert list(wiki_page_titles) == [f"Page {i}" for i in range(1200)] + ["Pet rock"]
+    category_requests = [request for request in wiki_api.requests if request.get("list") == "categorymembers"]
+    assert [request.get("cmcontinue") for request in category_requests] == ["500", "1000", None]
+    # Page titles with a revision timestamp are not requested again
+    revision_requests = [request["titles"].split("|") for request in wiki_api.requests if request.get("prop") == "revisions"]
+    assert sorted(page_title for titles in revision_requests for page_title in titles) == \
+        sorted([f"Page {i}" for i in range(450, 1200)] + ["Pet rock"])
+    assert wiki_page_titles["Page 0"] == "2019-01-01T00:00:00Z"
+    assert wiki_page_titles["Page 1199"] == "2019-02-10T00:00:00Z"
+
+
+def test_extract_page_titles_concurrently(wiki_api):
+    wiki_api.categories = {"Items": [f"Page {i}" for i in range(1200)],
+                           "Pets": ["Pet rock", "Page 5"],
+                           "Furniture": ["Page 6", "Oak chair"]}
+    wiki_page_titles = WikiPageTitles(wiki_api.url, ["Items", "Pets", "Furniture"], "agent", "name@domain.com")
+    wiki_page_titles.extract_page_titles(workers=3)
+    # Page titles in more than one category are only added once, in the order of the categories
+    assert list(wiki_page_titles) == [f"Page {i}" for i in range(1200)] + ["Pet rock", "Oak chair"]
+
+
+def test_extract_page_titles_and_revision_timestamps(wiki_api, tmp_path: Path):
+    wiki_api.categories = {"Items": [f"Page {i}" for i in range(1200)],
+                           "Pets": ["Pet rock", "Page 5"],
+                           "Furniture": ["Page 6", "Oak chair"]}
+    wiki_api.pages = {page_title: "Text" for page_titles in wiki_api.categories.values() for page_title in page_titles}
+    wiki_api.timestamps = {"Pet rock": "2019-03-01T12:00:00Z"}
+    checkpoint = ExtractionCheckpoint(str(tmp_path / "extract_checkpoint_items.json"), ["Items", "Pets", "Furniture"])
+    session = WikiSession("agent", "name@domain.com", requests_per_second=1000, pool_size=4)
+    wiki_page_titles = WikiPageTitles(wiki_api.url, ["Items", "Pets", "Furniture"], "agent", "name@domain.com",
+                                      session, checkpoint)
+    wiki_page_titles.extract_page_titles_and_revision_timestamps(workers=4)
+    session.close()
+
+    assert len(wiki_page_titles) == 1202
+    assert wiki_page_titles["Pet rock"] == "2019-03-01T12:00:00Z"
+    assert all(revision_date == "2019-02-10T00:00:00Z" for page_title, revision_date in wiki_page_titles.page_titles.items()
+               if page_title != "Pet rock")
+    # Every page title is requested once, at most 50 page titles per request
+    revision_requests = [request["titles"].split("|") for request in wiki_api.requests if request.get("prop") == "revisions"]
+    assert sorted(page_title for titles in revision_requests for page_title in titles) == sorted(wiki_page_titles)
+    assert max(len(titles) for titles in revision_requests) == 50
+    # A revisions request was made before the last category request, page titles and timestamps overlap
+    actions = [request.get("prop", request.get("list")) for request in wiki_api.requests]
+    assert actions.index("revisions") < len(actions) - 1 - actions[::-1].index("categorymembers")
+    assert list(wiki_page_titles) == [f"Page {i}" for i in range(1200)] + ["Pet rock", "Oak chair"]
+
+
+def test_extract_page_titles_and_revision_timestamps_resume(wiki_api, tmp_path: Path):
+    wiki_api.categories = {"Items": [f"Page {i}" for i in range(60)]}
+    wiki_api.pages = {f"Page {i}": "Text" for i in range(60)}
+    checkpoint = ExtractionCheckpoint(str(tmp_path / "extract_checkpoint_items.json"), ["Items"])
+    # A run interrupted after the category, with a revisions request for the first 50 page titles
+    checkpoint.update_category("Items", None)
+    checkpoint.page_titles.update({f"Page {i}": "2019-01-01T00:00:00Z" if i < 50 else None for i in range(60)})
+    wiki_page_titles = WikiPageTitles(wiki_api.url, ["Items"], "agent", "name@domain.com", checkpoint=checkpoint)
+    wiki_page_titles.extract_page_titles_and_revision_timestamps(workers=2)
+    assert [request["titles"] for request in wiki_api.requests] == ["|".join(f"Page {i}" for i in range(50, 60))]
+    assert wiki_page_titles["Page 0"] == "2019-01-01T00:00:00Z"
+    assert wiki_page_titles["Page 59"] == "2019-02-10T00:00:00Z"
@@ -0,0 +1,116 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: extraction_tools_wiki.wiki_session
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import time
+import pytest
+import threading
+import requests
+from pathlib import Path
+
+from extraction_tools_wiki import wiki_session
+
+
+def test_token_bucket():
+    bucket = wiki_session.TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(11)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # The first token is available immediately, the other 10 are added at 50 per second
+    assert time.monotonic() - start >= 0.19
+
+
+def test_retry_wait():
+    waits = [wiki_session.retry_wait(1.0, 2) for _ in range(100)]
+    # The doubled wait is randomised, so retries are spread out
+    assert all(2.0 <= wait <= 6.0 for wait in waits)
+    assert len(set(waits)) > 1
+
+
+def test_get_json_retry(wiki_api):
+    wiki_api.pages = {"Abyssal whip": "Whip"}
+    wiki_api.failures = {"Abyssal whip": 2}
+    session = wiki_session.WikiSession("agent", "name@domain.com", retries=2, backoff=0.01)
+    params = {"action": "parse", "prop": "wikitext", "format": "json", "page": "Abyssal whip"}
+    assert session.get_json(wiki_api.url, params)["parse"]["wikitext"]["*"] == "Whip"
+    assert len(wiki_api.requests) == 3
+
+    wiki_api.failures = {"Abyssal whip": 3}
+    with pytest.raises(wiki_session.RetryableResponse):
+        session.get_json(wiki_api.url, params)
+    session.close()
+
+
+def test_get_json_cache(wiki_api, tmp_path: Path):
+    wiki_api.pages = {"Abyssal whip": "Whip"}
+    params = {"action": "parse", "prop": "wikitext", "format": "json", "page": "Abyssal whip"}
+    session = wiki_session.WikiSession("agent", "name@domain.com", cache_dir=str(tmp_path / "cache"))
+    first = session.get_json(wiki_api.url, params)
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+    # An unchanged response is revalidated, and the saved response is used
+    assert session.get_json(wiki_api.url, params) == first
+    assert wiki_api.not_modified == 1
+
+    # A changed response is downloaded and saved again
+    wiki_api.pages["Abyssal whip"] = "New whip"
+    assert session.get_json(wiki_api.url, params)["parse"]["wikitext"]["*"] == "New whip"
+    assert session.get_json(wiki_api.url, params)["parse"]["wikitext"]["*"] == "New whip"
+    assert wiki_api.not_modified == 2
+
+    # The cache can be skipped
+    session.get_json(wiki_api.url, params, use_cache=False)
+    assert wiki_api.not_modified == 2
+    assert len(wiki_api.requests) == 5
+    session.close()
+
+
+def test_http_cache(tmp_path: Path):
+    cache = wiki_session.HttpCache(str(tmp_path))
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b'{"query": {}}'
+    # A response that cannot be revalidated is not saved
+    cache.save("https://oldschool.runescape.wiki/api.php", {"action": "query"}, response)
+    assert cache.load("https://oldschool.runescape.wiki/api.php", {"action": "query"}) is None
+
+    response.headers["Last-Modified"] = "Sun, 10 Feb 2019 00:00:00 GMT"
+    cache.save("https://oldschool.runescape.wiki/api.php", {"action": "query"}, response)
+    entry = cache.load("https://oldschool.runescape.wiki/api.php", {"action": "query"})
+    assert entry["body"] == '{"query": {}}'
+    assert wiki_session.conditional_headers(entry) == {"If-Modified-Since": "Sun, 10 Feb 2019 00:00:00 GMT"}
+    assert cache.load("https://oldschool.runescape.wiki/api.php", {"action": "parse"}) is None
+
+
+def test_get_json_retry_error(wiki_api):
+    wiki_api.failures = {"Abyssal whip": 1}
+    session = wiki_session.WikiSession("agent", "name@domain.com", retries=0)
+    params = {"action": "parse", "prop": "wikitext", "format": "json", "page": "Abyssal whip"}
+    # A response that fails after every retry is a request error, with the response
+    with pytest.raises(requests.exceptions.RequestException) as excinfo:
+        session.get_json(wiki_api.url, params)
+    assert excinfo.value.response.status_code == 503
+    session.close()
@@ -0,0 +1,168 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: extraction_tools_wiki.wiki_text_store
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import os
+import json
+import pickle
+import pytest
+from pathlib import Path
+
+from extraction_tools_wiki import wiki_text_store
+
+PATH_TO_WIKI_DIR = Path(__file__).absolute().parent / ".." / "extraction_tools_wiki"
+
+
+def test_convert_json_dump(tmp_path: Path):
+    json_path = PATH_TO_WIKI_DIR / "extract_page_text_monsters.json"
+    with open(json_path) as f:
+        expected = json.load(f)
+
+    store = wiki_text_store.convert_json_dump(str(json_path), str(tmp_path / "monsters.jsonl"))
+    assert len(store) == len(expected)
+    assert list(store) == list(expected)
+    for page_title, wiki_text in expected.items():
+        assert page_title in store
+        assert store[page_title] == wiki_text
+    assert "Missing page" not in store
+    assert store.get("Missing page") is None
+    store.close()
+
+
+def test_store_index(tmp_path: Path):
+    store_path = tmp_path / "pages.jsonl"
+    store_path.write_text(wiki_text_store.store_line("A", "First") +
+                          wiki_text_store.store_line("B", "{{Infobox Item}}") +
+                          wiki_text_store.store_line("A", "Second"))
+    store = wiki_text_store.WikiTextStore(str(store_path))
+    # The last entry for a page is used
+    assert dict(store) == {"A": "Second", "B": "{{Infobox Item}}"}
+    assert os.path.isfile(str(store_path) + ".index")
+
+    # The saved index is used while the store is unchanged, and rebuilt when the store changes
+    with open(str(store_path) + ".index") as f:
+        assert json.load(f)["size"] == store_path.stat().st_size
+    with open(store_path, "a") as f:
+        f.write(wiki_text_store.store_line("C", "Third"))
+        # A partly written line is ignored
+        f.write('{"title": "D", "te')
+    assert dict(wiki_text_store.WikiTextStore(str(store_path))) == {"A": "Second", "B": "{{Infobox Item}}", "C": "Third"}
+
+
+def test_store_pickle(tmp_path: Path):
+    store_path = tmp_path / "pages.jsonl"
+    store_path.write_text(wiki_text_store.store_line("A", "Text"))
+    store = wiki_text_store.WikiTextStore(str(store_path))
+    assert store["A"] == "Text"
+    # The store can be sent to worker processes (without the open file)
+    copied_store = pickle.loads(pickle.dumps(store))
+    assert copied_store.store_file is None
+    assert copied_store["A"] == "Text"
+
+
+def test_open_wiki_text(tmp_path: Path):
+    json_path = tmp_path / "extract_page_text_items.json"
+    json_path.write_text(json.dumps({"A": "Text", "B": "More \"text\"\n"}, indent=4))
+    store = wiki_text_store.open_wiki_text(str(tmp_path / "extract_page_text_items"))
+    assert dict(store) == {"A": "Text", "B": "More \"text\"\n"}
+
+    # A newer JSON file is converted again
+    json_path.write_text(json.dumps({"A": "New"}))
+    newer_mtime = os.path.getmtime(store.store_path) + 10
+    os.utime(json_path, (newer_mtime, newer_mtime))
+    assert dict(wiki_text_store.open_wiki_text(str(tmp_path / "extract_page_text_items"))) == {"A": "New"}
+
+
+def test_store_add(tmp_path: Path):
+    store_path = tmp_path / "pages.jsonl"
+    with wiki_text_store.WikiTextStore(str(store_path)) as store:
+        store.add("A", "First")
+        store.add("B", "{{Infobox Item}}")
+        store.add("A", "Second")
+        # Pages can be read while the store is written
+        assert store["A"] == "Second"
+    # The index is saved when the store is closed, and used when the store is opened again
+    with open(str(store_path) + ".index") as f:
+        assert json.load(f)["size"] == store_path.stat().st_size
+    store = wiki_text_store.WikiTextStore(str(store_path))
+    assert dict(store) == {"A": "Second", "B": "{{Infobox Item}}"}
+    store.add("C", "Third")
+    store.close()
+    assert dict(wiki_text_store.WikiTextStore(str(store_path))) == {"A": "Second", "B": "{{Infobox Item}}", "C": "Third"}
+
+
+def test_store_add_after_interrupted_write(tmp_path: Path):
+    store_path = tmp_path / "pages.jsonl"
+    with open(store_path, "w") as f:
+        f.write(wiki_text_store.store_line("A", "Text"))
+        f.write('{"title": "B", "te')
+    with wiki_text_store.WikiTextStore(str(store_path)) as store:
+        store.add("C", "More text")
+    # The partly written line is removed before the next page is written
+    assert store_path.read_text() == wiki_text_store.store_line("A", "Text") + wiki_text_store.store_line("C", "More text")
+    assert dict(wiki_text_store.WikiTextStore(str(store_path))) == {"A": "Text", "C": "More text"}
+
+
+def test_store_compact(tmp_path: Path):
+    store_path = tmp_path / "pages.jsonl"
+    with wiki_text_store.WikiTextStore(str(store_path)) as store:
+        store.add("A", "First")
+        store.add("B", "{{Infobox Item}}")
+        store.add("A", "Second")
+        store.compact()
+        assert dict(store) == {"A": "Second", "B": "{{Infobox Item}}"}
+    assert store_path.read_text() == wiki_text_store.store_line("A", "Second") + wiki_text_store.store_line("B", "{{Infobox Item}}")
+    assert dict(wiki_text_store.WikiTextStore(str(store_path))) == {"A": "Second", "B": "{{Infobox Item}}"}
+
+
+def test_store_export_json(tmp_path: Path):
+    pages = {"A": "Second", "B": "More \"text\"\n", "Ünicode": "Dragon™"}
+    with wiki_text_store.WikiTextStore(str(tmp_path / "pages.jsonl")) as store:
+        store.export_json(str(tmp_path / "empty.json"))
+        store.add("A", "First")
+        for page_title, wiki_text in pages.items():
+            store.add(page_title, wiki_text)
+        store.export_json(str(tmp_path / "pages.json"))
+    # The export is the same as the JSON file saved by WikiPageText
+    assert (tmp_path / "empty.json").read_text() == json.dumps(dict(), indent=4)
+    assert (tmp_path / "pages.json").read_text() == json.dumps(pages, indent=4)
+    # The export is not converted again when the store is opened
+    assert dict(wiki_text_store.open_wiki_text(str(tmp_path / "pages"))) == pages
+
+
+def test_open_wiki_text_missing(tmp_path: Path):
+    # The builder needs the wiki text, a missing store is an error
+    with pytest.raises(FileNotFoundError):
+        wiki_text_store.open_wiki_text(str(tmp_path / "extract_page_text_items"))
+    # The extractor starts a new store
+    with wiki_text_store.open_wiki_text(str(tmp_path / "extract_page_text_items"), missing_ok=True) as store:
+        assert len(store) == 0
+        store.add("A", "Text")
+    assert dict(wiki_text_store.open_wiki_text(str(tmp_path / "extract_page_text_items"))) == {"A": "Text"}
+
+
+def test_open_wiki_text_unreadable(tmp_path: Path):
+    (tmp_path / "extract_page_text_items.json").write_text("")
+    with pytest.raises(ValueError):
+        wiki_text_store.open_wiki_text(str(tmp_path / "extract_page_text_items"))
+    assert not (tmp_path / "extract_page_text_items.jsonl.tmp").exists()
@@ -0,0 +1,64 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: items_builder.update_tools.generate_items_files
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+from pathlib import Path
+
+from items_builder.update_tools import generate_items_files
+
+
+def test_json_object_writer(tmp_path: Path):
+    entries = {"1": {"name": "Café / bar", "id": 1}, "20": {"name": "Toolkit", "id": 20}}
+    writer = generate_items_files.JsonObjectWriter(str(tmp_path / "out.json"))
+    for key, value in entries.items():
+        writer.write(key, value)
+    writer.close()
+    assert (tmp_path / "out.json").read_bytes() == json.dumps(entries).encode("utf-8")
+
+
+def test_json_object_writer_empty(tmp_path: Path):
+    writer = generate_items_files.JsonObjectWriter(str(tmp_path / "out.json"))
+    writer.close()
+    assert (tmp_path / "out.json").read_text() == "{}"
+
+
+def test_generate_items_files(path_to_docs_dir: Path, tmp_path: Path):
+    (tmp_path / "items-json-slot").mkdir()
+    generate_items_files.generate_items_files(str(path_to_docs_dir / "items-json"), str(tmp_path))
+
+    # The slot files match the files generated from items-complete.json
+    slot_files = sorted(path.name for path in (path_to_docs_dir / "items-json-slot").glob("*.json"))
+    assert slot_files == sorted(path.name for path in (tmp_path / "items-json-slot").glob("*.json"))
+    for slot_file in slot_files:
+        expected = (path_to_docs_dir / "items-json-slot" / slot_file).read_bytes()
+        assert (tmp_path / "items-json-slot" / slot_file).read_bytes() == expected
+
+    items_complete = json.loads((tmp_path / "items-complete.json").read_text())
+    assert len(items_complete) == len(list((path_to_docs_dir / "items-json").glob("*.json")))
+
+    # The summary is sorted by ID number, with escaped forward slashes
+    summary = (tmp_path / "items-summary.json").read_text(encoding="utf-8")
+    assert summary.startswith('{"0":{"name":"Dwarf remains","id":0},"1":{"name":"Toolkit","id":1},')
+    assert '"1893":{"name":"2\\/3 cake","id":1893}' in summary
+    assert list(json.loads(summary)) == [str(item_id) for item_id in sorted(map(int, items_complete))]
@@ -0,0 +1,54 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: osrsbox.items_api.item_columns
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import pytest
+from pathlib import Path
+
+from osrsbox.items_api import all_items
+
+
+@pytest.fixture(scope="module")
+def all_db_items(path_to_docs_dir: Path) -> all_items.AllItems:
+    return all_items.AllItems(str(path_to_docs_dir / "items-json"))
+
+
+def test_item_columns_top_weapons(all_db_items: all_items.AllItems):
+    columns = all_db_items.columns
+    mask = columns.slot_mask("weapon") & (columns.attack_speed <= 4)
+    top_weapons = columns.top("attack_slash", 20, mask)
+
+    expected = [item for item in all_db_items
+                if item.equipable and item.item_equipment.slot == "weapon"
+                and item.item_equipment.attack_speed is not None and item.item_equipment.attack_speed <= 4]
+    expected = sorted(expected, key=lambda item: -item.item_stats.attack_slash)[:20]
+    assert top_weapons == expected
+
+
+def test_item_columns_filter_head_prayer(all_db_items: all_items.AllItems):
+    columns = all_db_items.columns
+    mask = columns.slot_mask("head") & (columns.column("prayer") >= 3)
+
+    expected = [item for item in all_db_items
+                if item.equipable and item.item_equipment.slot == "head" and item.item_stats.prayer >= 3]
+    assert columns.select(mask) == expected
@@ -0,0 +1,76 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: osrsbox.items_api.item_indexes
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import shutil
+import pytest
+from pathlib import Path
+
+from osrsbox.items_api import all_items
+
+
+@pytest.fixture(scope="module")
+def all_db_items(path_to_docs_dir: Path) -> all_items.AllItems:
+    return all_items.AllItems(str(path_to_docs_dir / "items-json"))
+
+
+def test_item_indexes_by_name(all_db_items: all_items.AllItems):
+    items = all_db_items.get_items_by_name("ABYSSAL WHIP")
+    assert 4151 in [item.id for item in items]
+    assert all(item.name == "Abyssal whip" for item in items)
+    assert all_db_items.get_items_by_name("Not a real item name") == []
+
+
+def test_item_indexes_by_slot(all_db_items: all_items.AllItems):
+    expected = [item for item in all_db_items if item.equipable and item.item_equipment.slot == "weapon"]
+    assert all_db_items.get_items_by_slot("weapon") == expected
+
+
+def test_item_indexes_by_flag(all_db_items: all_items.AllItems):
+    members = all_db_items.get_items_by_flag("members")
+    non_members = all_db_items.get_items_by_flag("members", False)
+    assert all(item.members for item in members)
+    assert len(members) + len(non_members) == len(all_db_items)
+
+
+def test_item_indexes_linked_item(all_db_items: all_items.AllItems):
+    assert all_db_items.get_linked_item(4151).id == 4152
+    assert all_db_items.get_linked_item(4152).id == 4151
+
+
+def test_item_indexes_rebuilt_after_loading(path_to_docs_dir: Path, tmp_path: Path):
+    for directory, id_number in (("first", 4151), ("second", 4587)):
+        (tmp_path / directory).mkdir()
+        shutil.copy(str(path_to_docs_dir / "items-json" / f"{id_number}.json"), str(tmp_path / directory))
+
+    loaded_items = all_items.AllItems(str(tmp_path / "first"))
+    assert loaded_items.get_items_by_slot("weapon") == [loaded_items[4151]]
+    assert loaded_items.get_items_by_name("Dragon scimitar") == []
+    assert len(loaded_items.columns) == 1
+    assert loaded_items.search_items_by_prefix("Dragon scimitar") == []
+
+    loaded_items.load_all_items(str(tmp_path / "second"))
+    assert loaded_items.get_items_by_slot("weapon") == [loaded_items[4151], loaded_items[4587]]
+    assert loaded_items.get_items_by_name("Dragon scimitar") == [loaded_items[4587]]
+    assert len(loaded_items.columns) == 2
+    assert [item.id for item in loaded_items.search_items_by_prefix("Dragon scimitar")] == [4587]
@@ -0,0 +1,104 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: osrsbox.items_api.item_query
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+import pytest
+from pathlib import Path
+
+from osrsbox.items_api import all_items
+from osrsbox.items_api import item_query
+
+
+@pytest.fixture(scope="module")
+def all_db_items(path_to_docs_dir: Path) -> all_items.AllItems:
+    return all_items.AllItems(str(path_to_docs_dir / "items-json"))
+
+
+def test_item_query_columns(all_db_items: all_items.AllItems):
+    query = all_db_items.query().where(equipable=True, slot="weapon").where_range("attack_slash", 50, None)
+    query = query.order_by("-attack_slash").limit(20)
+
+    expected = [item for item in all_db_items
+                if item.equipable and item.item_equipment.slot == "weapon" and item.item_stats.attack_slash >= 50]
+    expected = sorted(expected, key=lambda item: item.item_stats.attack_slash, reverse=True)[:20]
+    assert query.all() == expected
+    assert query.explain()["path"] == "columns"
+
+
+def test_item_query_index(all_db_items: all_items.AllItems):
+    query = all_db_items.query().where(name="abyssal WHIP", members=True)
+
+    expected = [item for item in all_db_items if item.name == "Abyssal whip" and item.members]
+    assert query.all() == expected
+    plan = query.explain()
+    assert plan["path"] == "index"
+    assert plan["index"] == "name"
+    assert plan["residual"] == ["members"]
+
+
+def test_item_query_scan(all_db_items: all_items.AllItems):
+    query = all_db_items.query().where_range("highalch", 1000000, None).order_by("highalch")
+
+    expected = [item for item in all_db_items if item.highalch >= 1000000]
+    expected = sorted(expected, key=lambda item: item.highalch)
+    assert query.all() == expected
+    assert query.explain()["path"] == "scan"
+    assert query.explain()["candidates"] == len(all_db_items)
+
+
+def test_item_query_unknown_field(all_db_items: all_items.AllItems):
+    with pytest.raises(KeyError):
+        all_db_items.query().where(not_a_field=1)
+
+
+@pytest.fixture
+def invalid_bonus_items(path_to_docs_dir: Path, tmp_path: Path) -> all_items.AllItems:
+    for id_number, attack_slash in ((4151, 82), (4587, None), (1277, "?")):
+        with open(str(path_to_docs_dir / "items-json" / f"{id_number}.json")) as item_file:
+            item_json = json.load(item_file)
+        item_json["bonuses"]["attack_slash"] = attack_slash
+        with open(str(tmp_path / f"{id_number}.json"), "w") as item_file:
+            json.dump(item_json, item_file)
+    return all_items.AllItems(str(tmp_path))
+
+
+@pytest.mark.parametrize("build_query", [
+    lambda query: query.where_range("attack_slash", None, 100),
+    lambda query: query.where_range("attack_slash", 0, None),
+    lambda query: query.where_range("attack_slash"),
+    lambda query: query.where(attack_slash=82),
+    lambda query: query.where(slot="weapon").where_range("attack_slash", 0, None).order_by("-attack_slash"),
+])
+def test_item_query_columns_match_scan(invalid_bonus_items: all_items.AllItems, monkeypatch, build_query):
+    query = build_query(invalid_bonus_items.query())
+
+    monkeypatch.setattr(item_query, "COLUMN_SCAN_COST", 0)
+    column_results = query.all()
+    assert query.explain()["path"] == "columns"
+
+    monkeypatch.setattr(item_query, "COLUMN_SCAN_COST", float("inf"))
+    scan_results = query.all()
+    assert query.explain()["path"] in ("scan", "index")
+
+    assert column_results == scan_results
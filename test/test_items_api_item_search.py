@@ -0,0 +1,62 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: osrsbox.items_api.item_search
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import pytest
+from pathlib import Path
+
+from osrsbox.items_api import all_items
+from osrsbox.items_api import item_search
+
+
+@pytest.fixture(scope="module")
+def all_db_items(path_to_docs_dir: Path) -> all_items.AllItems:
+    return all_items.AllItems(str(path_to_docs_dir / "items-json"))
+
+
+@pytest.mark.parametrize("first,second,expected", [
+    ("", "", 0),
+    ("", "whip", 4),
+    ("whip", "", 4),
+    ("abyssal whip", "abysal whip", 1),
+    ("kitten", "sitting", 3),
+    ("rune scimitar", "rune scimitar", 0)
+])
+def test_item_search_edit_distance(first, second, expected):
+    assert item_search.edit_distance(first, second) == expected
+
+
+def test_item_search_prefix(all_db_items: all_items.AllItems):
+    items = all_db_items.search_items_by_prefix("RUNE SC", limit=100)
+    expected = sorted((item for item in all_db_items if item.name.lower().startswith("rune sc")),
+                      key=lambda item: item.name.lower())
+    assert items == expected
+
+
+@pytest.mark.parametrize("query,expected", [
+    ("abysal whip", "Abyssal whip"),
+    ("dragon scimtar", "Dragon scimitar"),
+    ("Rune platebody", "Rune platebody")
+])
+def test_item_search_fuzzy(all_db_items: all_items.AllItems, query, expected):
+    assert all_db_items.search_items_fuzzy(query, limit=1)[0].name == expected
@@ -44,3 +44,61 @@ def test_all_items_load_items_complete(path_to_docs_dir: Path):
 
     all_db_items = all_items.AllItems(str(path_to_items_complete))
     assert len(all_db_items.all_items) == NUMBER_OF_ITEMS
+
+
+def test_all_items_load_items_json_parallel(path_to_docs_dir: Path):
+    path_to_items_json_dir = str(path_to_docs_dir / "items-json")
+
+    serial_items = all_items.AllItems(path_to_items_json_dir)
+    parallel_items = all_items.AllItems(path_to_items_json_dir, workers=4)
+    assert len(parallel_items) == NUMBER_OF_ITEMS
+    assert [item.id for item in parallel_items] == [item.id for item in serial_items]
+    assert parallel_items[4151].construct_json() == serial_items[4151].construct_json()
+
+
+def test_all_items_load_items_json_processes(path_to_docs_dir: Path):
+    path_to_items_json_dir = str(path_to_docs_dir / "items-json")
+
+    serial_items = all_items.AllItems(path_to_items_json_dir)
+    process_items = all_items.AllItems(path_to_items_json_dir, workers=2, use_processes=True)
+    assert len(process_items) == NUMBER_OF_ITEMS
+    assert [item.id for item in process_items] == [item.id for item in serial_items]
+    assert process_items[4151].construct_json() == serial_items[4151].construct_json()
+
+
+def test_all_items_load_snapshot(path_to_docs_dir: Path, tmp_path: Path):
+    path_to_items_json_dir = str(path_to_docs_dir / "items-json")
+    path_to_snapshot = str(tmp_path / "items.snapshot")
+
+    json_items = all_items.AllItems(path_to_items_json_dir)
+    json_items.export_snapshot(path_to_snapshot)
+
+    snapshot_items = all_items.AllItems(path_to_snapshot)
+    assert len(snapshot_items) == NUMBER_OF_ITEMS
+    assert snapshot_items[4151].construct_json() == json_items[4151].construct_json()
+    for json_item, snapshot_item in zip(json_items, snapshot_items):
+        assert snapshot_item.construct_json() == json_item.construct_json()
+
+
+def test_all_items_load_items_json_lazy(path_to_docs_dir: Path):
+    path_to_items_json_dir = str(path_to_docs_dir / "items-json")
+
+    eager_items = all_items.AllItems(path_to_items_json_dir)
+    lazy_items = all_items.AllItems(path_to_items_json_dir, lazy=True)
+    assert len(lazy_items) == NUMBER_OF_ITEMS
+    assert lazy_items[4151].construct_json() == eager_items[4151].construct_json()
+    assert [item.id for item in lazy_items] == [item.id for item in eager_items]
+    assert len(lazy_items.all_items_dict) == NUMBER_OF_ITEMS
+
+
+def test_all_items_list_reused(path_to_docs_dir: Path):
+    all_db_items = all_items.AllItems(str(path_to_docs_dir / "items-json"), lazy=True)
+    items_list = all_db_items.all_items
+    # The list is built once, and indexing it does not materialize the items again
+    assert all_db_items.all_items is items_list
+    assert all_db_items.all_items[0] is items_list[0]
+
+    # Loading items again builds a new list
+    all_db_items.load_all_items(str(path_to_docs_dir / "items-json"))
+    assert all_db_items.all_items is not items_list
+    assert len(all_db_items.all_items) == NUMBER_OF_ITEMS
@@ -0,0 +1,79 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: items_builder.build_profiler
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import pstats
+import pytest
+from pathlib import Path
+from typing import Dict
+
+from items_builder import builder
+from items_builder import build_profiler
+from items_builder import infobox_cleaner
+
+
+def test_summarise():
+    stats = build_profiler.summarise([float(value) for value in range(100, 0, -1)])
+    assert (stats["count"], stats["total"], stats["mean"]) == (100, 5050.0, 50.5)
+    assert (stats["p50"], stats["p90"], stats["p99"], stats["max"]) == (50.0, 90.0, 99.0, 100.0)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_build_items_profiler(build_inputs: Dict, build_dir: Path, workers: int, capsys):
+    profiler = build_profiler.BuildProfiler()
+    builder.build_items(build_inputs, workers, chunk_size=1, profiler=profiler)
+
+    summary = profiler.summary()
+    assert summary["stages"]["total"]["count"] == 4
+    assert summary["stages"]["scraper"]["count"] == 4
+    # Items 2 and 4 fail before the infobox stage is complete
+    assert summary["stages"]["infobox"]["count"] == 2
+    assert summary["stages"]["bonuses"]["count"] == 1
+    assert summary["helpers"]["mwparserfromhell.parse"]["count"] == 3
+    assert summary["helpers"]["infobox_cleaner.clean_weight"]["count"] == 1
+    assert summary["helpers"]["BuildItem.clean_bonuses_value"]["count"] > 0
+    assert sorted(profiler.item_totals) == ["1", "2", "3", "4"]
+    assert len(profiler.slowest_items(2)) == 2
+
+    # The helpers are only instrumented during the build
+    assert not hasattr(infobox_cleaner.clean_weight, "timed_helper")
+
+    profiler.print_summary()
+    output = capsys.readouterr().out
+    assert ">>> Build timings by stage:" in output
+    assert "infobox_cleaner.clean_weight" in output
+
+
+def test_build_items_without_profiler(build_inputs: Dict, build_dir: Path, capsys):
+    builder.init_worker(build_inputs, None)
+    assert not hasattr(infobox_cleaner.clean_weight, "timed_helper")
+    builder.build_items(build_inputs, item_ids=["1"])
+    assert not hasattr(infobox_cleaner.clean_weight, "timed_helper")
+
+
+def test_profile_items(build_inputs: Dict, build_dir: Path, capsys):
+    builder.build_items(build_inputs)
+    file_paths = build_profiler.profile_items(["3", "2"], builder.build_item, str(build_dir.parent / "profile"))
+    assert [Path(file_path).name for file_path in file_paths] == ["3.prof", "2.prof"]
+    stats = pstats.Stats(file_paths[0])
+    assert any(function == "populate" for _, _, function in stats.stats)
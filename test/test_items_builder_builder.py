@@ -0,0 +1,148 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: items_builder.builder
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+import logging
+import pytest
+from pathlib import Path
+from typing import Dict
+
+from items_builder import builder
+from items_builder.build_log import BuildLog
+from items_builder.wiki_templates import WikiTemplateCache
+
+
+def test_build_items_serial(build_inputs: Dict, build_dir: Path, capsys):
+    failed = builder.build_items(build_inputs)
+
+    # Failed items are reported, and do not stop the other items being built
+    assert [item_id for item_id, _ in failed] == ["2", "4"]
+    assert failed[0][1] == "Cannot find wiki page"
+    assert sorted(path.name for path in build_dir.iterdir()) == ["1.json", "3.json"]
+
+    output = capsys.readouterr().out
+    assert output.index("Item 2 failed") < output.index("Item 4 failed")
+
+
+def test_build_items_outcomes(build_inputs: Dict, build_dir: Path):
+    # An invalid item (status code 1) is built, but not exported
+    build_inputs["cache_items"]["5"] = dict(build_inputs["cache_items"]["1"], id=5, name="Invalid")
+    build_inputs["normalized_names"]["5"] = ["Invalid", "Invalid page", "1"]
+    build_inputs["wiki_text"]["Invalid page"] = "Not an item."
+    outcomes = dict()
+    builder.build_items(build_inputs, outcomes=outcomes)
+    assert outcomes == {"1": "exported", "3": "exported", "5": "skipped"}
+    assert sorted(path.name for path in build_dir.iterdir()) == ["1.json", "3.json"]
+
+
+def test_build_items_changeset(build_inputs: Dict, build_dir: Path, capsys):
+    builder.build_items(build_inputs, item_ids=["1", "3"])
+    current_item = json.loads((build_dir / "1.json").read_text())
+    build_inputs["current_db"] = {"1": dict(current_item, weight=2.0),
+                                  "3": json.loads((build_dir / "3.json").read_text()),
+                                  "9": dict(current_item, id=9, name="Removed")}
+
+    outcomes = dict()
+    built_items = dict()
+    builder.build_items(build_inputs, item_ids=["1"], outcomes=outcomes, built_items=built_items)
+    assert list(built_items) == ["1"]
+
+    # Item 3 was not built, so keeps its current record, and item 9 is no longer in the inputs
+    changeset = builder.database_changeset(build_inputs["current_db"], build_inputs["cache_items"], built_items, outcomes)
+    assert changeset.report() == {"added": [], "removed": ["9"],
+                                  "changed": {"1": {"weight": {"old": 2.0, "new": 1.5}}}, "unchanged": 1}
+
+
+def test_build_items_parallel(build_inputs: Dict, build_dir: Path, capsys):
+    serial_failed = builder.build_items(build_inputs)
+    serial_output = capsys.readouterr().out
+    serial_files = {path.name: path.read_bytes() for path in build_dir.iterdir()}
+    for path in build_dir.iterdir():
+        path.unlink()
+
+    parallel_failed = builder.build_items(build_inputs, workers=2, chunk_size=1)
+    parallel_output = capsys.readouterr().out
+    parallel_files = {path.name: path.read_bytes() for path in build_dir.iterdir()}
+
+    assert parallel_failed == serial_failed
+    assert parallel_output == serial_output
+    assert parallel_files == serial_files
+
+
+def test_build_items_parallel_template_cache(build_inputs: Dict, build_dir: Path, capsys):
+    wiki_templates = WikiTemplateCache(build_inputs["wiki_text"])
+    builder.build_items(build_inputs, workers=2, chunk_size=1, wiki_templates=wiki_templates)
+    # Pages parsed in the worker processes are sent back to the main process cache
+    assert sorted(wiki_templates.entries) == ["Bar", "Foo", "No bonuses"]
+
+
+def test_build_items_selection(build_inputs: Dict, build_dir: Path, capsys):
+    failed = builder.build_items(build_inputs, item_ids=["3", "2"])
+    assert failed == [("2", "Cannot find wiki page")]
+    assert [path.name for path in build_dir.iterdir()] == ["3.json"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_build_items_log(build_inputs: Dict, build_dir: Path, workers: int, capsys):
+    log_file = build_dir.parent / "builder.log"
+    with BuildLog(str(log_file)) as build_log:
+        builder.build_items(build_inputs, workers, log_queue=build_log.queue, log_level=build_log.level)
+
+    records = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert all(record["level"] != "DEBUG" for record in records)
+
+    # One build record for each item
+    build_records = {record["item_id"]: record for record in records if "outcome" in record}
+    assert sorted(build_records) == ["1", "2", "3", "4"]
+    assert build_records["1"]["outcome"] == "built"
+    assert build_records["1"]["status_code"] == 0
+    assert list(build_records["3"]["timings_ms"]) == ["scraper", "wiki_page", "infobox", "bonuses", "compare", "total"]
+    assert build_records["2"]["outcome"] == "failed"
+    assert build_records["2"]["error"] == "Cannot find wiki page"
+    assert build_records["4"]["outcome"] == "failed"
+    assert any(record["level"] == "CRITICAL" for record in records)
+
+
+def test_build_items_debug_log(build_inputs: Dict, build_dir: Path, capsys):
+    log_file = build_dir.parent / "builder.log"
+    with BuildLog(str(log_file), logging.DEBUG) as build_log:
+        builder.build_items(build_inputs, log_queue=build_log.queue, log_level=build_log.level)
+
+    messages = [json.loads(line)["message"] for line in log_file.read_text().splitlines()]
+    assert "item_id: 1" in messages
+    assert "item 1: built" in messages
+
+
+def test_build_items_log_changes(build_inputs: Dict, build_dir: Path, capsys):
+    builder.build_items(build_inputs, item_ids=["1"])
+    current_item = json.loads((build_dir / "1.json").read_text())
+    current_item["weight"] = 2.0
+    build_inputs["current_db"] = {"1": current_item}
+
+    log_file = build_dir.parent / "builder.log"
+    with BuildLog(str(log_file)) as build_log:
+        builder.build_items(build_inputs, item_ids=["1"], log_queue=build_log.queue, log_level=build_log.level)
+    records = [json.loads(line) for line in log_file.read_text().splitlines()]
+    # The difference to the current database is logged with the item build record
+    assert records[0]["changes"] == {"weight": {"old": 2.0, "new": 1.5}}
@@ -0,0 +1,55 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: items_builder.infobox_cleaner
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+import pytest
+from pathlib import Path
+
+from items_builder import infobox_cleaner
+from items_builder.benchmark_infobox_cleaner import call_cleaner
+from items_builder.benchmark_infobox_cleaner import benchmark_cleaners
+
+PATH_TO_TEST_DIR = Path(__file__).absolute().parent
+
+# Raw infobox values from the wiki text dumps (and item infobox examples), with the
+# output of each cleaner captured before the cleaners were memoized
+with open(PATH_TO_TEST_DIR / "infobox_cleaner_values.json", encoding="utf-8") as f:
+    CLEANER_VALUES = json.load(f)
+
+
+@pytest.mark.parametrize("cleaner_name", sorted(CLEANER_VALUES))
+def test_cleaner_output_unchanged(cleaner_name: str):
+    cleaner = getattr(infobox_cleaner, cleaner_name)
+    cleaner.cache_clear()
+    for _ in range(2):
+        for args, expected in CLEANER_VALUES[cleaner_name]:
+            assert call_cleaner(cleaner, args) == expected, args
+    # The second pass is answered from the cache (values that raise an exception are not cached)
+    raised = sum(1 for _, expected in CLEANER_VALUES[cleaner_name] if expected in ("ValueError", "AttributeError"))
+    assert cleaner.cache_info().hits == len(CLEANER_VALUES[cleaner_name]) - raised
+
+
+def test_benchmark_cleaners(capsys):
+    values = {cleaner_name: [tuple(args) for args, _ in rows] for cleaner_name, rows in CLEANER_VALUES.items()}
+    assert not any(benchmark_cleaners(values).values())
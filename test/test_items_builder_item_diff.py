@@ -0,0 +1,79 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: items_builder.update_tools.item_diff
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import json
+from pathlib import Path
+
+from items_builder.update_tools import item_diff
+from items_builder.update_tools.determine_new_items import DetermineNewItems
+
+WHIP = {"id": 4151, "name": "Abyssal whip", "weight": 0.453, "quest_item": [],
+        "bonuses": {"attack_slash": 82, "melee_strength": 82}, "equipment": {"slot": "weapon"}}
+
+
+def test_diff_records():
+    new_whip = json.loads(json.dumps(WHIP))
+    assert item_diff.diff_records(WHIP, new_whip) == dict()
+
+    new_whip["bonuses"]["attack_slash"] = 83
+    new_whip["quest_item"] = ["Quest"]
+    new_whip["examine"] = "A weapon from the abyss."
+    del new_whip["weight"]
+    assert item_diff.diff_records(WHIP, new_whip) == {
+        "quest_item": {"old": [], "new": ["Quest"]},
+        "bonuses.attack_slash": {"old": 82, "new": 83},
+        "examine": {"new": "A weapon from the abyss."},
+        "weight": {"old": 0.453}
+    }
+    # Records that are not dictionaries are compared as a whole
+    assert item_diff.diff_records("abc", "def") == {"": {"old": "abc", "new": "def"}}
+
+
+def test_diff_databases(tmp_path: Path):
+    past_db = {"4151": WHIP, "1": {"name": "Removed"}, "2": {"name": "Same"}}
+    current_db = {"4151": dict(WHIP, weight=0.5), "3": {"name": "Added"}, "2": {"name": "Same"}}
+    changeset = item_diff.diff_databases(past_db, current_db)
+    assert changeset
+    assert list(changeset.added) == ["3"]
+    assert list(changeset.removed) == ["1"]
+    assert changeset.changed == {"4151": {"weight": {"old": 0.453, "new": 0.5}}}
+    assert changeset.unchanged == ["2"]
+
+    assert changeset.summary().splitlines() == ["- Added items: 1", "    - 3,Added",
+                                                "- Removed items: 1", "    - 1,Removed",
+                                                "- Changed items: 1", "    - 4151,Abyssal whip,weight",
+                                                "- Unchanged items: 1"]
+    changeset.save(str(tmp_path / "changes.json"))
+    assert json.loads((tmp_path / "changes.json").read_text()) == {
+        "added": ["3"], "removed": ["1"], "changed": {"4151": {"weight": {"old": 0.453, "new": 0.5}}}, "unchanged": 1}
+
+    assert not item_diff.diff_databases(current_db, current_db)
+
+
+def test_determine_new_items():
+    dd = DetermineNewItems({"3": "c", "2": "b2", "10": "x"}, {"1": "a", "2": "b", "10": "x"})
+    assert dd.added() == ["3"]
+    assert dd.removed() == ["1"]
+    assert dd.changed() == ["2"]
+    assert dd.unchanged() == ["10"]
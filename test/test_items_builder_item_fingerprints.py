@@ -0,0 +1,132 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: items_builder.item_fingerprints
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import pytest
+from pathlib import Path
+from typing import Dict
+from typing import List
+
+from items_builder import item_fingerprints
+from items_builder.wiki_templates import WikiTemplateCache
+
+
+@pytest.fixture
+def build_inputs() -> Dict:
+    return {
+        "cache_items": {
+            "1": {"id": 1, "name": "Foo", "members": False},
+            "2": {"id": 2, "name": "Foo", "members": False},
+            "3": {"id": 3, "name": "Bar", "members": True}
+        },
+        "wiki_text": {"Foo": "{{Infobox Item|name=Foo}}", "Bar": "{{Infobox Item|name=Bar}}"},
+        "wiki_revisions": {"Foo": "2019-02-10T00:00:00Z"},
+        "normalized_names": {"2": ["Foo", "Bar", "0"]},
+        "buy_limits": {"Foo": "100"},
+        "skill_requirements": {"3": {"attack": 10}},
+        "current_db": dict()
+    }
+
+
+def fingerprints(inputs: Dict) -> Dict[str, str]:
+    wiki_templates = WikiTemplateCache(inputs["wiki_text"], inputs["wiki_revisions"])
+    return item_fingerprints.compute_fingerprints(inputs, wiki_templates)
+
+
+def changed_items(inputs: Dict, past: Dict[str, str]) -> List[str]:
+    current = fingerprints(inputs)
+    return sorted(item_id for item_id in current if current[item_id] != past[item_id])
+
+
+def test_compute_fingerprints(build_inputs: Dict):
+    past = fingerprints(build_inputs)
+    assert list(past) == ["1", "2", "3"]
+    assert len(set(past.values())) == 3
+    assert fingerprints(build_inputs) == past
+
+    # A new wiki page revision changes every item using the page
+    build_inputs["wiki_revisions"]["Foo"] = "2019-03-01T00:00:00Z"
+    assert changed_items(build_inputs, past) == ["1"]
+
+    # Without a revision timestamp, the page text is used (item 2 is normalized to the Bar page)
+    build_inputs["wiki_text"]["Bar"] = "{{Infobox Item|name=Bar|weight=1}}"
+    assert changed_items(build_inputs, past) == ["1", "2", "3"]
+
+
+def test_compute_fingerprints_item_data(build_inputs: Dict):
+    past = fingerprints(build_inputs)
+    build_inputs["cache_items"]["3"]["members"] = False
+    build_inputs["buy_limits"]["Foo"] = "50"
+    assert changed_items(build_inputs, past) == ["1", "2", "3"]
+
+    past = fingerprints(build_inputs)
+    build_inputs["skill_requirements"]["3"] = {"attack": 20}
+    build_inputs["normalized_names"]["1"] = ["Foo", "Foo", "0"]
+    assert changed_items(build_inputs, past) == ["1", "3"]
+
+
+def entries(fingerprints: Dict[str, str], outcome: str = item_fingerprints.EXPORTED) -> Dict[str, Dict]:
+    return {item_id: {"fingerprint": fingerprint, "outcome": outcome} for item_id, fingerprint in fingerprints.items()}
+
+
+def test_items_to_build(tmp_path: Path):
+    (tmp_path / "1.json").write_text("{}")
+    (tmp_path / "3.json").write_text("{}")
+    past = entries({"1": "a", "2": "b", "3": "c", "4": "d"})
+    current = {"5": "e", "4": "d", "3": "x", "2": "b", "1": "a"}
+    # Added and changed items, and unchanged items without a JSON file, in current order
+    assert item_fingerprints.items_to_build(current, past, str(tmp_path)) == ["5", "4", "3", "2"]
+    assert item_fingerprints.items_to_build(current, dict(), str(tmp_path)) == ["5", "4", "3", "2", "1"]
+
+    # Unchanged items that were not exported by the last build are not built again
+    past.update(entries({"2": "b", "4": "d"}, item_fingerprints.SKIPPED))
+    assert item_fingerprints.items_to_build(current, past, str(tmp_path)) == ["5", "3"]
+
+
+def test_remove_deleted_items(tmp_path: Path):
+    (tmp_path / "1.json").write_text("{}")
+    (tmp_path / "2.json").write_text("{}")
+    past = entries({"1": "a", "2": "b"})
+    past.update(entries({"3": "c"}, item_fingerprints.SKIPPED))
+    assert item_fingerprints.remove_deleted_items({"1": "a"}, past, str(tmp_path)) == ["2", "3"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["1.json"]
+
+
+def test_save_load_fingerprints(tmp_path: Path):
+    current = {"1": "a", "2": "b", "3": "c", "4": "d"}
+    past = entries({"3": "c", "5": "e"}, item_fingerprints.SKIPPED)
+    outcomes = {"1": item_fingerprints.EXPORTED, "4": item_fingerprints.SKIPPED}
+    built = item_fingerprints.built_fingerprints(current, ["2"], outcomes, past)
+    # Failed and removed items are left out, and items that were not built keep the last entry
+    assert built == {"1": {"fingerprint": "a", "outcome": "exported"},
+                     "3": {"fingerprint": "c", "outcome": "skipped"},
+                     "4": {"fingerprint": "d", "outcome": "skipped"}}
+    assert item_fingerprints.built_fingerprints({"1": "a"}, list()) == entries({"1": "a"})
+
+    item_fingerprints.save_fingerprints(built, str(tmp_path / "fingerprints.json"))
+    assert item_fingerprints.load_fingerprints(str(tmp_path / "fingerprints.json")) == built
+    assert item_fingerprints.load_fingerprints(str(tmp_path / "missing.json")) == dict()
+
+    # Fingerprints saved without an outcome are loaded as exported
+    (tmp_path / "old.json").write_text('{"1": "a"}')
+    assert item_fingerprints.load_fingerprints(str(tmp_path / "old.json")) == entries({"1": "a"})
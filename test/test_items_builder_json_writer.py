@@ -0,0 +1,72 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: items_builder.json_writer
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+import os
+import json
+from pathlib import Path
+
+from items_builder import json_writer
+from osrsbox.items_api.item_definition import ItemDefinition
+
+
+def load_item(path_to_docs_dir: Path, id_number: int) -> ItemDefinition:
+    with open(path_to_docs_dir / "items-json" / f"{id_number}.json") as f:
+        item_def = ItemDefinition()
+        item_def.load_item_definition_from_file(json.load(f))
+    return item_def
+
+
+def test_serialize_item(path_to_docs_dir: Path, tmp_path: Path):
+    for id_number in [0, 4151, 11832]:
+        item_def = load_item(path_to_docs_dir, id_number)
+        item_def.export_json(True, str(tmp_path))
+        expected = (tmp_path / f"{id_number}.json").read_bytes()
+        assert json_writer.serialize_item(item_def.construct_json()) == expected
+        # The builder output matches the committed files
+        assert expected == (path_to_docs_dir / "items-json" / f"{id_number}.json").read_bytes()
+
+
+def test_item_json_writer(path_to_docs_dir: Path, tmp_path: Path):
+    whip = load_item(path_to_docs_dir, 4151).construct_json()
+    remains = load_item(path_to_docs_dir, 0).construct_json()
+    with json_writer.ItemJsonWriter(str(tmp_path), batch_size=1) as writer:
+        writer.add(4151, whip)
+        writer.add(0, remains)
+    assert (writer.written, writer.unchanged) == (2, 0)
+    assert sorted(os.listdir(tmp_path)) == ["0.json", "4151.json"]
+
+    # Unchanged files are not written again
+    os.utime(tmp_path / "4151.json", ns=(0, 0))
+    os.utime(tmp_path / "0.json", ns=(0, 0))
+    whip["weight"] = 0.454  # The same size as the original weight
+    with json_writer.ItemJsonWriter(str(tmp_path)) as writer:
+        writer.add(4151, whip)
+        writer.add(0, remains)
+        # Items are queued until the batch is full, or the writer is closed
+        assert writer.written == 0
+    assert (writer.written, writer.unchanged) == (1, 1)
+    assert os.stat(tmp_path / "0.json").st_mtime_ns == 0
+    assert os.stat(tmp_path / "4151.json").st_mtime_ns != 0
+    assert json.loads((tmp_path / "4151.json").read_text())["weight"] == 0.454
+    assert sorted(os.listdir(tmp_path)) == ["0.json", "4151.json"]
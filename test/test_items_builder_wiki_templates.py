@@ -0,0 +1,136 @@
+"""
+Author:  PH01L
+Email:   phoil@osrsbox.com
+Website: https://www.osrsbox.com
+
+Description:
+Tests for module: items_builder.wiki_templates
+
+Copyright (c) 2019, PH01L
+
+###############################################################################
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+###############################################################################
+"""
+
+from pathlib import Path
+
+from items_builder import wiki_templates
+
+WHIP = ("{{Infobox Item|name=Abyssal whip|weight=0.453|examine=A weapon from the abyss.|weight= 0.5 }}\n"
+        "{{Infobox Bonuses|aslash=+82|str=+82|slot=[[weapon]]|aspeed=4}}")
+
+
+def test_parse_templates():
+    templates = wiki_templates.parse_templates(WHIP)
+    # Repeated parameters keep the last value, values are raw wiki text
+    assert templates["infobox"] == {"name": "Abyssal whip", "weight": " 0.5 ", "examine": "A weapon from the abyss."}
+    assert templates["bonuses"] == {"aslash": "+82", "str": "+82", "slot": "[[weapon]]", "aspeed": "4"}
+    assert templates["has_bonuses"] is True
+
+    templates = wiki_templates.parse_templates("No templates here")
+    assert templates == {"infobox": None, "bonuses": None, "has_bonuses": False}
+
+
+def test_parse_templates_nested_bonuses():
+    # The bonuses are read from the outer template, matching how items were always built
+    templates = wiki_templates.parse_templates("{{Switch infobox|item1={{Infobox Bonuses|astab=+1}}}}")
+    assert templates["bonuses"] == {"item1": "{{Infobox Bonuses|astab=+1}}"}
+    assert templates["has_bonuses"] is True
+
+
+def test_wiki_template_cache():
+    wiki_text = {"Abyssal whip": WHIP}
+    cache = wiki_templates.WikiTemplateCache(wiki_text, {"Abyssal whip": "2019-02-10T00:00:00Z"})
+    assert cache.get("Missing page") is None
+
+    first = cache.get("Abyssal whip")
+    assert cache.get("Abyssal whip") is first
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert list(cache.take_new_entries()) == ["Abyssal whip"]
+    assert cache.take_new_entries() == dict()
+
+    # A new revision of the page is parsed again
+    wiki_text["Abyssal whip"] = WHIP.replace("+82", "+83")
+    cache.wiki_revisions["Abyssal whip"] = "2019-03-01T00:00:00Z"
+    assert cache.get("Abyssal whip")["bonuses"]["aslash"] == "+83"
+    assert cache.misses == 2
+
+
+def test_wiki_template_cache_without_revisions():
+    wiki_text = {"Abyssal whip": WHIP}
+    cache = wiki_templates.WikiTemplateCache(wiki_text)
+    cache.get("Abyssal whip")
+    # Without a revision timestamp, the page text is used to detect changes
+    wiki_text["Abyssal whip"] = WHIP.replace("+82", "+83")
+    assert cache.get("Abyssal whip")["bonuses"]["aslash"] == "+83"
+    assert cache.misses == 2
+
+
+def test_wiki_template_cache_save_load(tmp_path: Path):
+    wiki_text = {"Abyssal whip": WHIP}
+    revisions = {"Abyssal whip": "2019-02-10T00:00:00Z"}
+    cache = wiki_templates.WikiTemplateCache(wiki_text, revisions)
+    templates = cache.get("Abyssal whip")
+    cache.save(str(tmp_path / "templates.json"))
+
+    loaded_cache = wiki_templates.WikiTemplateCache(wiki_text, revisions)
+    assert loaded_cache.load(str(tmp_path / "templates.json"))
+    assert loaded_cache.get("Abyssal whip") == templates
+    assert (loaded_cache.misses, loaded_cache.hits) == (0, 1)
+    assert not loaded_cache.load(str(tmp_path / "missing.json"))
+
+
+def test_infobox_params():
+    params = wiki_templates.InfoboxParams({"weight": " 1 ", "weight2": "2", "name12": "Twelve", "x0100": "x0", "x0": "zero"})
+    assert params.get("weight") == "1"
+    assert params.get("weight", 2) == "2"
+    assert params.get("name", 12) == "Twelve"
+    assert params.get("x0", 100) == "x0"
+    assert params.get("x0") == "zero"
+    # Versioned values fall back to the plain value
+    assert params.value("weight", 2) == "2"
+    assert params.value("weight", 3) == "1"
+    assert params.value("weight") == "1"
+    assert params.value("examine", 1) is None
+
+
+def test_infobox_params_version():
+    params = wiki_templates.InfoboxParams({"version1": "Uncharged", "version2": "4",
+                                           "name1": "Amulet of glory", "name2": "Amulet of glory(4)",
+                                           "name3": "Amulet of glory(3)", "name5": "Skipped"})
+    assert params.version("Amulet of glory(4)") == 2
+    assert params.version("Amulet of glory(3)") == 3
+    # Versions stop at the first missing number
+    assert params.version("Skipped") == 1
+    # The last matching identifier wins (name is checked after version)
+    params = wiki_templates.InfoboxParams({"version1": "Same", "version2": "Other", "name1": "Other", "name2": "Same"})
+    assert params.version("Same") == 2
+    assert params.version("Other") == 1
+
+    params = wiki_templates.InfoboxParams({"itemname21": "Too many", **{f"itemname{i}": str(i) for i in range(1, 21)}})
+    assert params.version("Too many") == 1
+    assert params.version("20") == 20
+    assert wiki_templates.InfoboxParams({"name": "Plain"}).version("Plain") is None
+
+
+def test_wiki_template_cache_params():
+    wiki_text = {"Abyssal whip": WHIP}
+    cache = wiki_templates.WikiTemplateCache(wiki_text)
+    params = cache.get_params("Abyssal whip")
+    assert params["infobox"].get("weight") == "0.5"
+    assert params["bonuses"].get("slot") == "[[weapon]]"
+    assert cache.get_params("Abyssal whip") is params
+    assert cache.get_params("Missing page") is None
+
+    wiki_text["Abyssal whip"] = WHIP.replace("+82", "+83")
+    assert cache.get_params("Abyssal whip")["bonuses"].get("aslash") == "+83"